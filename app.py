@@ -1,10 +1,36 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify, redirect, url_for
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
+import click
 import mysql.connector
 from mysql.connector import Error
-from datetime import datetime
+from mysql.connector.constants import FieldType
+from werkzeug.http import http_date
+from datetime import datetime, date, timedelta
+import csv
+import io
+from collections import Counter, deque
+from decimal import Decimal, ROUND_HALF_UP
+import functools
+import hashlib
+import heapq
+import json
+import bisect
+import cProfile
+import logging
+import pstats
+import queue
+import random
+import re
+import threading
+import time
 import os
 
+try:
+    import orjson  # optional, faster encoder for the fast row path
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 CORS(app)
 
@@ -16,80 +42,1067 @@ DB_CONFIG = {
     'database': 'hostel_management'
 }
 
-def get_db_connection():
-    """Create and return a database connection"""
+# Connection pool settings (override with environment variables)
+POOL_CONFIG = {
+    'size': int(os.environ.get('DB_POOL_SIZE', 10)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 5)),          # seconds to wait for a free connection
+    'idle_timeout': float(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)),  # evict connections idle longer than this
+    'ping_after': float(os.environ.get('DB_POOL_PING_AFTER', 5)),     # ping on checkout if idle longer than this
+}
+
+
+class PooledConnection:
+    """Thin wrapper around a pooled connection: close() hands it back to the pool."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs))
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw)
+
+    def discard(self):
+        """Drop the connection instead of reusing it (e.g. a result set was left unread)"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw, broken=True)
+
+
+class ConnectionPool:
+    """
+    Bounded MySQL connection pool.
+    - at most `size` connections exist at any time
+    - checkout waits up to `timeout` seconds when every connection is in use
+    - connections idle for more than `ping_after` seconds are pinged (and
+      reconnected) before being handed out; idle ones past `idle_timeout` are closed
+    - the session is reset on release, so user variables and temporary tables
+      never carry over from one checkout to the next
+    """
+
+    def __init__(self, config, size=10, timeout=5.0, idle_timeout=300.0, ping_after=5.0):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()          # (connection, last_used) - most recently used on the right
+        self._created = 0
+        self._in_use = 0
+        self._checkout_times = deque(maxlen=1000)
+
+        self.stats_counters = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connects': 0,
+            'evicted_idle': 0,
+            'evicted_broken': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    def _connect(self):
+        self.stats_counters['connects'] += 1
+        return mysql.connector.connect(**self.config)
+
+    def _evict_idle(self, now):
+        # Oldest connections sit on the left
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._created -= 1
+            self.stats_counters['evicted_idle'] += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        conn = last_used = None
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._evict_idle(now)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    # reserve a slot and connect outside the lock
+                    self._created += 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    self.stats_counters['timeouts'] += 1
+                    raise Error(msg=f"Connection pool exhausted (size={self.size}, waited {self.timeout}s)")
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif time.monotonic() - last_used > self.ping_after:
+                try:
+                    conn.ping(reconnect=True, attempts=1, delay=0)
+                except Error:
+                    self.stats_counters['evicted_broken'] += 1
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self.stats_counters['checkouts'] += 1
+            self.stats_counters['wait_time_total'] += waited
+            self.stats_counters['wait_time_max'] = max(self.stats_counters['wait_time_max'], waited)
+            self._checkout_times.append(time.monotonic())
+
+        return PooledConnection(self, conn)
+
+    def release(self, conn, broken=False):
+        healthy = not broken
+        try:
+            # never hand out a connection with an open transaction
+            if healthy and conn.in_transaction:
+                conn.rollback()
+            healthy = healthy and conn.is_connected()
+            # drop session state (@hm_bulk_* guard variables, unique_checks,
+            # temporary tables) a failed request may have left behind
+            if healthy:
+                conn.reset_session()
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._created -= 1
+                self.stats_counters['evicted_broken'] += 1
+            self._cond.notify()
+
+        if not healthy:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            now = time.monotonic()
+            recent = [t for t in self._checkout_times if now - t <= 60]
+            window = max(1.0, min(60.0, now - recent[0])) if recent else 1.0
+            checkouts = self.stats_counters['checkouts']
+            return {
+                'size': self.size,
+                'open': self._created,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': checkouts,
+                'checkouts_per_sec': round(len(recent) / window, 2),
+                'timeouts': self.stats_counters['timeouts'],
+                'connects': self.stats_counters['connects'],
+                'evicted_idle': self.stats_counters['evicted_idle'],
+                'evicted_broken': self.stats_counters['evicted_broken'],
+                'avg_wait_ms': round(self.stats_counters['wait_time_total'] / checkouts * 1000, 3) if checkouts else 0,
+                'max_wait_ms': round(self.stats_counters['wait_time_max'] * 1000, 3),
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+    return _pool
+
+def get_db_connection(primary=False):
+    """
+    Check out a database connection (close() returns it). GET/HEAD requests
+    get a replica when one is configured, healthy and within REPLICA_MAX_LAG;
+    everything else - writes, sessions that just wrote, background jobs - the
+    primary. primary=True always uses the primary.
+    """
+    started = time.perf_counter()
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        replica = None if primary else replicas.route_read()
+        if replica is not None:
+            try:
+                connection = replica.pool.acquire()
+                replicas.count(replica.name)
+                g.db_target = replica.name
+                return connection
+            except Error as e:
+                replica.mark_failed(e)
+        connection = get_pool().acquire()
+        if has_request_context():
+            g.db_target = 'primary'
         return connection
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
+    finally:
+        request_metric('connect_time', time.perf_counter() - started)
 
-def init_database():
-    """(unchanged) Initialize the database from schema.sql with support for triggers/functions."""
-    try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
-        cursor = connection.cursor()
+# -----------------
+# Read replicas: GET routes read from replicas, writes and fresh reads hit the primary
+# -----------------
+# DB_REPLICAS=host[:port],...   (same user/database as DB_CONFIG unless
+# DB_REPLICA_USER / DB_REPLICA_PASSWORD are set). Each replica has its own pool
+# and is polled for replication lag every REPLICA_CHECK_INTERVAL seconds; one
+# that is behind by more than REPLICA_MAX_LAG, stopped or unreachable gets no
+# reads until it catches up. A server that is not replicating at all (empty
+# SHOW REPLICA STATUS) counts as lag 0, so a second local instance can stand in.
+# After a successful write the client gets a short-lived cookie and its reads
+# stay on the primary until replicas have had time to catch up.
+REPLICA_ADDRESSES = [address.strip() for address in os.environ.get('DB_REPLICAS', '').split(',') if address.strip()]
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))              # seconds
+REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL', 2))
+READ_YOUR_WRITES_WINDOW = float(os.environ.get('READ_YOUR_WRITES_WINDOW', REPLICA_MAX_LAG + REPLICA_CHECK_INTERVAL))
+READ_YOUR_WRITES_COOKIE = 'hm_last_write'
+REPLICA_POOL_CONFIG = dict(POOL_CONFIG, size=int(os.environ.get('DB_REPLICA_POOL_SIZE', POOL_CONFIG['size'])))
 
-        cursor.execute("CREATE DATABASE IF NOT EXISTS hostel_management")
-        cursor.execute("USE hostel_management")
+def replica_config(address):
+    host, _, port = address.partition(':')
+    config = dict(DB_CONFIG, host=host,
+                  user=os.environ.get('DB_REPLICA_USER', DB_CONFIG['user']),
+                  password=os.environ.get('DB_REPLICA_PASSWORD', DB_CONFIG['password']))
+    if port:
+        config['port'] = int(port)
+    return config
 
-        sql_path = 'schema.sql'
-        if not os.path.exists(sql_path):
-            print(f"schema.sql not found at {sql_path}. Skipping initialization.")
+class Replica:
+    def __init__(self, address):
+        self.name = f"replica:{address}"
+        self.config = replica_config(address)
+        self.pool = ConnectionPool(self.config, **REPLICA_POOL_CONFIG)
+        self.lag = None            # seconds behind the primary, None until checked / when stopped
+        self.healthy = False
+        self.checked_at = None
+        self.last_error = None
+
+    def mark_failed(self, error):
+        self.healthy = False
+        self.last_error = str(error)
+
+class ReplicaSet:
+    """Lag-aware replica selection; route_read() returns None when the primary should serve"""
+
+    def __init__(self, addresses, max_lag=REPLICA_MAX_LAG, check_interval=REPLICA_CHECK_INTERVAL):
+        self.replicas = [Replica(address) for address in addresses]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next = 0
+        self._thread = None
+        self.reads = {'primary': 0}
+        self.fallbacks = 0
+        self._last_local_write = float('-inf')
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    def start(self):
+        """First lag check (blocking) and the background checker; idempotent"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    for replica in self.replicas:
+                        self.check(replica)
+                    self._thread = threading.Thread(target=self._check_loop, daemon=True)
+                    self._thread.start()
+
+    def check(self, replica):
+        try:
+            connection = replica.pool.acquire()
+        except Error as e:
+            replica.mark_failed(e)
             return
+        try:
+            cursor = connection._raw.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except Error:
+                cursor.execute("SHOW SLAVE STATUS")     # MySQL < 8.0.22
+            row = cursor.fetchone()
+            cursor.close()
+            if row is None:
+                lag = 0                                 # standalone stand-in
+            else:
+                lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+            replica.lag = lag
+            replica.healthy = lag is not None and lag <= self.max_lag
+            replica.last_error = None if lag is not None else 'replication stopped'
+        except Error as e:
+            replica.mark_failed(e)
+            connection.discard()
+        finally:
+            replica.checked_at = time.time()
+            connection.close()
 
-        with open(sql_path, 'r', encoding='utf-8') as f:
-            sql_file = f.read()
+    def _check_loop(self):
+        while True:
+            time.sleep(self.check_interval)
+            for replica in self.replicas:
+                self.check(replica)
 
-        statements = []
-        temp = ""
-        delimiter = ";"
+    def note_write(self):
+        self._last_local_write = time.monotonic()
 
-        for line in sql_file.splitlines():
-            stripped = line.strip()
+    def wrote_recently(self):
+        """A write went through this process within READ_YOUR_WRITES_WINDOW"""
+        return time.monotonic() - self._last_local_write < READ_YOUR_WRITES_WINDOW
 
-            # detect DELIMITER change
-            if stripped.lower().startswith("delimiter"):
-                delimiter = stripped.split()[1]
-                continue
+    def pick(self):
+        """A healthy replica, round-robin; None when there is none"""
+        self.start()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            with self._lock:
+                self.fallbacks += 1
+            return None
+        with self._lock:
+            self._next += 1
+            return healthy[self._next % len(healthy)]
 
-            temp += line + "\n"
+    def route_read(self):
+        if not self.replicas or not has_request_context() or request.method not in ('GET', 'HEAD'):
+            return None
+        if g.get('use_primary') or session_wrote_recently(request.cookies.get(READ_YOUR_WRITES_COOKIE)):
+            return None
+        # a shared cache filled right after a local write must not capture replica lag
+        if g.get('filling_shared_cache') and self.wrote_recently():
+            return None
+        return self.pick()
 
-            # check if the statement ends with the current delimiter
-            if stripped.endswith(delimiter):
-                # remove delimiter
-                stmt = temp.strip().removesuffix(delimiter).strip()
-                if stmt:
-                    statements.append(stmt)
-                temp = ""
+    def count(self, target):
+        with self._lock:
+            self.reads[target] = self.reads.get(target, 0) + 1
 
-        # Execute each statement
-        for statement in statements:
-            try:
-                cursor.execute(statement)
-            except Exception as e:
-                print("Error executing SQL statement:")
-                print(statement)
-                print("Error:", e)
-                raise e
+    def stats(self):
+        with self._lock:
+            reads, fallbacks = dict(self.reads), self.fallbacks
+        return {
+            'max_lag_seconds': self.max_lag,
+            'read_your_writes_seconds': READ_YOUR_WRITES_WINDOW,
+            'replica_reads': reads,
+            'no_healthy_replica': fallbacks,
+            'replicas': [{
+                'name': replica.name,
+                'healthy': replica.healthy,
+                'lag_seconds': replica.lag,
+                'checked_at': replica.checked_at,
+                'last_error': replica.last_error,
+                'pool': replica.pool.stats(),
+            } for replica in self.replicas],
+        }
 
-        connection.commit()
-        print("Database initialized successfully!")
+def session_wrote_recently(cookie):
+    """True while the read-your-writes cookie (unix time of the last write) is fresh"""
+    try:
+        return time.time() - float(cookie) < READ_YOUR_WRITES_WINDOW
+    except (TypeError, ValueError):
+        return False
 
-    except Error as e:
-        print("Database initialization failed:", e)
+replicas = ReplicaSet(REPLICA_ADDRESSES)
+
+@app.after_request
+def mark_session_write(response):
+    """Pin this client's reads to the primary for a moment after it changed something"""
+    if (replicas and request.method not in ('GET', 'HEAD', 'OPTIONS')
+            and request.path.startswith('/api/') and response.status_code < 400):
+        replicas.note_write()
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, f"{time.time():.3f}",
+                            max_age=int(READ_YOUR_WRITES_WINDOW) + 1, httponly=True, samesite='Lax')
+    target = g.get('db_target')
+    if replicas and target:
+        response.headers['X-DB-Target'] = target
+    return response
+
+# -----------------
+# Instrumentation: per-request DB accounting, Prometheus histograms, slow-query log
+# -----------------
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS') == '1'   # allow X-Profile: 1
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+slow_query_log = logging.getLogger('hostel.slow_query')
+
+def request_metric(name, value):
+    """Add `value` to the current request's counter `name` (no-op outside a request)"""
+    if has_request_context() and 'db_metrics' in g:
+        g.db_metrics[name] += value
+
+class InstrumentedCursor:
+    """Cursor proxy that times execute/fetch calls and counts queries and rows"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, method, operation, params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(operation, params, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_metric('queries', 1)
+            request_metric('db_time', elapsed)
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                metrics.slow_queries += 1
+                slow_query_log.warning("slow query %.1fms: %s params=%r", elapsed * 1000,
+                                       ' '.join(str(operation).split()), params)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, seq_params, *args, **kwargs)
 
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        request_metric('db_time', time.perf_counter() - started)
+        if result is not None:
+            request_metric('rows', len(result) if isinstance(result, list) else 1)
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+class Histogram:
+    """Minimal Prometheus histogram with labels"""
+
+    def __init__(self, name, help_text, buckets, labelnames):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        self._series = {}           # label values -> [bucket counts..., sum, count]
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = ','.join(f'{key}="{value}"' for key, value in zip(self.labelnames, labels))
+            sep = ',' if base else ''
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{base}}} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{{{base}}} {series[-1]}')
+        return lines
+
+class Metrics:
+    SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    COUNTS = (0, 1, 2, 5, 10, 25, 100, 1000, 10000, 100000)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slow_queries = 0
+        self.request_duration = Histogram('hostel_http_request_duration_seconds',
+                                          'Wall time per request.', self.SECONDS, ('method', 'route', 'status'))
+        self.connect_time = Histogram('hostel_db_connect_seconds',
+                                      'Time spent checking out a DB connection per request.', self.SECONDS, ('route',))
+        self.db_time = Histogram('hostel_db_time_seconds',
+                                 'Time spent in execute/fetch calls per request.', self.SECONDS, ('route',))
+        self.serialize_time = Histogram('hostel_serialization_seconds',
+                                        'Time spent encoding JSON per request.', self.SECONDS, ('route',))
+        self.queries = Histogram('hostel_db_queries_per_request',
+                                 'Statements (incl. CALLs) executed per request.', self.COUNTS, ('route',))
+        self.rows = Histogram('hostel_db_rows_per_request',
+                              'Rows fetched per request.', self.COUNTS, ('route',))
+
+    def record(self, method, route, status, wall, counters):
+        with self.lock:
+            self.request_duration.observe((method, route, str(status)), wall)
+            self.connect_time.observe((route,), counters['connect_time'])
+            self.db_time.observe((route,), counters['db_time'])
+            self.serialize_time.observe((route,), counters['serialize_time'])
+            self.queries.observe((route,), counters['queries'])
+            self.rows.observe((route,), counters['rows'])
+
+    def render(self):
+        with self.lock:
+            lines = []
+            for histogram in (self.request_duration, self.connect_time, self.db_time,
+                              self.serialize_time, self.queries, self.rows):
+                lines.extend(histogram.render())
+            lines += ['# HELP hostel_slow_queries_total Statements slower than SLOW_QUERY_MS.',
+                      '# TYPE hostel_slow_queries_total counter',
+                      f'hostel_slow_queries_total {self.slow_queries}']
+        return lines
+
+metrics = Metrics()
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default Flask JSON provider that also books encoding time on the request"""
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            request_metric('serialize_time', time.perf_counter() - started)
+
+app.json_provider_class = TimedJSONProvider
+app.json = TimedJSONProvider(app)
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.db_metrics = {'connect_time': 0.0, 'db_time': 0.0, 'serialize_time': 0.0, 'queries': 0, 'rows': 0}
+    if PROFILE_REQUESTS and request.headers.get('X-Profile') == '1':
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request_metrics(response):
+    """Streamed bodies are produced after this hook, so only their setup is counted"""
+    if 'db_metrics' not in g:
+        return response
+    wall = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if route != '/metrics':
+        metrics.record(request.method, route, response.status_code, wall, g.db_metrics)
+
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{request.endpoint or 'unmatched'}-{int(time.time() * 1000)}.prof")
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(15)
+        app.logger.info("profile for %s %s (%s):\n%s", request.method, request.path, path, summary.getvalue())
+        response.headers['X-Profile-File'] = path
+
+    counters = g.db_metrics
+    response.headers['Server-Timing'] = ', '.join([
+        f"connect;dur={counters['connect_time'] * 1000:.2f}",
+        f"db;dur={counters['db_time'] * 1000:.2f}",
+        f"serialize;dur={counters['serialize_time'] * 1000:.2f}",
+        f"total;dur={wall * 1000:.2f}",
+    ])
+    return response
+
+# -----------------
+# Write notifications and cached aggregates
+# -----------------
+# Write endpoints call notify_write(<tables>) after a successful commit so that
+# in-process caches built from those tables can drop stale data.
+
+DASHBOARD_CACHE_TTL = float(os.environ.get('DASHBOARD_CACHE_TTL', 10))
+# Versioned GET responses; the TTL bounds staleness from writes made by other
+# processes (other workers, CLI commands, the mysql client)
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 60))
+RESPONSE_CACHE_ENTRIES = 256
+RESPONSE_CACHE_MAX_BODY = 8 * 1024 * 1024
+
+# Tables the hostel summary is computed from
+SUMMARY_TABLES = {'student', 'room', 'fees', 'books_mess'}
+
+# Every number shown on the dashboard and in the report; the async server
+# (asgi.py) runs these concurrently, the Flask path as one round trip
+SUMMARY_QUERIES = {
+    'total_students': "SELECT COUNT(*) FROM student",
+    'total_rooms': "SELECT COUNT(*) FROM room",
+    'occupied_rooms': "SELECT COUNT(*) FROM room WHERE no_of_people > 0",
+    'total_occupancy': "SELECT IFNULL(SUM(no_of_people), 0) FROM room",
+    # archived fee rows only survive as per-month totals
+    'total_revenue': "SELECT IFNULL(SUM(amount), 0) + (SELECT IFNULL(SUM(total_amount), 0) FROM fees_period_totals) "
+                     "FROM fees",
+    'mess_bookings': "SELECT COUNT(*) FROM books_mess",
+}
+
+HOSTEL_SUMMARY_SQL = "SELECT " + ",\n       ".join(f"({sql}) AS {name}" for name, sql in SUMMARY_QUERIES.items())
+
+_summary_lock = threading.Lock()
+_summary_cache = {
+    'value': None,
+    'loaded_at': 0.0,
+    'generation': 0,      # bumped on every invalidation
+    'hits': 0,
+    'misses': 0,
+    'invalidations': 0,
+}
+
+_versions_lock = threading.Lock()
+_table_versions = {}      # table -> number of committed writes seen by this process
+
+_response_lock = threading.Lock()
+_response_cache = {}      # (endpoint, query string, view args) -> entry, oldest first
+_response_stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+
+def notify_write(*tables):
+    """Invalidate cached data derived from any of `tables`"""
+    with _versions_lock:
+        for table in tables:
+            _table_versions[table] = _table_versions.get(table, 0) + 1
+    if SUMMARY_TABLES.intersection(tables):
+        events.mark_stats_dirty()
+        with _summary_lock:
+            _summary_cache['value'] = None
+            _summary_cache['generation'] += 1
+            _summary_cache['invalidations'] += 1
+
+def after_commit(hook, *args):
+    """
+    Run a post-commit side effect (index refresh, live event). The write has
+    already succeeded, so a failure here is logged instead of turning the
+    response into a 500 that would make clients retry a committed write.
+    """
+    try:
+        hook(*args)
+    except Exception as e:
+        print(f"Post-commit {getattr(hook, '__qualname__', hook)} failed: {e}")
+
+def cached_summary():
+    """(summary, generation); summary is None on a miss - pass generation to store_summary()"""
+    with _summary_lock:
+        value = _summary_cache['value']
+        if value is not None and time.monotonic() - _summary_cache['loaded_at'] < DASHBOARD_CACHE_TTL:
+            _summary_cache['hits'] += 1
+            return value, None
+        _summary_cache['misses'] += 1
+        return None, _summary_cache['generation']
+
+def store_summary(value, generation):
+    with _summary_lock:
+        # a write that landed while we were querying makes this result stale
+        if _summary_cache['generation'] == generation:
+            _summary_cache['value'] = value
+            _summary_cache['loaded_at'] = time.monotonic()
+
+def load_hostel_summary():
+    """
+    Return the hostel summary row, served from cache while it is younger than
+    DASHBOARD_CACHE_TTL and no relevant write has happened. Raises Error when
+    the database cannot be reached.
+    """
+    value, generation = cached_summary()
+    if value is not None:
+        return value
+
+    if has_request_context():
+        g.filling_shared_cache = True
+    connection = get_db_connection()
+    if not connection:
+        raise Error(msg='Database connection failed')
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(HOSTEL_SUMMARY_SQL)
+        value = cursor.fetchone()
+        cursor.close()
     finally:
+        connection.close()
+
+    store_summary(value, generation)
+    return value
+
+def dashboard_stats(summary):
+    return {
+        'total_students': summary['total_students'],
+        'total_rooms': summary['total_rooms'],
+        'occupied_rooms': summary['occupied_rooms'],
+        'total_revenue': float(summary['total_revenue']) if summary['total_revenue'] else 0,
+        'mess_bookings': summary['mess_bookings'],
+    }
+
+def hostel_report(summary):
+    """Same metrics as sp_generate_hostel_report"""
+    return [{'metric': metric, 'value': summary[metric]}
+            for metric in ('total_rooms', 'total_occupancy', 'total_students', 'total_revenue')]
+
+def summary_cache_stats():
+    with _summary_lock:
+        lookups = _summary_cache['hits'] + _summary_cache['misses']
+        cached = _summary_cache['value'] is not None
+        return {
+            'ttl_seconds': DASHBOARD_CACHE_TTL,
+            'cached': cached,
+            'age_seconds': round(time.monotonic() - _summary_cache['loaded_at'], 3) if cached else None,
+            'hits': _summary_cache['hits'],
+            'misses': _summary_cache['misses'],
+            'hit_ratio': round(_summary_cache['hits'] / lookups, 4) if lookups else 0,
+            'invalidations': _summary_cache['invalidations'],
+        }
+
+def table_versions(tables):
+    with _versions_lock:
+        return tuple(_table_versions.get(table, 0) for table in tables)
+
+def note_not_modified():
+    with _response_lock:
+        _response_stats['not_modified'] += 1
+
+def cached_body(key, tables):
+    """(entry, versions); entry is None on a miss - pass versions to store_body()"""
+    versions = table_versions(tables)
+    with _response_lock:
+        entry = _response_cache.get(key)
+        if (entry and entry['versions'] == versions
+                and time.monotonic() - entry['stored_at'] < RESPONSE_CACHE_TTL):
+            _response_stats['hits'] += 1
+            return entry, versions
+        _response_stats['misses'] += 1
+        return None, versions
+
+def store_body(key, tables, versions, body, mimetype):
+    """Cache a response body read at `versions`; returns its ETag"""
+    etag = hashlib.sha1(body).hexdigest()
+    if len(body) <= RESPONSE_CACHE_MAX_BODY:
+        with _response_lock:
+            # a write during the query means the body may already be stale
+            if table_versions(tables) == versions:
+                _response_cache.pop(key, None)
+                _response_cache[key] = {'versions': versions, 'stored_at': time.monotonic(),
+                                        'body': body, 'etag': etag, 'mimetype': mimetype}
+                while len(_response_cache) > RESPONSE_CACHE_ENTRIES:
+                    del _response_cache[next(iter(_response_cache))]
+    return etag
+
+def response_cache_key(endpoint, query_string, view_args=()):
+    """Cache key shared by cached_response and the ASGI native routes"""
+    return endpoint, query_string, tuple(sorted(view_args))
+
+def cached_response(*tables):
+    """
+    Cache a GET view's JSON body until a write to one of `tables` (or
+    RESPONSE_CACHE_TTL). Responses carry a strong ETag - a hash of the body, so
+    it stays valid across worker processes - and If-None-Match gets a 304.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = response_cache_key(request.endpoint, request.query_string, kwargs.items())
+            entry, versions = cached_body(key, tables)
+            if entry:
+                response = Response(entry['body'], mimetype=entry['mimetype'])
+                etag = entry['etag']
+            else:
+                g.filling_shared_cache = True
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                etag = store_body(key, tables, versions, response.get_data(), response.mimetype)
+
+            if request.if_none_match.contains(etag):
+                note_not_modified()
+                response = Response(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+def conditional_response(response):
+    """
+    Strong body-hash ETag and 304 on If-None-Match for a view that is not behind
+    cached_response (its body has its own cache, e.g. the hostel summary)
+    """
+    response = app.make_response(response)
+    if response.status_code != 200 or response.is_streamed:
+        return response
+    etag = hashlib.sha1(response.get_data()).hexdigest()
+    if request.if_none_match.contains(etag):
+        note_not_modified()
+        response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def response_cache_stats():
+    with _response_lock:
+        return dict(_response_stats, entries=len(_response_cache), ttl_seconds=RESPONSE_CACHE_TTL)
+
+# -----------------
+# Schema bootstrap and migrations
+# -----------------
+# A fresh database is created from schema.sql (the full current schema plus
+# sample data); migrations/NNN_name.sql then upgrade existing databases one
+# step at a time. schema_migrations records each applied step with a checksum,
+# so a repeated start costs one query. schema.sql already contains every
+# migration, so bootstrapping marks them all as applied.
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+FIXTURE_CHUNK_SIZE = 5000
+_MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+_IDENTIFIER = re.compile(r'^\w+$')
+
+SCHEMA_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at DATETIME NOT NULL,
+        duration_ms INT NOT NULL DEFAULT 0
+    )
+"""
+
+class MigrationError(Exception):
+    """A migration could not be applied or no longer matches what was applied"""
+
+def split_sql_statements(text):
+    """
+    Split a MySQL script into statements. Honours DELIMITER lines and ignores
+    delimiters inside quotes, backticks and comments (comments are dropped,
+    /*! ... */ version hints are kept).
+    """
+    statements, buf = [], []
+    delimiter = ';'
+    i, n = 0, len(text)
+    line_start = True
+    while i < n:
+        if line_start:
+            line_end = text.find('\n', i)
+            line_end = n if line_end == -1 else line_end
+            words = text[i:line_end].split()
+            if len(words) == 2 and words[0].upper() == 'DELIMITER' and not ''.join(buf).strip():
+                delimiter = words[1]
+                i = line_end
+                continue
+        ch = text[i]
+        line_start = ch == '\n'
+        if ch in '\'"`':
+            j = i + 1
+            while j < n:
+                if text[j] == '\\' and ch != '`':
+                    j += 2
+                elif text[j] == ch:
+                    if text[j + 1:j + 2] != ch:
+                        break
+                    j += 2
+                else:
+                    j += 1
+            buf.append(text[i:j + 1])
+            i = j + 1
+        elif ch == '#' or (text.startswith('--', i) and text[i + 2:i + 3] in ('', ' ', '\t', '\r', '\n')):
+            j = text.find('\n', i)
+            i = n if j == -1 else j
+        elif text.startswith('/*', i) and not text.startswith('/*!', i):
+            j = text.find('*/', i + 2)
+            i = n if j == -1 else j + 2
+        elif text.startswith(delimiter, i):
+            statement = ''.join(buf).strip()
+            if statement:
+                statements.append(statement)
+            buf = []
+            i += len(delimiter)
+        else:
+            buf.append(ch)
+            i += 1
+    statement = ''.join(buf).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+def file_checksum(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read().replace(b'\r\n', b'\n')).hexdigest()
+
+def discover_migrations():
+    """[(version, name, path)] for migrations/NNN_name.sql, in version order"""
+    found = []
+    if os.path.isdir(MIGRATIONS_DIR):
+        for filename in os.listdir(MIGRATIONS_DIR):
+            match = _MIGRATION_FILE.match(filename)
+            if match:
+                found.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    found.sort()
+    versions = [version for version, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return found
+
+def run_sql_file(cursor, path):
+    """Execute every statement of a script; data changes are committed once by the caller"""
+    with open(path, encoding='utf-8') as f:
+        statements = split_sql_statements(f.read())
+    for statement in statements:
         try:
-            cursor.close()
-            connection.close()
-        except:
-            pass
+            cursor.execute(statement)
+            if cursor.with_rows:
+                cursor.fetchall()
+        except Error as e:
+            raise MigrationError(f"{os.path.basename(path)}: {e}\n{statement[:500]}") from e
+    return len(statements)
+
+def load_fixture(connection, path, chunk_size=FIXTURE_CHUNK_SIZE):
+    """
+    Bulk-load a JSON fixture: {"tables": [{"table": ..., "columns": [...], "rows": [[...], ...]}]}.
+    Tables load in the listed order as multi-row INSERTs, one commit per chunk;
+    "ignore_duplicates": true on a table skips rows whose key already exists.
+    Room occupancy is taken from the fixture's room rows, so the allocation
+    triggers' per-row room update is skipped while loading.
+    """
+    with open(path, encoding='utf-8') as f:
+        fixture = json.load(f)
+    counts = {}
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SET @hm_bulk_allocation = 1")
+        cursor.execute("SET SESSION unique_checks = 0")
+        for entry in fixture['tables']:
+            table, columns, rows = entry['table'], entry['columns'], entry['rows']
+            if not all(_IDENTIFIER.match(name) for name in [table] + columns):
+                raise MigrationError(f"{path}: bad table or column name in {table!r}")
+            sql = (f"INSERT {'IGNORE ' if entry.get('ignore_duplicates') else ''}INTO {table} ({', '.join(columns)}) "
+                   f"VALUES ({', '.join(['%s'] * len(columns))})")
+            for offset in range(0, len(rows), chunk_size):
+                cursor.executemany(sql, [tuple(row) for row in rows[offset:offset + chunk_size]])
+                connection.commit()
+            counts[table] = counts.get(table, 0) + len(rows)
+    except Error as e:
+        connection.rollback()
+        raise MigrationError(f"{path}: {e}") from e
+    finally:
+        cursor.execute("SET SESSION unique_checks = 1")
+        cursor.execute("SET @hm_bulk_allocation = NULL")
+        cursor.close()
+    return counts
+
+def applied_migrations(cursor):
+    cursor.execute("SELECT version, name, checksum FROM schema_migrations ORDER BY version")
+    return {version: (name, checksum) for version, name, checksum in cursor.fetchall()}
+
+def migrate(fresh=False, seed=None, dry_run=False):
+    """
+    Bring the database up to date and return a report of what ran:
+    - no schema yet (or fresh=True): run schema.sql and record every migration as applied
+    - otherwise: apply the migrations missing from schema_migrations, in order
+    Applied migrations whose file has changed since are an error. seed is an
+    optional fixture loaded afterwards.
+    """
+    started = time.perf_counter()
+    report = {'bootstrapped': False, 'applied': [], 'seeded': {}, 'steps': []}
+    connection = mysql.connector.connect(
+        host=DB_CONFIG['host'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password']
+    )
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
+        cursor.execute(f"USE {DB_CONFIG['database']}")
+        cursor.execute(SCHEMA_MIGRATIONS_DDL)
+        cursor.execute("SELECT COUNT(*) FROM information_schema.tables "
+                       "WHERE table_schema = DATABASE() AND table_name = 'student'")
+        has_schema = cursor.fetchone()[0] > 0
+        applied = {} if fresh else applied_migrations(cursor)
+        migrations = discover_migrations()
+
+        for version, name, path in migrations:
+            if version in applied and applied[version][1] != file_checksum(path):
+                raise MigrationError(f"Migration {version:03d}_{name} changed after it was applied; "
+                                     f"add a new migration instead")
+
+        def record(version, name, checksum, duration_ms):
+            cursor.execute("""
+                REPLACE INTO schema_migrations (version, name, checksum, applied_at, duration_ms)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (version, name, checksum, datetime.now(), duration_ms))
+
+        if fresh or not has_schema:
+            report['bootstrapped'] = True
+            if not dry_run:
+                step_started = time.perf_counter()
+                cursor.execute("DELETE FROM schema_migrations")
+                statements = run_sql_file(cursor, SCHEMA_PATH)
+                duration_ms = round((time.perf_counter() - step_started) * 1000)
+                record(0, 'schema', file_checksum(SCHEMA_PATH), duration_ms)
+                for version, name, path in migrations:
+                    record(version, name, file_checksum(path), 0)
+                connection.commit()
+                report['steps'].append({'step': 'schema.sql', 'statements': statements, 'ms': duration_ms})
+        else:
+            for version, name, path in migrations:
+                if version in applied:
+                    continue
+                report['applied'].append(f"{version:03d}_{name}")
+                if dry_run:
+                    continue
+                step_started = time.perf_counter()
+                try:
+                    statements = run_sql_file(cursor, path)
+                except MigrationError:
+                    connection.rollback()
+                    raise
+                duration_ms = round((time.perf_counter() - step_started) * 1000)
+                record(version, name, file_checksum(path), duration_ms)
+                connection.commit()
+                report['steps'].append({'step': f"{version:03d}_{name}", 'statements': statements,
+                                        'ms': duration_ms})
+    finally:
+        cursor.close()
+
+    try:
+        if seed and not dry_run:
+            step_started = time.perf_counter()
+            report['seeded'] = load_fixture(connection, seed)
+            report['steps'].append({'step': os.path.basename(seed), 'rows': sum(report['seeded'].values()),
+                                    'ms': round((time.perf_counter() - step_started) * 1000)})
+    finally:
+        connection.close()
+    report['elapsed_ms'] = round((time.perf_counter() - started) * 1000)
+    return report
+
+def init_database():
+    """Create or upgrade the database: schema.sql on first run, then pending migrations."""
+    try:
+        report = migrate()
+    except (Error, MigrationError) as e:
+        print("Database initialization failed:", e)
+        return
+    if report['bootstrapped'] or report['applied']:
+        for step in report['steps']:
+            print(f"  {step['step']}: {step['ms']}ms")
+        print(f"Database initialized successfully! ({report['elapsed_ms']}ms)")
 
 # Routes for serving HTML pages (unchanged)
 @app.route('/')
@@ -125,30 +1138,230 @@ def fees_page():
 # API Endpoints (now using stored procedures where available)
 # -----------------
 
+# -----------------
+# Fast row serialization for the large list endpoints
+# -----------------
+# Rows come from plain (tuple) cursors; one converter per column is picked from
+# the column type, Decimal/date values are converted column by column, and the
+# result is encoded without json's per-value default() dispatch. The output is
+# the same as jsonify() on dictionary rows (sorted keys, Decimal as string,
+# dates as HTTP dates). ?shape=columns returns {"columns": [...], "rows": [[...]]}.
+
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'orjson' if orjson else 'json')
+
+DECIMAL_TYPES = {FieldType.DECIMAL, FieldType.NEWDECIMAL}
+DATE_TYPES = {FieldType.DATE, FieldType.NEWDATE, FieldType.DATETIME, FieldType.TIMESTAMP}
+
+@functools.lru_cache(maxsize=4096)
+def _http_date(value):
+    return http_date(value)
+
+def _column_converter(type_code):
+    if type_code in DECIMAL_TYPES:
+        return str
+    if type_code in DATE_TYPES:
+        return _http_date
+    if type_code == FieldType.TIME:
+        return str
+    return None
+
+class RowEncoder:
+    """Converts tuple rows from one cursor into JSON-native records or columns"""
+
+    def __init__(self, description):
+        self.columns = [column[0] for column in description]
+        # dictionary cursors keep the last of duplicate names; jsonify sorts keys
+        last = {name: i for i, name in enumerate(self.columns)}
+        self.keys = sorted(last)
+        self.order = [last[name] for name in self.keys]
+        self.converters = [_column_converter(column[1]) for column in description]
+
+    def _convert(self, rows):
+        """Column-major values with every converter applied once per column"""
+        if not rows:
+            return [() for _ in self.columns]
+        converted = []
+        for convert, values in zip(self.converters, zip(*rows)):
+            if convert is not None:
+                values = [None if value is None else convert(value) for value in values]
+            converted.append(values)
+        return converted
+
+    def records(self, rows):
+        columns = self._convert(rows)
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in zip(*(columns[i] for i in self.order))]
+
+    def rows(self, rows):
+        return [list(row) for row in zip(*self._convert(rows))]
+
+def dumps_fast(obj):
+    """Encode already JSON-native data (output of RowEncoder) to bytes"""
+    if JSON_ENCODER == 'orjson' and orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def wants_columns():
+    return request.args.get('shape') == 'columns'
+
+def fast_rows_response(cursor, rows):
+    """JSON response for rows fetched from a tuple cursor, in the requested shape"""
+    started = time.perf_counter()
+    encoder = RowEncoder(cursor.description)
+    if wants_columns():
+        body = dumps_fast({'columns': encoder.columns, 'rows': encoder.rows(rows)})
+    else:
+        body = dumps_fast(encoder.records(rows))
+    request_metric('serialize_time', time.perf_counter() - started)
+    return Response(body + b'\n', mimetype='application/json')
+
+# -----------------
+# Streaming responses for the large list endpoints
+# -----------------
+STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 500))
+
+def wants_stream():
+    """Streaming is selected with ?stream=1 or an Accept: application/x-ndjson header"""
+    return (request.args.get('stream') == '1'
+            or 'application/x-ndjson' in request.headers.get('Accept', ''))
+
+DATE_WINDOW_PARAMS = ('from', 'to')
+
+def date_window():
+    """
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD (inclusive, either may be omitted) as a
+    half-open {'start', 'end'} range, or None when neither is given. An omitted
+    end stays open, so future-dated rows (e.g. next month's mess rollover fees)
+    are included.
+    """
+    if not any(request.args.get(name) for name in DATE_WINDOW_PARAMS):
+        return None
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else date.min
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else date.max
+    except ValueError:
+        raise ValueError('from and to must be dates (YYYY-MM-DD)')
+    if end < start:
+        raise ValueError('to must not be before from')
+    return {'start': start, 'end': end + timedelta(days=1) if end < date.max else end}
+
+def stream_query(sql, params=()):
+    """
+    Run `sql` on an unbuffered cursor and stream the rows as they arrive.
+    NDJSON (one object per line) when the client accepts application/x-ndjson,
+    otherwise a JSON array written incrementally, so existing clients can parse it.
+    Rows are pulled with fetchmany(STREAM_CHUNK_SIZE); worker memory stays flat.
+    With ?shape=columns the array form becomes {"columns": [...], "rows": [[...]]}.
+    """
+    ndjson = 'application/x-ndjson' in request.headers.get('Accept', '')
+    columnar = not ndjson and wants_columns()
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+    except Error as e:
+        connection.discard()
+        return jsonify({'error': str(e)}), 500
+
+    encoder = RowEncoder(cursor.description)
+
+    def generate():
+        finished = False
+        try:
+            first = True
+            if columnar:
+                yield b'{"columns":' + dumps_fast(encoder.columns) + b',"rows":['
+            elif not ndjson:
+                yield b'['
+            while True:
+                rows = cursor.fetchmany(STREAM_CHUNK_SIZE)
+                if not rows:
+                    break
+                if ndjson:
+                    yield b''.join(dumps_fast(row) + b'\n' for row in encoder.records(rows))
+                else:
+                    values = encoder.rows(rows) if columnar else encoder.records(rows)
+                    chunk = b','.join(dumps_fast(value) for value in values)
+                    yield chunk if first else b',' + chunk
+                    first = False
+            if columnar:
+                yield b']}'
+            elif not ndjson:
+                yield b']'
+            finished = True
+        except Error as e:
+            # headers are already sent; all we can do is log and end the body
+            print(f"Error while streaming rows: {e}")
+        finally:
+            if finished:
+                cursor.close()
+                connection.close()
+            else:
+                # client went away or the query failed mid-way: unread rows
+                # make the connection unusable, so drop it instead of pooling it
+                connection.discard()
+
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(generate(), mimetype=mimetype)
+
 # Fees endpoint (keeps JOIN to include student name)
+FEES_LIST_SQL = """
+    SELECT 
+        f.p_id,
+        f.p_date,
+        f.p_method,
+        f.amount,
+        s.s_id,
+        CONCAT(s.f_name, ' ', IFNULL(s.m_name,''), ' ', s.l_name) AS student_name
+    FROM fees f
+    LEFT JOIN student_room_fees srf ON f.p_id = srf.p_id
+    LEFT JOIN student s ON srf.s_id = s.s_id
+    ORDER BY f.p_date DESC
+"""
+
+# ?from=&to= : both tiers (fees + fees_archive), each pruned by its p_date index
+FEES_RANGE_SQL = """
+    SELECT 
+        f.p_id,
+        f.p_date,
+        f.p_method,
+        f.amount,
+        s.s_id,
+        CONCAT(s.f_name, ' ', IFNULL(s.m_name,''), ' ', s.l_name) AS student_name
+    FROM (
+        SELECT p_id, p_date, p_method, amount FROM fees
+        WHERE p_date >= %(start)s AND p_date < %(end)s
+        UNION ALL
+        SELECT p_id, p_date, p_method, amount FROM fees_archive
+        WHERE p_date >= %(start)s AND p_date < %(end)s
+    ) f
+    LEFT JOIN student_room_fees srf ON f.p_id = srf.p_id
+    LEFT JOIN student s ON srf.s_id = s.s_id
+    ORDER BY f.p_date DESC
+"""
+
 @app.route('/api/fees', methods=['GET'])
 def get_fees():
+    try:
+        window = date_window()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    sql, params = (FEES_RANGE_SQL, window) if window else (FEES_LIST_SQL, ())
+    if wants_stream():
+        return stream_query(sql, params)
+
     connection = get_db_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
 
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                f.p_id,
-                f.p_date,
-                f.p_method,
-                f.amount,
-                s.s_id,
-                CONCAT(s.f_name, ' ', IFNULL(s.m_name,''), ' ', s.l_name) AS student_name
-            FROM fees f
-            LEFT JOIN student_room_fees srf ON f.p_id = srf.p_id
-            LEFT JOIN student s ON srf.s_id = s.s_id
-            ORDER BY f.p_date DESC
-        """)
-        rows = cursor.fetchall()
-        return jsonify(rows)
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+        return fast_rows_response(cursor, cursor.fetchall())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -156,29 +1369,58 @@ def get_fees():
         connection.close()
 
 # Laundry submissions (kept select)
+LAUNDRY_SUBMISSIONS_SQL = """
+    SELECT 
+        gl.s_id AS student_id,
+        CONCAT(s.f_name, ' ', s.l_name) AS student_name,
+        gl.l_no AS service_name,
+        l.days_of_laundry AS days,
+        (l.days_of_laundry * l.rate_per_day) AS cost,
+        gl.submission_date AS date
+    FROM gives_laundry gl
+    JOIN student s ON gl.s_id = s.s_id
+    JOIN laundry l ON gl.l_no = l.l_no
+    ORDER BY gl.submission_date DESC
+"""
+
+LAUNDRY_RANGE_SQL = """
+    SELECT 
+        gl.s_id AS student_id,
+        CONCAT(s.f_name, ' ', s.l_name) AS student_name,
+        gl.l_no AS service_name,
+        l.days_of_laundry AS days,
+        (l.days_of_laundry * l.rate_per_day) AS cost,
+        gl.submission_date AS date
+    FROM (
+        SELECT s_id, l_no, submission_date FROM gives_laundry
+        WHERE submission_date >= %(start)s AND submission_date < %(end)s
+        UNION ALL
+        SELECT s_id, l_no, submission_date FROM gives_laundry_archive
+        WHERE submission_date >= %(start)s AND submission_date < %(end)s
+    ) gl
+    JOIN student s ON gl.s_id = s.s_id
+    JOIN laundry l ON gl.l_no = l.l_no
+    ORDER BY gl.submission_date DESC
+"""
+
 @app.route('/api/laundry/submissions', methods=['GET'])
 def get_laundry_submissions():
+    try:
+        window = date_window()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    sql, params = (LAUNDRY_RANGE_SQL, window) if window else (LAUNDRY_SUBMISSIONS_SQL, ())
+    if wants_stream():
+        return stream_query(sql, params)
+
     connection = get_db_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
 
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                gl.s_id AS student_id,
-                CONCAT(s.f_name, ' ', s.l_name) AS student_name,
-                gl.l_no AS service_name,
-                l.days_of_laundry AS days,
-                (l.days_of_laundry * l.rate_per_day) AS cost,
-                gl.submission_date AS date
-            FROM gives_laundry gl
-            JOIN student s ON gl.s_id = s.s_id
-            JOIN laundry l ON gl.l_no = l.l_no
-            ORDER BY gl.submission_date DESC
-        """)
-        rows = cursor.fetchall()
-        return jsonify(rows)
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+        return fast_rows_response(cursor, cursor.fetchall())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -186,90 +1428,543 @@ def get_laundry_submissions():
         connection.close()
 
 
-# Students API (list) — unchanged (keeps existing joins)
+# -----------------
+# History archive (fees / gives_laundry)
+# -----------------
+# fees and gives_laundry cannot be range-partitioned (InnoDB partitioning
+# rules out the foreign keys both take part in), so closed periods move to an
+# archive tier instead: fees_archive and gives_laundry_archive (same columns
+# and date indexes), plus fees_period_totals with per-month totals of the
+# archived fees. Fee rows still referenced by a current allocation stay hot.
+# The list endpoints read the hot tables unless ?from=&to= asks for a window,
+# and the dashboard adds the archived totals instead of re-summing history.
+ARCHIVE_AFTER_MONTHS = int(os.environ.get('ARCHIVE_AFTER_MONTHS', 12))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 5000))
+ARCHIVE_INTERVAL = float(os.environ.get('ARCHIVE_INTERVAL', 0))    # seconds; 0 = only via the CLI
+
+def archive_cutoff(months=ARCHIVE_AFTER_MONTHS, today=None):
+    """First day of the oldest month that stays hot"""
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+def archive_fees_batch(cursor, cutoff, batch_size):
+    cursor.execute("""
+        SELECT p_id FROM fees f
+        WHERE f.p_date < %s
+          AND NOT EXISTS (SELECT 1 FROM student_room_fees srf WHERE srf.p_id = f.p_id)
+        ORDER BY f.p_date
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (cutoff, batch_size))
+    p_ids = [row[0] for row in cursor.fetchall()]
+    if not p_ids:
+        return 0
+    placeholders = ', '.join(['%s'] * len(p_ids))
+    cursor.execute(f"""
+        INSERT INTO fees_archive (p_id, p_date, p_method, amount)
+        SELECT p_id, p_date, p_method, amount FROM fees WHERE p_id IN ({placeholders})
+    """, p_ids)
+    cursor.execute(f"""
+        INSERT INTO fees_period_totals (period_year, period_month, p_method, fee_count, total_amount)
+        SELECT YEAR(p_date), MONTH(p_date), p_method, COUNT(*), SUM(amount)
+        FROM fees WHERE p_id IN ({placeholders})
+        GROUP BY YEAR(p_date), MONTH(p_date), p_method
+        ON DUPLICATE KEY UPDATE fee_count = fee_count + VALUES(fee_count),
+                                total_amount = total_amount + VALUES(total_amount)
+    """, p_ids)
+    cursor.execute(f"DELETE FROM fees WHERE p_id IN ({placeholders})", p_ids)
+    return len(p_ids)
+
+def archive_laundry_batch(cursor, cutoff, batch_size):
+    cursor.execute("""
+        SELECT s_id, l_no, submission_date FROM gives_laundry
+        WHERE submission_date < %s
+        ORDER BY submission_date
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (cutoff, batch_size))
+    keys = cursor.fetchall()
+    if not keys:
+        return 0
+    placeholders = ', '.join(['(%s, %s, %s)'] * len(keys))
+    params = [value for key in keys for value in key]
+    cursor.execute(f"""
+        INSERT INTO gives_laundry_archive (s_id, l_no, submission_date)
+        SELECT s_id, l_no, submission_date FROM gives_laundry
+        WHERE (s_id, l_no, submission_date) IN ({placeholders})
+    """, params)
+    # no delete trigger on gives_laundry: the ledger keeps the laundry charges
+    cursor.execute(f"DELETE FROM gives_laundry WHERE (s_id, l_no, submission_date) IN ({placeholders})", params)
+    return len(keys)
+
+def archive_history(connection, cutoff=None, batch_size=ARCHIVE_BATCH_SIZE, progress=None):
+    """
+    Move fees and laundry submissions dated before `cutoff` to the archive
+    tier, one short transaction per batch (SKIP LOCKED, so concurrent runs
+    split the work). Returns {'fees': n, 'gives_laundry': n, 'elapsed_ms': ...}.
+    """
+    cutoff = cutoff or archive_cutoff()
+    started = time.perf_counter()
+    moved = {'fees': 0, 'gives_laundry': 0}
+    for table, batch in (('fees', archive_fees_batch), ('gives_laundry', archive_laundry_batch)):
+        while True:
+            count = run_transaction(connection, lambda cursor: batch(cursor, cutoff, batch_size))
+            if not count:
+                break
+            moved[table] += count
+            if progress:
+                progress(table, moved[table])
+    if moved['fees'] or moved['gives_laundry']:
+        notify_write('fees', 'gives_laundry')
+    moved['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return moved
+
+def _archive_loop():
+    while True:
+        time.sleep(ARCHIVE_INTERVAL)
+        connection = get_db_connection()
+        if not connection:
+            continue
+        try:
+            moved = archive_history(connection)
+            if moved['fees'] or moved['gives_laundry']:
+                print(f"Archived {moved['fees']} fees and {moved['gives_laundry']} laundry submissions "
+                      f"in {moved['elapsed_ms']}ms")
+        except Error as e:
+            print(f"Error archiving history: {e}")
+        finally:
+            connection.close()
+
+if ARCHIVE_INTERVAL > 0:
+    threading.Thread(target=_archive_loop, daemon=True).start()
+
+# Students API (list) — keyset pagination on s_id plus server-side filters
+STUDENT_PAGE_DEFAULT = 100
+STUDENT_PAGE_MAX = 500
+STUDENT_LIST_PARAMS = ('after', 'limit', 'room', 'mess', 'warden', 'name')
+
+STUDENT_LIST_SQL = """
+    SELECT s.*, 
+           srf.r_no, 
+           f.amount as fees_paid, 
+           f.p_date,
+           f.p_method,
+           m.m_name as mess_name,
+           lg.name as guardian_name,
+           lg.p_no as guardian_phone
+    FROM {source}
+    LEFT JOIN student_room_fees srf ON s.s_id = srf.s_id
+    LEFT JOIN fees f ON srf.p_id = f.p_id
+    LEFT JOIN books_mess bm ON s.s_id = bm.s_id
+    LEFT JOIN mess m ON bm.m_no = m.m_no
+    LEFT JOIN local_guardian lg ON s.s_id = lg.s_id
+"""
+# the tables STUDENT_LIST_SQL reads: a write to any of them invalidates cached lists
+STUDENT_LIST_TABLES = ('student', 'student_room_fees', 'fees', 'books_mess', 'mess', 'local_guardian')
+
+def _like_prefix(value):
+    """Escape LIKE wildcards so user input is matched as a literal prefix"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def _student_page_query(args):
+    """
+    Build the paginated student query.
+    The page of s_ids is picked in a derived table (student_room_fees and books_mess
+    are keyed by s_id, so the filters never duplicate rows) and only then joined out,
+    which keeps a student with several guardians from being split across pages.
+    """
+    limit = args.get('limit', STUDENT_PAGE_DEFAULT, type=int)
+    limit = max(1, min(limit, STUDENT_PAGE_MAX))
+
+    joins, where, params = [], [], []
+    if args.get('after'):
+        where.append("s.s_id > %s")
+        params.append(args['after'])
+    if args.get('room'):
+        joins.append("JOIN student_room_fees fr ON fr.s_id = s.s_id")
+        where.append("fr.r_no = %s")
+        params.append(args['room'])
+    if args.get('mess'):
+        joins.append("JOIN books_mess fb ON fb.s_id = s.s_id")
+        where.append("fb.m_no = %s")
+        params.append(args['mess'])
+    if args.get('warden'):
+        where.append("EXISTS (SELECT 1 FROM monitors mon WHERE mon.s_id = s.s_id AND mon.w_id = %s)")
+        params.append(args['warden'])
+    if args.get('name'):
+        prefix = _like_prefix(args['name'])
+        where.append("(s.f_name LIKE %s OR s.l_name LIKE %s)")
+        params.extend([prefix, prefix])
+
+    # fetch one extra id to know whether another page exists
+    page = f"""
+        (SELECT s.s_id FROM student s {' '.join(joins)}
+         {'WHERE ' + ' AND '.join(where) if where else ''}
+         ORDER BY s.s_id LIMIT %s) page
+        JOIN student s ON s.s_id = page.s_id
+    """
+    params.append(limit + 1)
+    sql = STUDENT_LIST_SQL.format(source=page) + " ORDER BY s.s_id"
+    return sql, params, limit
+
 @app.route('/api/students', methods=['GET'])
+@cached_response(*STUDENT_LIST_TABLES)
 def get_students():
+    """
+    Without query parameters returns the full list (legacy shape used by the pages).
+    With any of ?after=&limit=&room=&mess=&warden=&name= returns one page:
+        {"students": [...], "next_cursor": "<s_id>" | null}
+    Pass next_cursor back as ?after= to fetch the following page.
+    The full list can also be streamed (?stream=1 or Accept: application/x-ndjson).
+    """
+    paginated = any(key in request.args for key in STUDENT_LIST_PARAMS)
+    if not paginated and wants_stream():
+        return stream_query(STUDENT_LIST_SQL.format(source="student s"))
+
     connection = get_db_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
 
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT s.*, 
-                   srf.r_no, 
-                   f.amount as fees_paid, 
-                   f.p_date,
-                   f.p_method,
-                   m.m_name as mess_name,
-                   lg.name as guardian_name,
-                   lg.p_no as guardian_phone
-            FROM student s
-            LEFT JOIN student_room_fees srf ON s.s_id = srf.s_id
-            LEFT JOIN fees f ON srf.p_id = f.p_id
-            LEFT JOIN books_mess bm ON s.s_id = bm.s_id
-            LEFT JOIN mess m ON bm.m_no = m.m_no
-            LEFT JOIN local_guardian lg ON s.s_id = lg.s_id
-        """)
+        # pages are post-processed by key; the full list goes through the fast encoder
+        cursor = connection.cursor(dictionary=paginated)
+        if not paginated:
+            cursor.execute(STUDENT_LIST_SQL.format(source="student s"))
+            return fast_rows_response(cursor, cursor.fetchall())
+
+        sql, params, limit = _student_page_query(request.args)
+        cursor.execute(sql, params)
         students = cursor.fetchall()
-        return jsonify(students)
+
+        # rows are ordered by s_id; keep the first `limit` distinct students
+        page_ids = []
+        for row in students:
+            if not page_ids or page_ids[-1] != row['s_id']:
+                page_ids.append(row['s_id'])
+        next_cursor = None
+        if len(page_ids) > limit:
+            next_cursor = page_ids[limit - 1]
+            keep = set(page_ids[:limit])
+            students = [row for row in students if row['s_id'] in keep]
+
+        return jsonify({'students': students, 'next_cursor': next_cursor})
     except Error as e:
         return jsonify({'error': str(e)}), 500
     finally:
         cursor.close()
         connection.close()
 
-# Rooms - list available rooms using stored procedure sp_list_available_rooms
-@app.route('/api/rooms', methods=['GET'])
-def get_rooms():
-    connection = get_db_connection()
-    if not connection:
-        return jsonify({'error': 'Database connection failed'}), 500
+# -----------------
+# Live events (Server-Sent Events)
+# -----------------
+# Write paths publish small deltas - room occupancy, new fee rows, dashboard
+# counters - and every /api/events client gets them from its own bounded
+# queue, so open screens can stop polling. Stats are coalesced: at most one
+# summary query per EVENTS_STATS_INTERVAL however many writes or clients.
+EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', 100))
+EVENTS_HISTORY = int(os.environ.get('EVENTS_HISTORY', 500))       # replayed on reconnect (Last-Event-ID)
+EVENTS_HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT', 15))
+EVENTS_STATS_INTERVAL = float(os.environ.get('EVENTS_STATS_INTERVAL', 2))
+EVENTS_MAX_CLIENTS = int(os.environ.get('EVENTS_MAX_CLIENTS', 200))
+
+class EventBroadcaster:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._history = deque(maxlen=EVENTS_HISTORY)   # (id, formatted message)
+        self._next_id = 1
+        self._stats_dirty = False
+        self._stats_thread = None
+        self.stats_counters = {'published': 0, 'dropped_clients': 0}
 
+    def has_subscribers(self):
+        return bool(self._clients)
+
+    def publish(self, event, data):
+        """Format once, fan out to every client; a full client queue is reset to a resync"""
+        payload = app.json.dumps(data, separators=(',', ':'))
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            message = f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+            self._history.append((event_id, message))
+            self.stats_counters['published'] += 1
+            for client in self._clients:
+                try:
+                    client.put_nowait(message)
+                except queue.Full:
+                    # too far behind: drop its backlog and tell it to reload
+                    with client.mutex:
+                        client.queue.clear()
+                    client.put_nowait(f"id: {event_id}\nevent: resync\ndata: {{}}\n\n")
+                    self.stats_counters['dropped_clients'] += 1
+
+    def subscribe(self, last_event_id=None):
+        """New client queue, pre-filled with events missed since last_event_id; None when full"""
+        client = queue.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        with self._lock:
+            if len(self._clients) >= EVENTS_MAX_CLIENTS:
+                return None
+            if last_event_id is not None:
+                missed = [message for event_id, message in self._history if event_id > last_event_id]
+                oldest = self._history[0][0] if self._history else self._next_id
+                if last_event_id + 1 < oldest or len(missed) >= EVENTS_QUEUE_SIZE:
+                    client.put_nowait("event: resync\ndata: {}\n\n")
+                else:
+                    for message in missed:
+                        client.put_nowait(message)
+            self._clients.add(client)
+            if self._stats_thread is None:
+                self._stats_thread = threading.Thread(target=self._stats_loop, daemon=True)
+                self._stats_thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    def mark_stats_dirty(self):
+        self._stats_dirty = True
+
+    def _stats_loop(self):
+        while True:
+            time.sleep(EVENTS_STATS_INTERVAL)
+            if not self._stats_dirty or not self._clients:
+                continue
+            self._stats_dirty = False
+            try:
+                self.publish('stats', dashboard_stats(load_hostel_summary()))
+            except Error as e:
+                print(f"Error publishing stats event: {e}")
+
+    def stats(self):
+        with self._lock:
+            return dict(self.stats_counters, clients=len(self._clients), last_id=self._next_id - 1)
+
+
+events = EventBroadcaster()
+
+def publish_service_fee(connection, source, s_id):
+    """
+    Fee event for a mess/laundry charge. The fee row is written by a trigger,
+    which leaves its id in @hm_last_fee_id; the row itself is published, so
+    subscribers hold the same p_id / p_date / p_method / amount as /api/fees.
+    """
+    if not events.has_subscribers():
+        return
+    cursor = connection.cursor(dictionary=True)
     try:
-        cursor = connection.cursor(dictionary=True)
-        # CALLS: sp_list_available_rooms()
-        cursor.execute("CALL sp_list_available_rooms()")
-        rows = cursor.fetchall()
+        cursor.execute("SELECT p_id, p_date, p_method, amount FROM fees WHERE p_id = @hm_last_fee_id")
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    if row:
+        events.publish('fee', dict(row, source=source, s_id=s_id))
+
+# Live updates: event: room | fee | stats | resync, plus heartbeat comments.
+# Reconnecting clients send Last-Event-ID and get what they missed.
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    client = events.subscribe(int(last_event_id) if last_event_id and last_event_id.isdigit() else None)
+    if client is None:
+        return jsonify({'error': 'Too many event subscribers'}), 503
 
-        # If the procedure returns multiple result sets or leaves a pending result,
-        # make sure to consume remaining result sets (safe pattern).
+    def generate():
         try:
-            while cursor.nextset():
-                pass
-        except:
-            pass
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield client.get(timeout=EVENTS_HEARTBEAT)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+        finally:
+            events.unsubscribe(client)
 
-        return jsonify(rows)
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/events/stats', methods=['GET'])
+def event_stream_stats():
+    return jsonify(events.stats())
+
+# -----------------
+# In-memory room availability index
+# -----------------
+# Room capacity rarely changes and occupancy only changes through the allocate,
+# deallocate and transfer endpoints, which refresh the rooms they touched.
+# A background reconcile reloads the whole table every ROOM_INDEX_RECONCILE
+# seconds to pick up changes made outside this process.
+ROOM_INDEX_RECONCILE = float(os.environ.get('ROOM_INDEX_RECONCILE', 30))
+
+class RoomIndex:
+    def __init__(self, reconcile_interval=ROOM_INDEX_RECONCILE):
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._rooms = {}            # r_no -> (no_of_people, max_capacity)
+        self._by_free = {}          # free slots -> set of r_no
+        self._available = None      # cached sp_list_available_rooms-shaped list
+        self._loaded = False
+        self._thread = None
+        self.stats_counters = {'loads': 0, 'refreshes': 0, 'drift_corrections': 0, 'last_load': None}
+
+    @staticmethod
+    def _free(occupied, capacity):
+        return max(capacity - occupied, 0)
+
+    def _put(self, r_no, occupied, capacity):
+        old = self._rooms.get(r_no)
+        if old is not None:
+            bucket = self._by_free.get(self._free(*old))
+            if bucket:
+                bucket.discard(r_no)
+        self._rooms[r_no] = (occupied, capacity)
+        self._by_free.setdefault(self._free(occupied, capacity), set()).add(r_no)
+        self._available = None
+
+    def load(self, connection=None):
+        """(Re)load every room; counts rooms whose cached numbers had drifted"""
+        own = connection is None
+        # the index is kept current by write hooks; a lagging replica would undo them
+        connection = connection or get_db_connection(primary=True)
+        if not connection:
+            raise Error(msg='Database connection failed')
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT r_no, no_of_people, max_capacity FROM room")
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            if own:
+                connection.close()
+
+        drifted = 0
+        with self._lock:
+            if self._loaded:
+                fresh = {r_no: (occ, cap) for r_no, occ, cap in rows}
+                drifted = sum(1 for r_no in fresh.keys() | self._rooms.keys() if fresh.get(r_no) != self._rooms.get(r_no))
+                self.stats_counters['drift_corrections'] += drifted
+            self._rooms, self._by_free, self._available = {}, {}, None
+            for r_no, occupied, capacity in rows:
+                self._put(r_no, occupied, capacity)
+            self._loaded = True
+            self.stats_counters['loads'] += 1
+            self.stats_counters['last_load'] = datetime.now().isoformat(timespec='seconds')
+        if drifted:
+            # rooms were changed outside this process
+            notify_write('room')
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+        if self._thread is None and self.reconcile_interval > 0:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._reconcile_loop, daemon=True)
+                    self._thread.start()
+
+    def _reconcile_loop(self):
+        while True:
+            time.sleep(self.reconcile_interval)
+            try:
+                self.load()
+            except Error as e:
+                print(f"Room index reconcile failed: {e}")
+
+    def refresh(self, connection, r_nos):
+        """Re-read the given rooms after a committed write (one primary-key query) and publish them"""
+        r_nos = [r for r in set(r_nos) if r]
+        if not r_nos or not (self._loaded or events.has_subscribers()):
+            return
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT r_no, no_of_people, max_capacity FROM room WHERE r_no IN ({', '.join(['%s'] * len(r_nos))})",
+                r_nos)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        if self._loaded:
+            with self._lock:
+                for r_no, occupied, capacity in rows:
+                    self._put(r_no, occupied, capacity)
+                self.stats_counters['refreshes'] += 1
+        for r_no, occupied, capacity in rows:
+            events.publish('room', self._row(r_no, occupied, capacity))
+
+    @staticmethod
+    def _row(r_no, occupied, capacity):
+        percentage = Decimal(0)
+        if capacity > 0:
+            percentage = (Decimal(occupied) / Decimal(capacity) * 100).quantize(Decimal('0.01'), ROUND_HALF_UP)
+        return {
+            'r_no': r_no,
+            'no_of_people': occupied,
+            'max_capacity': capacity,
+            'available_slots': capacity - occupied,
+            'occupancy_percentage': percentage,
+        }
+
+    def available(self, min_slots=1):
+        """Rooms with at least min_slots free, most free first (same shape as sp_list_available_rooms)"""
+        self.ensure_loaded()
+        with self._lock:
+            if self._available is None:
+                rows = [self._row(r_no, *self._rooms[r_no])
+                        for free, bucket in self._by_free.items() if free > 0 for r_no in bucket]
+                rows.sort(key=lambda row: (-row['available_slots'], row['r_no']))
+                self._available = rows
+            rows = self._available
+        if min_slots <= 1:
+            return rows
+        return [row for row in rows if row['available_slots'] >= min_slots]
+
+    def filled(self):
+        self.ensure_loaded()
+        with self._lock:
+            return sorted(({'r_no': r_no, 'no_of_people': occ, 'max_capacity': cap}
+                           for r_no in self._by_free.get(0, ()) for occ, cap in [self._rooms[r_no]]),
+                          key=lambda row: row['r_no'])
+
+    def slots(self, r_no):
+        self.ensure_loaded()
+        with self._lock:
+            room = self._rooms.get(r_no)
+        return self._free(*room) if room else 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self.stats_counters, rooms=len(self._rooms), loaded=self._loaded,
+                        reconcile_interval=self.reconcile_interval)
+
+
+room_index = RoomIndex()
+
+# Rooms - list available rooms (served from the in-memory room index, same
+# rows/order as sp_list_available_rooms). Optional ?min_slots=N.
+@app.route('/api/rooms', methods=['GET'])
+@cached_response('room')
+def get_rooms():
+    min_slots = request.args.get('min_slots', 1, type=int)
+    try:
+        return jsonify(room_index.available(min_slots))
     except Error as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        cursor.close()
-        connection.close()
 
-# Filled rooms endpoint - uses stored procedure sp_list_filled_rooms
+# Filled rooms endpoint - rooms with no free slot, from the room index
 @app.route('/api/rooms/filled', methods=['GET'])
+@cached_response('room')
 def get_filled_rooms():
-    connection = get_db_connection()
-    if not connection:
-        return jsonify({'error': 'Database connection failed'}), 500
-    
     try:
-        cursor = connection.cursor(dictionary=True)
-        # CALLS: sp_list_filled_rooms()
-        cursor.execute("CALL sp_list_filled_rooms()")
-        filled_rooms = cursor.fetchall()
-        try:
-            while cursor.nextset():
-                pass
-        except:
-            pass
-        return jsonify(filled_rooms)
-    except Exception as e:
+        return jsonify(room_index.filled())
+    except Error as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        cursor.close()
-        connection.close()
+
+# Room index state (load count, refreshes, drift found by reconciliation)
+@app.route('/api/rooms/index', methods=['GET'])
+def get_room_index_stats():
+    return jsonify(room_index.stats())
 
 
 # Get single student using stored procedure sp_get_student_details
@@ -328,6 +2023,8 @@ def add_student():
             """, (data['s_id'], data['guardian_name'], data['guardian_phone']))
 
         connection.commit()
+        notify_write('student', 'local_guardian')
+        after_commit(student_search.refresh, connection, [data['s_id']])
         return jsonify({'message': 'Student added successfully'}), 201
     except Error as e:
         connection.rollback()
@@ -336,6 +2033,378 @@ def add_student():
         cursor.close()
         connection.close()
 
+# -----------------
+# Student search index (typeahead)
+# -----------------
+# Sorted (key, s_id) lists for s_id, name tokens and phone numbers; a prefix
+# lookup is a bisect plus a short forward scan, so it stays in the low
+# milliseconds at 100k+ students where LIKE '%x%' would scan the table. Student
+# writes refresh the touched ids; a background reload every
+# SEARCH_INDEX_RECONCILE seconds picks up changes from other processes.
+SEARCH_INDEX_RECONCILE = float(os.environ.get('SEARCH_INDEX_RECONCILE', 300))
+SEARCH_MAX_LIMIT = 50
+SEARCH_SCAN_LIMIT = 5000     # candidates examined for multi-word queries
+
+STUDENT_SEARCH_DETAILS_SQL = """
+    SELECT s.s_id, s.f_name, s.m_name, s.l_name, s.p_no, srf.r_no, m.m_no, m.m_name AS mess_name
+    FROM student s
+    LEFT JOIN student_room_fees srf ON s.s_id = srf.s_id
+    LEFT JOIN books_mess bm ON s.s_id = bm.s_id
+    LEFT JOIN mess m ON bm.m_no = m.m_no
+    WHERE s.s_id IN ({placeholders})
+"""
+
+class StudentSearchIndex:
+    KINDS = ('id', 'name', 'phone')     # ranking order
+
+    def __init__(self, reconcile_interval=SEARCH_INDEX_RECONCILE):
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._students = {}                         # s_id -> (f_name, m_name, l_name, p_no)
+        self._keys = {kind: [] for kind in self.KINDS}  # kind -> sorted [(key, s_id)]
+        self._loaded = False
+        self._thread = None
+        self.stats_counters = {'loads': 0, 'refreshes': 0, 'searches': 0, 'last_load': None}
+
+    @staticmethod
+    def _entries(s_id, f_name, m_name, l_name, p_no):
+        yield 'id', s_id.lower()
+        for name in (f_name, m_name, l_name):
+            for token in (name or '').lower().split():
+                yield 'name', token
+        if p_no:
+            yield 'phone', str(p_no)
+
+    def _add(self, s_id, *fields):
+        self._students[s_id] = fields
+        for kind, key in self._entries(s_id, *fields):
+            bisect.insort(self._keys[kind], (key, s_id))
+
+    def _remove(self, s_id):
+        fields = self._students.pop(s_id, None)
+        if fields is None:
+            return
+        for kind, key in self._entries(s_id, *fields):
+            keys = self._keys[kind]
+            i = bisect.bisect_left(keys, (key, s_id))
+            if i < len(keys) and keys[i] == (key, s_id):
+                del keys[i]
+
+    def load(self):
+        connection = get_db_connection(primary=True)
+        if not connection:
+            raise Error(msg='Database connection failed')
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT s_id, f_name, m_name, l_name, p_no FROM student")
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+        self.build(rows)
+
+    def build(self, rows):
+        """Replace the index with (s_id, f_name, m_name, l_name, p_no) rows"""
+        students = {row[0]: tuple(row[1:]) for row in rows}
+        keys = {kind: [] for kind in self.KINDS}
+        for s_id, fields in students.items():
+            for kind, key in self._entries(s_id, *fields):
+                keys[kind].append((key, s_id))
+        for entries in keys.values():
+            entries.sort()
+        with self._lock:
+            self._students, self._keys = students, keys
+            self._loaded = True
+            self.stats_counters['loads'] += 1
+            self.stats_counters['last_load'] = datetime.now().isoformat(timespec='seconds')
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+        if self._thread is None and self.reconcile_interval > 0:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._reconcile_loop, daemon=True)
+                    self._thread.start()
+
+    def _reconcile_loop(self):
+        while True:
+            time.sleep(self.reconcile_interval)
+            try:
+                self.load()
+            except Error as e:
+                print(f"Search index reconcile failed: {e}")
+
+    def refresh(self, connection, s_ids, chunk_size=1000):
+        """Re-read the given students after a committed write; ids no longer present are dropped"""
+        s_ids = list({s_id for s_id in s_ids if s_id})
+        if not s_ids or not self._loaded:
+            return
+        cursor = connection.cursor()
+        try:
+            rows = []
+            for offset in range(0, len(s_ids), chunk_size):
+                chunk = s_ids[offset:offset + chunk_size]
+                cursor.execute(
+                    f"SELECT s_id, f_name, m_name, l_name, p_no FROM student "
+                    f"WHERE s_id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+                rows.extend(cursor.fetchall())
+        finally:
+            cursor.close()
+        with self._lock:
+            for s_id in s_ids:
+                self._remove(s_id)
+            for row in rows:
+                self._add(row[0], *row[1:])
+            self.stats_counters['refreshes'] += 1
+
+    def _prefix_scan(self, kind, prefix, limit=None):
+        """s_ids whose `kind` key starts with prefix, in key order (lazy)"""
+        keys = self._keys[kind]
+        i = bisect.bisect_left(keys, (prefix,))
+        end = len(keys) if limit is None else min(len(keys), i + limit)
+        while i < end and keys[i][0].startswith(prefix):
+            yield keys[i][1]
+            i += 1
+
+    def _matches(self, s_id, term):
+        return any(key.startswith(term) for _, key in self._entries(s_id, *self._students[s_id]))
+
+    def search(self, q, limit=10):
+        """
+        Top `limit` s_ids for a typeahead query: exact/prefix s_id matches first,
+        then name-token prefixes, then phone prefixes. Every word of a
+        multi-word query must prefix-match one of the student's fields.
+        """
+        self.ensure_loaded()
+        terms = q.lower().split()
+        with self._lock:
+            self.stats_counters['searches'] += 1
+            if not terms:
+                return [key[1] for key in self._keys['id'][:limit]]
+            lead = max(terms, key=len)
+            others = [term for term in terms if term is not lead]
+            found, seen = [], set()
+            for kind in self.KINDS:
+                for s_id in self._prefix_scan(kind, lead, SEARCH_SCAN_LIMIT if others else None):
+                    if s_id in seen or not all(self._matches(s_id, term) for term in others):
+                        continue
+                    seen.add(s_id)
+                    found.append(s_id)
+                    if len(found) >= limit:
+                        return found
+            return found
+
+    def stats(self):
+        with self._lock:
+            return dict(self.stats_counters, students=len(self._students), loaded=self._loaded,
+                        reconcile_interval=self.reconcile_interval)
+
+
+student_search = StudentSearchIndex()
+
+# Typeahead: /api/students/search?q=<id, name or phone prefix>&limit=10
+# Returns the top matches with their room and mess.
+@app.route('/api/students/search', methods=['GET'])
+def search_students():
+    limit = max(1, min(request.args.get('limit', 10, type=int), SEARCH_MAX_LIMIT))
+    try:
+        s_ids = student_search.search(request.args.get('q', ''), limit)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+    if not s_ids:
+        return jsonify([])
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(STUDENT_SEARCH_DETAILS_SQL.format(placeholders=', '.join(['%s'] * len(s_ids))), s_ids)
+        details = {row['s_id']: row for row in cursor.fetchall()}
+        # keep the index's ranking
+        return jsonify([details[s_id] for s_id in s_ids if s_id in details])
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cursor.close()
+        connection.close()
+
+# Search index state
+@app.route('/api/students/search/index', methods=['GET'])
+def get_student_search_stats():
+    return jsonify(student_search.stats())
+
+# -----------------
+# Bulk student import (CSV / NDJSON / JSON array)
+# -----------------
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+
+# column -> (required, max length) as declared in schema.sql
+STUDENT_IMPORT_FIELDS = {
+    's_id': (True, 20),
+    'f_name': (True, 50),
+    'm_name': (False, 50),
+    'l_name': (True, 50),
+    'p_no': (True, 15),
+    'leader_id': (False, 20),
+    'guardian_name': (False, 100),
+    'guardian_phone': (False, 15),
+}
+
+def parse_student_rows(body, content_type):
+    """Parse an import body into a list of dicts (CSV, NDJSON or a JSON array)"""
+    if 'csv' in content_type:
+        return list(csv.DictReader(io.StringIO(body)))
+    if 'ndjson' in content_type:
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    rows = json.loads(body)
+    if not isinstance(rows, list):
+        raise ValueError('expected a JSON array of students')
+    return rows
+
+def validate_student_rows(rows):
+    """
+    Check every row up front. Returns (valid, errors) where valid is a list of
+    (row_number, cleaned_row) ordered so leaders are inserted before the
+    students that reference them.
+    """
+    valid, errors = [], []
+    seen_ids, seen_phones = set(), set()
+
+    for number, raw in enumerate(rows, start=1):
+        if not isinstance(raw, dict):
+            errors.append({'row': number, 's_id': None, 'error': 'row is not an object'})
+            continue
+        row, problems = {}, []
+        for field, (required, max_len) in STUDENT_IMPORT_FIELDS.items():
+            value = raw.get(field)
+            value = str(value).strip() if value is not None else ''
+            if not value:
+                if required:
+                    problems.append(f'{field} is required')
+                row[field] = None
+            elif len(value) > max_len:
+                problems.append(f'{field} longer than {max_len} characters')
+            else:
+                row[field] = value
+
+        if bool(row.get('guardian_name')) != bool(row.get('guardian_phone')):
+            problems.append('guardian_name and guardian_phone must be given together')
+        if row.get('s_id') in seen_ids:
+            problems.append('duplicate s_id in upload')
+        if row.get('guardian_phone') and row['guardian_phone'] in seen_phones:
+            problems.append('duplicate guardian_phone in upload')
+
+        if problems:
+            errors.append({'row': number, 's_id': row.get('s_id'), 'error': '; '.join(problems)})
+            continue
+        seen_ids.add(row['s_id'])
+        if row['guardian_phone']:
+            seen_phones.add(row['guardian_phone'])
+        valid.append((number, row))
+
+    # leaders first: depth = number of in-upload leaders above a student
+    leaders = {row['s_id']: row['leader_id'] for _, row in valid}
+    def depth(s_id):
+        seen = set()
+        level = 0
+        while leaders.get(s_id) in leaders and s_id not in seen:
+            seen.add(s_id)
+            s_id = leaders[s_id]
+            level += 1
+        return level
+    valid.sort(key=lambda item: depth(item[1]['s_id']))
+    return valid, errors
+
+def _insert_student_chunk(cursor, chunk):
+    cursor.executemany("""
+        INSERT INTO student (s_id, f_name, m_name, l_name, p_no, leader_id)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, [(r['s_id'], r['f_name'], r['m_name'], r['l_name'], r['p_no'], r['leader_id']) for r in chunk])
+    guardians = [(r['s_id'], r['guardian_name'], r['guardian_phone']) for r in chunk if r['guardian_name']]
+    if guardians:
+        cursor.executemany("""
+            INSERT INTO local_guardian (s_id, name, p_no)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, guardians)
+
+def import_students(connection, rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate and insert students (+ guardians) with multi-row INSERTs, one
+    transaction per chunk. If a chunk is rejected by MySQL (duplicate key, unknown
+    leader, ...) it is rolled back and replayed row by row to report which rows failed.
+    """
+    started = time.perf_counter()
+    valid, errors = validate_student_rows(rows)
+    inserted = 0
+    cursor = connection.cursor()
+    try:
+        for offset in range(0, len(valid), chunk_size):
+            chunk = valid[offset:offset + chunk_size]
+            try:
+                cursor.execute("START TRANSACTION")
+                _insert_student_chunk(cursor, [row for _, row in chunk])
+                connection.commit()
+                inserted += len(chunk)
+                continue
+            except Error:
+                connection.rollback()
+
+            for number, row in chunk:
+                try:
+                    cursor.execute("START TRANSACTION")
+                    _insert_student_chunk(cursor, [row])
+                    connection.commit()
+                    inserted += 1
+                except Error as e:
+                    connection.rollback()
+                    errors.append({'row': number, 's_id': row['s_id'], 'error': str(e)})
+    finally:
+        cursor.close()
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda error: error['row'])
+    return {
+        'received': len(rows),
+        'inserted': inserted,
+        'failed': len(errors),
+        'errors': errors,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'rows_per_sec': round(inserted / elapsed, 1) if elapsed else None,
+    }
+
+@app.route('/api/students/bulk', methods=['POST'])
+def bulk_add_students():
+    """
+    Body: CSV (text/csv) with a header row, NDJSON (application/x-ndjson) or a JSON
+    array. Columns: s_id, f_name, m_name, l_name, p_no, leader_id, guardian_name,
+    guardian_phone. Optional ?chunk_size=N (rows per transaction).
+    """
+    chunk_size = max(1, min(request.args.get('chunk_size', IMPORT_CHUNK_SIZE, type=int), 5000))
+    try:
+        rows = parse_student_rows(request.get_data(as_text=True), request.content_type or '')
+    except (ValueError, csv.Error) as e:
+        return jsonify({'error': f'Could not parse upload: {e}'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        report = import_students(connection, rows, chunk_size)
+        if report['inserted']:
+            after_commit(student_search.refresh, connection,
+                         [row.get('s_id') for row in rows if isinstance(row, dict)])
+    finally:
+        connection.close()
+
+    if report['inserted']:
+        notify_write('student', 'local_guardian')
+    return jsonify(report), 201 if not report['failed'] else 207
+
 # Update student — kept raw UPDATE (no stored proc exists)
 @app.route('/api/students/<student_id>', methods=['PUT'])
 def update_student(student_id):
@@ -355,6 +2424,8 @@ def update_student(student_id):
               data['p_no'], data.get('leader_id'), student_id))
 
         connection.commit()
+        notify_write('student')
+        after_commit(student_search.refresh, connection, [student_id])
         return jsonify({'message': 'Student updated successfully'})
     except Error as e:
         connection.rollback()
@@ -374,6 +2445,8 @@ def delete_student(student_id):
         cursor = connection.cursor()
         cursor.execute("DELETE FROM student WHERE s_id = %s", (student_id,))
         connection.commit()
+        notify_write('student', 'student_room_fees', 'books_mess', 'gives_laundry', 'monitors', 'local_guardian')
+        after_commit(student_search.refresh, connection, [student_id])
         return jsonify({'message': 'Student deleted successfully'})
     except Error as e:
         connection.rollback()
@@ -382,6 +2455,73 @@ def delete_student(student_id):
         cursor.close()
         connection.close()
 
+# Occupants of many rooms in one query (batched sp_get_room_occupants).
+# ?rooms=A101,A102 or ?prefix=A1 (floor/block) or neither for every room;
+# ?with_availability=1 also returns occupancy numbers and includes empty rooms.
+ROOM_OCCUPANTS_SQL = """
+    SELECT r.r_no, r.no_of_people, r.max_capacity,
+           s.s_id, CONCAT(s.f_name, ' ', IFNULL(s.m_name, ''), ' ', s.l_name) AS name,
+           s.f_name, s.m_name, s.l_name, srf.allotment_date, lg.name AS guardian
+    FROM room r
+    {join} student_room_fees srf ON srf.r_no = r.r_no
+    LEFT JOIN student s ON s.s_id = srf.s_id
+    LEFT JOIN local_guardian lg ON lg.s_id = srf.s_id
+    {where}
+    ORDER BY r.r_no, srf.s_id
+"""
+
+MAX_OCCUPANT_ROOMS = 1000
+
+def group_room_occupants(rows, with_availability):
+    """Fold the r_no-ordered join rows into one entry per room"""
+    rooms = []
+    for row in rows:
+        if not rooms or rooms[-1]['r_no'] != row['r_no']:
+            room = {'r_no': row['r_no'], 'occupants': []}
+            if with_availability:
+                room.update({
+                    'no_of_people': row['no_of_people'],
+                    'max_capacity': row['max_capacity'],
+                    'available_slots': max(row['max_capacity'] - row['no_of_people'], 0),
+                })
+            rooms.append(room)
+        if row['s_id'] is not None:
+            rooms[-1]['occupants'].append({key: row[key] for key in (
+                's_id', 'name', 'f_name', 'm_name', 'l_name', 'allotment_date', 'guardian')})
+    return rooms
+
+@app.route('/api/rooms/occupants', methods=['GET'])
+def get_rooms_occupants():
+    with_availability = request.args.get('with_availability') in ('1', 'true')
+    r_nos = [r.strip() for r in request.args.get('rooms', '').split(',') if r.strip()]
+    if len(r_nos) > MAX_OCCUPANT_ROOMS:
+        return jsonify({'error': f'At most {MAX_OCCUPANT_ROOMS} rooms per request'}), 400
+
+    where, params = [], []
+    if r_nos:
+        where.append(f"r.r_no IN ({', '.join(['%s'] * len(r_nos))})")
+        params.extend(r_nos)
+    if request.args.get('prefix'):
+        where.append("r.r_no LIKE %s")
+        params.append(_like_prefix(request.args['prefix']))
+    sql = ROOM_OCCUPANTS_SQL.format(
+        join='LEFT JOIN' if with_availability else 'JOIN',
+        where=('WHERE ' + ' AND '.join(where)) if where else '')
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        return jsonify(group_room_occupants(cursor.fetchall(), with_availability))
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cursor.close()
+        connection.close()
+
 # Get room occupants via stored procedure sp_get_room_occupants
 @app.route('/api/rooms/<room_no>/students', methods=['GET'])
 def get_room_students(room_no):
@@ -406,23 +2546,139 @@ def get_room_students(room_no):
         cursor.close()
         connection.close()
 
-# Room availability (keeps using function)
+# Room availability (from the room index; same result as room_available_slots())
 @app.route('/api/rooms/<room_no>/available', methods=['GET'])
 def get_room_available_slots(room_no):
-    connection = get_db_connection()
-    if not connection:
-        return jsonify({'error': 'Database connection failed'}), 500
     try:
-        cursor = connection.cursor()
-        cursor.execute("SELECT room_available_slots(%s) as available", (room_no,))
-        row = cursor.fetchone()
-        available = row[0] if row else 0
-        return jsonify({'r_no': room_no, 'available_slots': int(available)})
+        return jsonify({'r_no': room_no, 'available_slots': room_index.slots(room_no)})
     except Error as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        cursor.close()
-        connection.close()
+
+# Fee ids are time-ordered so fees (clustered on p_id) is appended to at the
+# right edge of its primary key instead of at random pages. Every id is
+#   prefix + 10 chars of epoch milliseconds + a 16-char tail
+# in base32hex, whose digits sort like the numbers they encode. The two
+# generators fill the tail differently:
+#   new_fee_id() here ('F'): a random 79-bit value per millisecond, incremented
+#       for later ids in the same millisecond - increasing within a process,
+#       unique across processes with overwhelming probability
+#   next_fee_id() in SQL ('LND-' / 'MSS-', the mess and laundry triggers):
+#       13 chars of UUID_SHORT(), which increases on every call and is unique
+#       per server, then 3 random chars
+# The prefixes keep them apart: ids from one cannot collide with the other,
+# and each prefix is its own increasing run (three right-hand insert points).
+FEE_ID_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUV'   # = MySQL CONV(n, 10, 32)
+
+def base32hex(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, 32)
+        digits.append(FEE_ID_ALPHABET[digit])
+    return ''.join(reversed(digits))
+
+class FeeIdGenerator:
+    """
+    Monotonic ids within a process: a new millisecond starts from a random
+    79-bit tail, later ids in the same millisecond increment it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._tail = 0
+
+    def next(self, prefix='F'):
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms > self._last_ms:
+                self._last_ms, self._tail = now_ms, random.getrandbits(79)
+            else:
+                # same millisecond, or the clock stepped back: stay ordered
+                self._tail += 1
+                if self._tail >= 1 << 80:
+                    self._last_ms, self._tail = self._last_ms + 1, random.getrandbits(79)
+            return prefix + base32hex(self._last_ms, 10) + base32hex(self._tail, 16)
+
+fee_ids = FeeIdGenerator()
+
+def new_fee_id():
+    """Unique, time-ordered p_id for a fee row created by the app"""
+    return fee_ids.next('F')
+
+# -----------------
+# Transactions with deadlock / lock-wait retry
+# -----------------
+# Occupancy writers lock their room rows up front (SELECT ... FOR UPDATE, in
+# r_no order when there are several), so a foreign-key share lock is never
+# upgraded under contention. Paths that change an existing allocation
+# (deallocate, transfer) lock its student_room_fees row first, then the rooms.
+# Deadlocks and lock-wait timeouts that still happen are retried with jittered
+# exponential backoff; business-rule SIGNALs from the triggers/procedures
+# (SQLSTATE 45000) come back as 409 instead of 500.
+TXN_RETRIES = int(os.environ.get('TXN_RETRIES', 4))
+TXN_RETRY_BACKOFF = float(os.environ.get('TXN_RETRY_BACKOFF', 0.02))   # seconds, doubled per attempt
+RETRYABLE_ERRNOS = {1213, 1205}    # ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT
+
+txn_stats = {'transactions': 0, 'retries': 0, 'deadlocks': 0, 'lock_wait_timeouts': 0, 'gave_up': 0, 'conflicts': 0}
+_txn_stats_lock = threading.Lock()
+
+def _count(key):
+    with _txn_stats_lock:
+        txn_stats[key] += 1
+
+class Conflict(Exception):
+    """Request conflicts with current data (returned as 409)"""
+
+def run_transaction(connection, body):
+    """
+    Run body(cursor) in its own transaction and commit; the whole body is
+    re-run after a deadlock or lock-wait timeout, up to TXN_RETRIES times.
+    """
+    for attempt in range(TXN_RETRIES + 1):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("START TRANSACTION")
+            result = body(cursor)
+            connection.commit()
+            _count('transactions')
+            return result
+        except Error as e:
+            connection.rollback()
+            if e.errno not in RETRYABLE_ERRNOS:
+                raise
+            _count('deadlocks' if e.errno == 1213 else 'lock_wait_timeouts')
+            if attempt == TXN_RETRIES:
+                _count('gave_up')
+                raise
+            _count('retries')
+            time.sleep(TXN_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+        except Conflict:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+def lock_rooms(cursor, r_nos):
+    """Lock room rows in r_no order; returns {r_no: (no_of_people, max_capacity)}"""
+    r_nos = sorted({r for r in r_nos if r})
+    if not r_nos:
+        return {}
+    cursor.execute(
+        f"SELECT r_no, no_of_people, max_capacity FROM room "
+        f"WHERE r_no IN ({', '.join(['%s'] * len(r_nos))}) ORDER BY r_no FOR UPDATE", r_nos)
+    return {r_no: (occupied, capacity) for r_no, occupied, capacity in cursor.fetchall()}
+
+def transaction_error_response(e):
+    """409 for conflicts and SIGNALed rule violations, 503 when retries ran out, else 500"""
+    if isinstance(e, Conflict):
+        _count('conflicts')
+        return jsonify({'error': str(e)}), 409
+    if getattr(e, 'sqlstate', None) == '45000':
+        _count('conflicts')
+        return jsonify({'error': e.msg}), 409
+    if getattr(e, 'errno', None) in RETRYABLE_ERRNOS:
+        return jsonify({'error': f'Database busy, retry later ({e.msg})'}), 503
+    return jsonify({'error': str(e)}), 500
 
 # Allocate room — remains as raw SQL because there's no dedicated 'allocate' stored proc.
 @app.route('/api/rooms/allocate', methods=['POST'])
@@ -439,34 +2695,255 @@ def allocate_room():
 
     try:
         data = request.json
-        cursor = connection.cursor()
 
         # Compose a unique fee id
-        from uuid import uuid4
-        fee_id = f"F{uuid4().hex[:18].upper()}"
+        fee_id = new_fee_id()
 
-        # Start transaction
-        cursor.execute("START TRANSACTION")
+        def allocate(cursor):
+            # lock the room first: the FK check on the insert would otherwise take a
+            # share lock that the occupancy update has to upgrade (deadlock-prone)
+            room = lock_rooms(cursor, [data['r_no']]).get(data['r_no'])
+            if room is None:
+                raise Conflict('Room not found')
+            if room[0] >= room[1]:
+                raise Conflict('Room capacity exceeded')
 
-        # Create fee record
-        cursor.execute("""
-            INSERT INTO fees (p_id, p_date, p_method, amount)
-            VALUES (%s, %s, %s, %s)
-        """, (fee_id, datetime.now().date(), data['p_method'], data['amount']))
+            # Create fee record
+            cursor.execute("""
+                INSERT INTO fees (p_id, p_date, p_method, amount)
+                VALUES (%s, %s, %s, %s)
+            """, (fee_id, datetime.now().date(), data['p_method'], data['amount']))
 
-        # Allocate room (insert triggers will update occupancy and validate capacity/student allocation)
-        cursor.execute("""
-            INSERT INTO student_room_fees (s_id, r_no, p_id, allotment_date)
-            VALUES (%s, %s, %s, %s)
-        """, (data['s_id'], data['r_no'], fee_id, datetime.now().date()))
+            # Allocate room (insert triggers will update occupancy and validate capacity/student allocation)
+            cursor.execute("""
+                INSERT INTO student_room_fees (s_id, r_no, p_id, allotment_date)
+                VALUES (%s, %s, %s, %s)
+            """, (data['s_id'], data['r_no'], fee_id, datetime.now().date()))
 
-        connection.commit()
+        run_transaction(connection, allocate)
+        notify_write('fees', 'student_room_fees', 'room')
+        after_commit(room_index.refresh, connection, [data['r_no']])
+        after_commit(events.publish, 'fee', {'source': 'room', 's_id': data['s_id'], 'p_id': fee_id,
+                                             'p_date': date.today(), 'p_method': data['p_method'],
+                                             'amount': data['amount']})
         return jsonify({'message': 'Room allocated successfully'}), 201
-    except Error as e:
-        connection.rollback()
-        return jsonify({'error': str(e)}), 500
+    except (Error, Conflict) as e:
+        return transaction_error_response(e)
+    finally:
+        connection.close()
+
+# -----------------
+# Batch room allocation
+# -----------------
+PAYMENT_METHODS = ('Cash', 'Card', 'UPI', 'Net Banking')
+
+def plan_room_allocation(rooms, students, leader_rooms=None, group_by_leader=True):
+    """
+    Assign students to rooms in memory.
+      rooms:        {r_no: free_slots} snapshot (mutated as slots are taken)
+      students:     list of (s_id, leader_id)
+      leader_rooms: {leader s_id: r_no} for leaders that already have a room
+    Students sharing a leader are kept together where possible: the group goes to
+    the leader's room if it has space, otherwise to the tightest room that fits
+    the whole group, otherwise it is split across the emptiest rooms.
+    Returns ({s_id: r_no}, [unplaced s_id]).
+    """
+    leader_rooms = leader_rooms or {}
+    batch_ids = {s_id for s_id, _ in students}
+
+    groups = {}
+    for s_id, leader_id in students:
+        key = leader_id if group_by_leader and leader_id and (leader_id in batch_ids or leader_id in leader_rooms) else s_id
+        groups.setdefault(key, []).append(s_id)
+
+    assignment, unplaced = {}, []
+
+    def place(members, r_no):
+        take = members[:rooms[r_no]]
+        for s_id in take:
+            assignment[s_id] = r_no
+        rooms[r_no] -= len(take)
+        return members[len(take):]
+
+    # biggest groups first, so they still find a room with enough space together
+    for key, members in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])):
+        preferred = leader_rooms.get(key)
+        if preferred in rooms and rooms[preferred] > 0:
+            members = place(members, preferred)
+        while members:
+            fitting = [r for r, free in rooms.items() if free >= len(members)]
+            if fitting:
+                members = place(members, min(fitting, key=lambda r: (rooms[r], r)))
+                continue
+            open_rooms = [r for r, free in rooms.items() if free > 0]
+            if not open_rooms:
+                unplaced.extend(members)
+                break
+            members = place(members, max(open_rooms, key=lambda r: (rooms[r], r)))
+
+    return assignment, unplaced
+
+@app.route('/api/rooms/allocate/batch', methods=['POST'])
+def allocate_rooms_batch():
+    """
+    Allocate many students in one transaction.
+    Body:
+      {
+        "students": [{"s_id": "...", "amount": 75000, "p_method": "UPI"}, ...],
+        "defaults": {"amount": 75000, "p_method": "UPI"},        (optional)
+        "preferences": {
+            "capacity": 2,            only rooms of this size (room type)
+            "rooms": ["R201", ...],   only these rooms
+            "group_by_leader": true   keep students with the same leader_id together
+        },
+        "dry_run": false
+      }
+    Rooms are read once with SELECT ... FOR UPDATE, the plan is made in memory,
+    then fees and allocations are written with multi-row inserts and each touched
+    room gets a single occupancy update. The per-row trigger work is bypassed
+    through @hm_bulk_allocation. Runs under run_transaction (deadlock retry).
+    """
+    data = request.json or {}
+    defaults = data.get('defaults') or {}
+    preferences = data.get('preferences') or {}
+    entries = data.get('students') or []
+    if not entries:
+        return jsonify({'error': 'students list is required'}), 400
+    capacity = preferences.get('capacity')
+    if capacity is not None:
+        try:
+            capacity = int(capacity)
+        except (TypeError, ValueError):
+            capacity = 0
+        if capacity < 1:
+            return jsonify({'error': 'preferences.capacity must be a positive integer'}), 400
+    room_filter = preferences.get('rooms')
+    if room_filter is not None and (not isinstance(room_filter, list)
+                                    or not all(isinstance(r_no, str) and r_no for r_no in room_filter)):
+        return jsonify({'error': 'preferences.rooms must be a list of room numbers'}), 400
+
+    invalid, requested = [], {}
+    for entry in entries:
+        s_id = entry.get('s_id') if isinstance(entry, dict) else entry
+        entry = entry if isinstance(entry, dict) else {}
+        amount = entry.get('amount', defaults.get('amount'))
+        p_method = entry.get('p_method', defaults.get('p_method'))
+        if not s_id:
+            invalid.append({'s_id': None, 'error': 's_id is required'})
+        elif s_id in requested:
+            invalid.append({'s_id': s_id, 'error': 'listed more than once'})
+        elif p_method not in PAYMENT_METHODS:
+            invalid.append({'s_id': s_id, 'error': f'p_method must be one of {", ".join(PAYMENT_METHODS)}'})
+        else:
+            try:
+                amount = Decimal(str(amount))
+            except Exception:
+                amount = None
+            if amount is None or not amount > 0:
+                invalid.append({'s_id': s_id, 'error': 'amount must be a positive number'})
+            else:
+                requested[s_id] = (amount, p_method)
+    if not requested:
+        return jsonify({'error': 'no valid students', 'errors': invalid}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    started = time.perf_counter()
+    dry_run = bool(data.get('dry_run'))
+    group_by_leader = preferences.get('group_by_leader', True)
+
+    def allocate(cursor):
+        errors = list(invalid)
+
+        # 1) one locked snapshot of the candidate rooms (r_no order = consistent lock order)
+        room_sql = "SELECT r_no, no_of_people, max_capacity FROM room"
+        where, params = ["no_of_people < max_capacity"], []
+        if capacity:
+            where.append("max_capacity = %s")
+            params.append(capacity)
+        if room_filter:
+            where.append(f"r_no IN ({', '.join(['%s'] * len(room_filter))})")
+            params.extend(room_filter)
+        cursor.execute(f"{room_sql} WHERE {' AND '.join(where)} ORDER BY r_no FOR UPDATE", params)
+        rooms = {r_no: max_capacity - occupied for r_no, occupied, max_capacity in cursor.fetchall()}
+
+        # 2) the students, their leaders and anyone already allocated
+        ids = list(requested)
+        marks = ', '.join(['%s'] * len(ids))
+        cursor.execute(f"SELECT s_id, leader_id FROM student WHERE s_id IN ({marks})", ids)
+        students = cursor.fetchall()
+        known = {s_id for s_id, _ in students}
+        cursor.execute(f"SELECT s_id FROM student_room_fees WHERE s_id IN ({marks})", ids)
+        allocated = {row[0] for row in cursor.fetchall()}
+
+        leader_ids = list({leader for _, leader in students if leader})
+        leader_rooms = {}
+        if leader_ids and group_by_leader:
+            cursor.execute(
+                f"SELECT s_id, r_no FROM student_room_fees WHERE s_id IN ({', '.join(['%s'] * len(leader_ids))})",
+                leader_ids)
+            leader_rooms = dict(cursor.fetchall())
+
+        for s_id in ids:
+            if s_id not in known:
+                errors.append({'s_id': s_id, 'error': 'Student not found'})
+            elif s_id in allocated:
+                errors.append({'s_id': s_id, 'error': 'Student already allocated to a room'})
+        candidates = [(s_id, leader) for s_id, leader in students if s_id not in allocated]
+
+        # 3) plan in memory
+        free_before = dict(rooms)
+        assignment, unplaced = plan_room_allocation(rooms, candidates, leader_rooms, group_by_leader)
+        errors.extend({'s_id': s_id, 'error': 'No room with free capacity'} for s_id in unplaced)
+
+        today = datetime.now().date()
+        assignments = [{'s_id': s_id, 'r_no': r_no, 'p_id': new_fee_id()} for s_id, r_no in sorted(assignment.items())]
+        added = {r_no: free_before[r_no] - rooms[r_no] for r_no in rooms if free_before[r_no] != rooms[r_no]}
+
+        if assignments and not dry_run:
+            # 4) apply: multi-row inserts + one occupancy update per room
+            cursor.executemany("""
+                INSERT INTO fees (p_id, p_date, p_method, amount)
+                VALUES (%s, %s, %s, %s)
+            """, [(a['p_id'], today, requested[a['s_id']][1], requested[a['s_id']][0]) for a in assignments])
+            cursor.execute("SET @hm_bulk_allocation = 1")
+            try:
+                cursor.executemany("""
+                    INSERT INTO student_room_fees (s_id, r_no, p_id, allotment_date)
+                    VALUES (%s, %s, %s, %s)
+                """, [(a['s_id'], a['r_no'], a['p_id'], today) for a in assignments])
+            finally:
+                cursor.execute("SET @hm_bulk_allocation = NULL")
+            cases = ' '.join(['WHEN %s THEN %s'] * len(added))
+            cursor.execute(f"""
+                UPDATE room
+                SET no_of_people = no_of_people + CASE r_no {cases} ELSE 0 END
+                WHERE r_no IN ({', '.join(['%s'] * len(added))})
+            """, [value for item in added.items() for value in item] + list(added))
+
+        return {
+            'dry_run': dry_run,
+            'allocated': len(assignments),
+            'assignments': assignments,
+            'room_occupancy_added': added,
+            'errors': errors,
+        }
+
+    try:
+        result = run_transaction(connection, allocate)
+        applied = bool(result['allocated']) and not dry_run
+        if applied:
+            notify_write('fees', 'student_room_fees', 'room')
+            after_commit(room_index.refresh, connection, result['room_occupancy_added'])
+            # one event for the whole batch; clients reload the fee list
+            after_commit(events.publish, 'fees', {'source': 'room', 'count': result['allocated']})
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return jsonify(result), 201 if applied else 200
+    except (Error, Conflict) as e:
+        return transaction_error_response(e)
     finally:
-        cursor.close()
         connection.close()
 
 # Deallocate room — kept raw DELETE (no stored proc exists)
@@ -478,25 +2955,29 @@ def deallocate_room():
 
     try:
         data = request.json
-        cursor = connection.cursor()
-        cursor.execute("START TRANSACTION")
 
-        cursor.execute("""
-            DELETE FROM student_room_fees
-            WHERE s_id = %s AND r_no = %s
-        """, (data['s_id'], data['r_no']))
+        def deallocate(cursor):
+            # same order as a transfer: the allocation row, then the room
+            cursor.execute("SELECT r_no FROM student_room_fees WHERE s_id = %s AND r_no = %s FOR UPDATE",
+                           (data['s_id'], data['r_no']))
+            if cursor.fetchone() is None:
+                return 0
+            lock_rooms(cursor, [data['r_no']])
+            cursor.execute("""
+                DELETE FROM student_room_fees
+                WHERE s_id = %s AND r_no = %s
+            """, (data['s_id'], data['r_no']))
+            return cursor.rowcount
 
-        if cursor.rowcount == 0:
-            connection.rollback()
+        if run_transaction(connection, deallocate) == 0:
             return jsonify({'error': 'Allocation not found'}), 404
 
-        connection.commit()
+        notify_write('student_room_fees', 'room')
+        after_commit(room_index.refresh, connection, [data['r_no']])
         return jsonify({'message': 'Deallocated successfully'})
-    except Error as e:
-        connection.rollback()
-        return jsonify({'error': str(e)}), 500
+    except (Error, Conflict) as e:
+        return transaction_error_response(e)
     finally:
-        cursor.close()
         connection.close()
 
 # Endpoint to transfer student between rooms using stored procedure sp_transfer_student_room
@@ -507,26 +2988,33 @@ def transfer_room():
         return jsonify({'error': 'Database connection failed'}), 500
     try:
         data = request.json
-        cursor = connection.cursor()
-        # CALLS: sp_transfer_student_room(s_id, new_room_no)
-        cursor.execute("CALL sp_transfer_student_room(%s, %s)", (data['s_id'], data['new_r_no']))
-        connection.commit()
-        # consume any leftover resultsets
-        try:
-            while cursor.nextset():
+
+        def transfer(cursor):
+            cursor.execute("SELECT r_no FROM student_room_fees WHERE s_id = %s FOR UPDATE", (data['s_id'],))
+            row = cursor.fetchone()
+            old_room = row[0] if row else None
+            # CALLS: sp_transfer_student_room(s_id, new_room_no) - locks both rooms in r_no order
+            cursor.execute("CALL sp_transfer_student_room(%s, %s)", (data['s_id'], data['new_r_no']))
+            # consume any leftover resultsets
+            try:
+                while cursor.nextset():
+                    pass
+            except:
                 pass
-        except:
-            pass
+            return old_room
+
+        old_room = run_transaction(connection, transfer)
+        notify_write('student_room_fees', 'room')
+        after_commit(room_index.refresh, connection, [old_room, data['new_r_no']])
         return jsonify({'message': 'Student transferred successfully'})
-    except Error as e:
-        connection.rollback()
-        return jsonify({'error': str(e)}), 500
+    except (Error, Conflict) as e:
+        return transaction_error_response(e)
     finally:
-        cursor.close()
         connection.close()
 
 # Mess API (list) - raw SELECT (no SP for listing mess)
 @app.route('/api/mess', methods=['GET'])
+@cached_response('mess')
 def get_mess():
     connection = get_db_connection()
     if not connection:
@@ -556,11 +3044,13 @@ def book_mess():
         # CALLS: sp_change_mess_booking(s_id, m_no)
         cursor.execute("CALL sp_change_mess_booking(%s, %s)", (data['s_id'], data['m_no']))
         connection.commit()
+        notify_write('books_mess', 'fees')
         try:
             while cursor.nextset():
                 pass
         except:
             pass
+        after_commit(publish_service_fee, connection, 'mess', data['s_id'])
         return jsonify({'message': 'Mess booked successfully'}), 201
     except Error as e:
         connection.rollback()
@@ -569,8 +3059,186 @@ def book_mess():
         cursor.close()
         connection.close()
 
+# -----------------
+# Bulk mess rollover
+# -----------------
+# Start-of-month re-booking without the per-student procedure call and trigger
+# fan-out: bookings dated before the month are renewed to its first day, and
+# optional moves ({s_id: m_no}; students without a booking get one) are applied
+# in the same pass. Everything goes through a staging table and a handful of
+# set-based statements, with the mess triggers bypassed through @hm_bulk_mess:
+# one multi-row fees insert (MSS- ids from next_fee_id()), one ledger move, one
+# books_mess update and one insert. Bookings already dated in the month are left
+# alone, so re-running a month is a no-op.
+MESS_ROLLOVER_CHUNK_SIZE = int(os.environ.get('MESS_ROLLOVER_CHUNK_SIZE', 5000))
+
+def rollover_mess(connection, year, month, moves=None, dry_run=False):
+    """
+    Renew / move the mess bookings for (year, month) in one transaction.
+    Returns the renewed / moved / booked counts, rejected moves and timings.
+    """
+    start = date(year, month, 1)
+    moves = sorted((moves or {}).items())
+    started = time.perf_counter()
+
+    def rollover(cursor):
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS tmp_mess_moves")
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS tmp_mess_rollover")
+        cursor.execute("CREATE TEMPORARY TABLE tmp_mess_moves (s_id VARCHAR(20) PRIMARY KEY, m_no VARCHAR(10) NOT NULL)")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE tmp_mess_rollover (
+                s_id VARCHAR(20) PRIMARY KEY,
+                old_m_no VARCHAR(10),
+                old_date DATE,
+                m_no VARCHAR(10) NOT NULL
+            )
+        """)
+        for offset in range(0, len(moves), MESS_ROLLOVER_CHUNK_SIZE):
+            cursor.executemany("INSERT INTO tmp_mess_moves (s_id, m_no) VALUES (%s, %s)",
+                               moves[offset:offset + MESS_ROLLOVER_CHUNK_SIZE])
+
+        errors = []
+        if moves:
+            cursor.execute("""
+                SELECT mv.s_id, mv.m_no, s.s_id IS NULL
+                FROM tmp_mess_moves mv
+                LEFT JOIN student s ON s.s_id = mv.s_id
+                LEFT JOIN mess m ON m.m_no = mv.m_no
+                WHERE s.s_id IS NULL OR m.m_no IS NULL
+            """)
+            errors = [{'s_id': s_id, 'm_no': m_no, 'error': 'Student not found' if missing else 'Mess not found'}
+                      for s_id, m_no, missing in cursor.fetchall()]
+
+        # 1) stage: existing bookings to renew or move, then new bookings
+        cursor.execute("""
+            INSERT INTO tmp_mess_rollover (s_id, old_m_no, old_date, m_no)
+            SELECT bm.s_id, bm.m_no, bm.booking_date, COALESCE(m.m_no, bm.m_no)
+            FROM books_mess bm
+            LEFT JOIN tmp_mess_moves mv ON mv.s_id = bm.s_id
+            LEFT JOIN mess m ON m.m_no = mv.m_no
+            WHERE bm.booking_date < %s OR (m.m_no IS NOT NULL AND m.m_no <> bm.m_no)
+        """, (start,))
+        if moves:
+            cursor.execute("""
+                INSERT INTO tmp_mess_rollover (s_id, old_m_no, old_date, m_no)
+                SELECT mv.s_id, NULL, NULL, mv.m_no
+                FROM tmp_mess_moves mv
+                JOIN student s ON s.s_id = mv.s_id
+                JOIN mess m ON m.m_no = mv.m_no
+                LEFT JOIN books_mess bm ON bm.s_id = mv.s_id
+                WHERE bm.s_id IS NULL
+            """)
+        cursor.execute("""
+            SELECT COUNT(*),
+                   IFNULL(SUM(t.old_m_no = t.m_no), 0),
+                   IFNULL(SUM(t.old_m_no <> t.m_no), 0),
+                   IFNULL(SUM(t.old_m_no IS NULL), 0),
+                   IFNULL(SUM(m.monthly_fee), 0)
+            FROM tmp_mess_rollover t JOIN mess m ON m.m_no = t.m_no
+        """)
+        total, renewed, moved, booked, amount = cursor.fetchone()
+
+        # 2) apply
+        if total and not dry_run:
+            cursor.execute("SET @hm_bulk_mess = 1")
+            try:
+                cursor.execute("""
+                    INSERT INTO fees (p_id, p_date, p_method, amount)
+                    SELECT next_fee_id('MSS-'), %s, 'Cash', m.monthly_fee
+                    FROM tmp_mess_rollover t JOIN mess m ON m.m_no = t.m_no
+                """, (start,))
+                # ledger: the fee moves from the old booking month to this one,
+                # as trg_mess_after_update does for a single booking
+                cursor.execute("""
+                    UPDATE student_ledger l
+                    JOIN tmp_mess_rollover t
+                      ON t.s_id = l.s_id AND l.period_year = YEAR(t.old_date) AND l.period_month = MONTH(t.old_date)
+                    JOIN mess m ON m.m_no = t.old_m_no
+                    SET l.mess_fee = l.mess_fee - m.monthly_fee
+                """)
+                cursor.execute("""
+                    INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+                    SELECT t.s_id, %s, %s, m.monthly_fee
+                    FROM tmp_mess_rollover t JOIN mess m ON m.m_no = t.m_no
+                    ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee)
+                """, (year, month))
+                cursor.execute("""
+                    UPDATE books_mess bm
+                    JOIN tmp_mess_rollover t ON t.s_id = bm.s_id
+                    SET bm.m_no = t.m_no, bm.booking_date = %s
+                """, (start,))
+                cursor.execute("""
+                    INSERT INTO books_mess (s_id, m_no, booking_date)
+                    SELECT s_id, m_no, %s FROM tmp_mess_rollover WHERE old_m_no IS NULL
+                """, (start,))
+            finally:
+                cursor.execute("SET @hm_bulk_mess = NULL")
+        cursor.execute("DROP TEMPORARY TABLE tmp_mess_moves")
+        cursor.execute("DROP TEMPORARY TABLE tmp_mess_rollover")
+        return {'renewed': int(renewed), 'moved': int(moved), 'booked': int(booked),
+                'fees_created': 0 if dry_run else total, 'amount': amount, 'errors': errors}
+
+    result = run_transaction(connection, rollover)
+    if result['fees_created']:
+        notify_write('books_mess', 'fees')
+        # one event for the whole month; clients reload the fee list
+        after_commit(events.publish, 'fees', {'source': 'mess', 'count': result['fees_created']})
+    elapsed = time.perf_counter() - started
+    bookings = result['renewed'] + result['moved'] + result['booked']
+    result.update({
+        'month': f"{year}-{month:02d}",
+        'dry_run': dry_run,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'bookings_per_second': round(bookings / elapsed) if elapsed else None,
+    })
+    return result
+
+def mess_moves(value):
+    """{s_id: m_no} from a mapping or a list of {"s_id": ..., "m_no": ...}"""
+    if isinstance(value, dict):
+        return value
+    if any(not isinstance(entry, dict) or not entry.get('s_id') or not entry.get('m_no') for entry in value or []):
+        raise ValueError('each move needs s_id and m_no')
+    return {entry['s_id']: entry['m_no'] for entry in value or []}
+
+@app.route('/api/mess/rollover', methods=['POST'])
+def mess_rollover():
+    """
+    Renew every mess booking for a month and apply mess changes in bulk.
+    Body:
+      {
+        "year": 2026, "month": 11,          (default: the current month)
+        "moves": {"PES1UG23CS440": "M002"}, (optional) or [{"s_id": ..., "m_no": ...}]
+        "dry_run": false
+      }
+    Idempotent per month: bookings already dated in the month are not renewed
+    again and moves to the mess a student already has are no-ops.
+    """
+    data = request.json or {}
+    today = date.today()
+    try:
+        year, month = int(data.get('year') or today.year), int(data.get('month') or today.month)
+        if not 1 <= month <= 12:
+            raise ValueError('month must be 1-12')
+        moves = mess_moves(data.get('moves'))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        result = rollover_mess(connection, year, month, moves, bool(data.get('dry_run')))
+        return jsonify(result), 201 if result['fees_created'] else 200
+    except (Error, Conflict) as e:
+        return transaction_error_response(e)
+    finally:
+        connection.close()
+
 # Wardens API (kept as raw SQL)
 @app.route('/api/wardens', methods=['GET'])
+@cached_response('warden', 'monitors')
 def get_wardens():
     connection = get_db_connection()
     if not connection:
@@ -578,12 +3246,8 @@ def get_wardens():
 
     try:
         cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT w.*, COUNT(m.s_id) as student_count
-            FROM warden w
-            LEFT JOIN monitors m ON w.w_id = m.w_id
-            GROUP BY w.w_id
-        """)
+        # student_count is maintained by the monitors triggers / bulk assignment
+        cursor.execute("SELECT w_id, name, p_no, student_count FROM warden ORDER BY w_id")
         wardens = cursor.fetchall()
         return jsonify(wardens)
     except Error as e:
@@ -616,6 +3280,7 @@ def get_warden_students(warden_id):
 
 # Laundry API - list (raw SELECT)
 @app.route('/api/laundry', methods=['GET'])
+@cached_response('laundry')
 def get_laundry():
     connection = get_db_connection()
     if not connection:
@@ -645,11 +3310,13 @@ def submit_laundry():
         # CALLS: sp_submit_laundry(s_id, l_no)
         cursor.execute("CALL sp_submit_laundry(%s, %s)", (data['s_id'], data['l_no']))
         connection.commit()
+        notify_write('gives_laundry', 'fees')
         try:
             while cursor.nextset():
                 pass
         except:
             pass
+        after_commit(publish_service_fee, connection, 'laundry', data['s_id'])
         return jsonify({'message': 'Laundry submitted successfully'}), 201
     except Error as e:
         connection.rollback()
@@ -658,7 +3325,7 @@ def submit_laundry():
         cursor.close()
         connection.close()
 
-# Student payments (uses function) — unchanged
+# Student payments (uses function, backed by student_ledger)
 @app.route('/api/students/<student_id>/payments', methods=['GET'])
 def get_student_payments(student_id):
     connection = get_db_connection()
@@ -681,7 +3348,7 @@ def get_student_payments(student_id):
 def get_student_monthly_charges(student_id):
     """
     Query params expected: ?month=MM&year=YYYY
-    Calls stored procedure sp_calculate_student_monthly_charges
+    Calls stored procedure sp_calculate_student_monthly_charges (a student_ledger lookup)
     """
     month = request.args.get('month', type=int)
     year = request.args.get('year', type=int)
@@ -712,6 +3379,157 @@ def get_student_monthly_charges(student_id):
         cursor.close()
         connection.close()
 
+# -----------------
+# Bulk monthly billing (whole hostel in one pass)
+# -----------------
+BILLING_BATCH_SIZE = int(os.environ.get('BILLING_BATCH_SIZE', 2000))
+NO_CHARGES = (Decimal('0.00'), Decimal('0.00'), Decimal('0.00'))
+BILLING_COLUMNS = ('s_id', 'name', 'mess_fee', 'laundry_charges', 'total_charges', 'total_paid', 'balance')
+
+# One grouped statement per batch of students. Every filter is a range on an
+# indexed column (s_id BETWEEN, date >= start AND date < end), never MONTH()/YEAR().
+BILLING_BATCH_SQL = """
+    SELECT s_id, SUM(mess_fee) AS mess_fee, SUM(laundry_charges) AS laundry_charges, SUM(total_paid) AS total_paid
+    FROM (
+        SELECT bm.s_id, m.monthly_fee AS mess_fee, 0 AS laundry_charges, 0 AS total_paid
+        FROM books_mess bm JOIN mess m ON bm.m_no = m.m_no
+        WHERE bm.s_id BETWEEN %(first)s AND %(last)s
+          AND bm.booking_date >= %(start)s AND bm.booking_date < %(end)s
+        UNION ALL
+        SELECT gl.s_id, 0, l.rate_per_day, 0
+        FROM gives_laundry gl JOIN laundry l ON gl.l_no = l.l_no
+        WHERE gl.s_id BETWEEN %(first)s AND %(last)s
+          AND gl.submission_date >= %(start)s AND gl.submission_date < %(end)s
+        UNION ALL
+        SELECT gl.s_id, 0, l.rate_per_day, 0
+        FROM gives_laundry_archive gl JOIN laundry l ON gl.l_no = l.l_no
+        WHERE gl.s_id BETWEEN %(first)s AND %(last)s
+          AND gl.submission_date >= %(start)s AND gl.submission_date < %(end)s
+        UNION ALL
+        SELECT srf.s_id, 0, 0, f.amount
+        FROM student_room_fees srf JOIN fees f ON srf.p_id = f.p_id
+        WHERE srf.s_id BETWEEN %(first)s AND %(last)s
+          AND f.p_date >= %(start)s AND f.p_date < %(end)s
+    ) AS entries
+    GROUP BY s_id
+"""
+
+def month_range(year, month):
+    """Half-open [start, end) date range covering one calendar month"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+def iter_monthly_billing(connection, year, month, batch_size=BILLING_BATCH_SIZE):
+    """
+    Yield lists of billing rows (same figures as sp_calculate_student_monthly_charges)
+    for every student, batch_size students at a time, ordered by s_id.
+    Two round trips per batch: the page of students, then the grouped charges.
+    """
+    start, end = month_range(year, month)
+    cursor = connection.cursor()
+    try:
+        after = ''
+        while True:
+            cursor.execute("""
+                SELECT s_id, CONCAT(f_name, ' ', IFNULL(m_name, ''), ' ', l_name)
+                FROM student WHERE s_id > %s ORDER BY s_id LIMIT %s
+            """, (after, batch_size))
+            students = cursor.fetchall()
+            if not students:
+                return
+
+            cursor.execute(BILLING_BATCH_SQL, {
+                'first': students[0][0], 'last': students[-1][0], 'start': start, 'end': end,
+            })
+            charges = {row[0]: row[1:] for row in cursor.fetchall()}
+
+            batch = []
+            for s_id, name in students:
+                mess_fee, laundry_charges, total_paid = charges.get(s_id, NO_CHARGES)
+                total = mess_fee + laundry_charges
+                batch.append({
+                    's_id': s_id,
+                    'name': name,
+                    'mess_fee': mess_fee,
+                    'laundry_charges': laundry_charges,
+                    'total_charges': total,
+                    'total_paid': total_paid,
+                    'balance': total - total_paid,
+                })
+            yield batch
+            after = students[-1][0]
+    finally:
+        cursor.close()
+
+def billing_csv_header():
+    return ','.join(BILLING_COLUMNS) + '\n'
+
+def billing_csv_rows(batch):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerows([row[column] for column in BILLING_COLUMNS] for row in batch)
+    return buffer.getvalue()
+
+def billing_error_record(output, message, count):
+    """
+    Last record of a billing stream that failed part way. The 200 and the
+    attachment headers are already sent, so this is how a client tells a
+    truncated file from a complete one: a CSV row starting with 'error', or an
+    NDJSON object with an "error" key.
+    """
+    if output == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(['error', f'{message} (after {count} students)'])
+        return buffer.getvalue()
+    return app.json.dumps({'error': message, 'rows': count}) + '\n'
+
+@app.route('/api/billing', methods=['GET'])
+def get_monthly_billing():
+    """
+    Monthly charges for every student, streamed.
+    Query params: ?month=MM&year=YYYY[&format=csv|ndjson][&batch_size=N]
+    """
+    month = request.args.get('month', type=int)
+    year = request.args.get('year', type=int)
+    if not month or not year or not 1 <= month <= 12:
+        return jsonify({'error': 'month and year query parameters required (e.g. ?month=1&year=2025)'}), 400
+    output = request.args.get('format', 'csv')
+    if output not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+    batch_size = max(1, min(request.args.get('batch_size', BILLING_BATCH_SIZE, type=int), 10000))
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    dumps = app.json.dumps
+
+    def generate():
+        started = time.perf_counter()
+        count = 0
+        try:
+            if output == 'csv':
+                yield billing_csv_header()
+            for batch in iter_monthly_billing(connection, year, month, batch_size):
+                count += len(batch)
+                if output == 'csv':
+                    yield billing_csv_rows(batch)
+                else:
+                    yield ''.join(dumps(row) + '\n' for row in batch)
+            elapsed = time.perf_counter() - started
+            print(f"Billing {year}-{month:02d}: {count} students in {elapsed:.2f}s "
+                  f"({count / elapsed if elapsed else 0:.0f}/s)")
+        except Error as e:
+            print(f"Error while streaming billing run: {e}")
+            yield billing_error_record(output, f'Billing run failed: {e}', count)
+        finally:
+            connection.close()
+
+    mimetype = 'text/csv' if output == 'csv' else 'application/x-ndjson'
+    headers = {'Content-Disposition': f'attachment; filename=billing-{year}-{month:02d}.{output}'}
+    return Response(generate(), mimetype=mimetype, headers=headers)
+
 # Assign warden — kept as raw SQL (can be changed to procedure if created)
 @app.route('/api/wardens/assign', methods=['POST'])
 def assign_warden():
@@ -733,6 +3551,7 @@ def assign_warden():
         """, (data['w_id'], data['s_id']))
 
         connection.commit()
+        notify_write('monitors', 'warden')
         return jsonify({'message': 'Warden assigned successfully'})
 
     except Exception as e:
@@ -743,68 +3562,542 @@ def assign_warden():
         cursor.close()
         connection.close()
 
-# Dashboard Statistics — unchanged (keeps raw queries)
-@app.route('/api/dashboard/stats', methods=['GET'])
-def get_dashboard_stats():
+# -----------------
+# Bulk warden assignment
+# -----------------
+WARDEN_STRATEGIES = ('least_loaded', 'room_affinity', 'floor_affinity')
+
+def room_floor(r_no):
+    """Floor/block of a room, as /api/rooms/occupants?prefix= reads it (A101 -> A1)"""
+    return r_no[:-2] if len(r_no) > 2 else r_no
+
+def plan_warden_assignment(loads, students, strategy='least_loaded', area_wardens=None, max_per_warden=None):
+    """
+    Assign students to wardens in memory.
+      loads:        {w_id: students monitored} snapshot (mutated as students are added)
+      students:     list of (s_id, r_no or None)
+      area_wardens: {r_no or floor: {w_id: students there}} for the affinity strategies
+    least_loaded hands each student to the warden with the fewest students.
+    room_affinity / floor_affinity keep a room (floor) with one warden: the group
+    goes to the warden already covering most of that area, else to the least
+    loaded one, and spills over to the next least loaded warden once the cap is
+    reached. The cap is max_per_warden, or the balanced share ceil(total / wardens).
+    Returns ({s_id: w_id}, [unplaced s_id]).
+    """
+    area_wardens = area_wardens or {}
+    if not loads:
+        return {}, [s_id for s_id, _ in students]
+    limit = max_per_warden or -(-(sum(loads.values()) + len(students)) // len(loads))
+
+    heap = [(load, w_id) for w_id, load in loads.items()]
+    heapq.heapify(heap)
+    assignment, unplaced = {}, []
+
+    def least_loaded():
+        while heap:
+            load, w_id = heap[0]
+            if load != loads[w_id]:
+                heapq.heappop(heap)     # stale entry, the warden took students since
+                continue
+            return w_id if load < limit else None
+        return None
+
+    def place(members, w_id):
+        take = members[:max(limit - loads[w_id], 0)]
+        for s_id in take:
+            assignment[s_id] = w_id
+        loads[w_id] += len(take)
+        heapq.heappush(heap, (loads[w_id], w_id))
+        return members[len(take):]
+
+    def spread(members):
+        while members:
+            w_id = least_loaded()
+            if w_id is None:
+                unplaced.extend(members)
+                return
+            members = place(members, w_id)
+
+    groups, loose = {}, []
+    for s_id, r_no in students:
+        if r_no and strategy == 'room_affinity':
+            groups.setdefault(r_no, []).append(s_id)
+        elif r_no and strategy == 'floor_affinity':
+            groups.setdefault(room_floor(r_no), []).append(s_id)
+        else:
+            loose.append(s_id)
+
+    # biggest areas first, while the wardens still have room for them
+    for key, members in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])):
+        present = {w_id: n for w_id, n in area_wardens.get(key, {}).items() if w_id in loads}
+        if present:
+            members = place(members, min(present, key=lambda w: (-present[w], loads[w], w)))
+        spread(members)
+    for s_id in loose:
+        spread([s_id])
+
+    return assignment, unplaced
+
+@app.route('/api/wardens/assign/bulk', methods=['POST'])
+def assign_wardens_bulk():
+    """
+    Assign many students to wardens in one transaction.
+    Body:
+      {
+        "students": ["PES1UG23CS440", ...],    or [{"s_id": "..."}, ...]
+        "strategy": "least_loaded",            or "room_affinity" / "floor_affinity"
+        "wardens": ["W001", "W002"],           (optional) only these wardens
+        "max_per_warden": 40,                  (optional) default: the balanced share
+        "reassign": false,                     move students that already have a warden
+        "dry_run": false
+      }
+    The affected monitors rows and the wardens are locked, the plan is made in
+    memory from warden.student_count and student_room_fees.r_no, then applied
+    with one DELETE, one multi-row INSERT and one student_count update for all
+    touched wardens. The per-row monitors triggers stand aside (@hm_bulk_monitors).
+    """
+    data = request.json or {}
+    strategy = data.get('strategy') or 'least_loaded'
+    if strategy not in WARDEN_STRATEGIES:
+        return jsonify({'error': f'strategy must be one of {", ".join(WARDEN_STRATEGIES)}'}), 400
+    max_per_warden = data.get('max_per_warden')
+    if max_per_warden is not None and (isinstance(max_per_warden, bool) or not isinstance(max_per_warden, int)
+                                       or max_per_warden < 1):
+        return jsonify({'error': 'max_per_warden must be a positive integer'}), 400
+    entries = data.get('students') or []
+    if not entries:
+        return jsonify({'error': 'students list is required'}), 400
+
+    invalid, ids, seen = [], [], set()
+    for entry in entries:
+        s_id = entry.get('s_id') if isinstance(entry, dict) else entry
+        if not s_id or not isinstance(s_id, str):
+            invalid.append({'s_id': None, 'error': 's_id is required'})
+        elif s_id in seen:
+            invalid.append({'s_id': s_id, 'error': 'listed more than once'})
+        else:
+            seen.add(s_id)
+            ids.append(s_id)
+    if not ids:
+        return jsonify({'error': 'no valid students', 'errors': invalid}), 400
+    wardens = data.get('wardens') or []
+    if not isinstance(wardens, list) or not all(w_id and isinstance(w_id, str) for w_id in wardens):
+        return jsonify({'error': 'wardens must be a list of w_id strings'}), 400
+    wanted = set(wardens)
+    reassign, dry_run = bool(data.get('reassign')), bool(data.get('dry_run'))
+
     connection = get_db_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
 
-    try:
-        cursor = connection.cursor(dictionary=True)
+    started = time.perf_counter()
+    marks = ', '.join(['%s'] * len(ids))
+
+    def assign(cursor):
+        errors = list(invalid)
+
+        # 1) the batch's current assignments (locked, so single assigns of these students wait)
+        cursor.execute(f"SELECT s_id, w_id FROM monitors WHERE s_id IN ({marks}) FOR UPDATE", ids)
+        current = {}
+        for s_id, w_id in cursor.fetchall():
+            current.setdefault(s_id, []).append(w_id)
+
+        # 2) the students and their rooms
+        cursor.execute(f"""
+            SELECT s.s_id, srf.r_no
+            FROM student s
+            LEFT JOIN student_room_fees srf ON srf.s_id = s.s_id
+            WHERE s.s_id IN ({marks})
+        """, ids)
+        rooms = dict(cursor.fetchall())
+        for s_id in ids:
+            if s_id not in rooms:
+                errors.append({'s_id': s_id, 'error': 'Student not found'})
+            elif s_id in current and not reassign:
+                errors.append({'s_id': s_id, 'error': 'Student already has a warden'})
+        candidates = [(s_id, rooms[s_id]) for s_id in ids
+                      if s_id in rooms and (reassign or s_id not in current)]
+        moving = [s_id for s_id, _ in candidates if s_id in current]
 
-        stats = {}
+        # 3) lock the wardens in w_id order: the candidates plus those losing students
+        if wanted:
+            lock_ids = sorted(wanted | {w_id for s_id in moving for w_id in current[s_id]})
+            cursor.execute(f"SELECT w_id, student_count FROM warden "
+                           f"WHERE w_id IN ({', '.join(['%s'] * len(lock_ids))}) ORDER BY w_id FOR UPDATE", lock_ids)
+        else:
+            cursor.execute("SELECT w_id, student_count FROM warden ORDER BY w_id FOR UPDATE")
+        counts = dict(cursor.fetchall())
+        errors.extend({'w_id': w_id, 'error': 'Warden not found'} for w_id in sorted(wanted - set(counts)))
+        released = Counter(w_id for s_id in moving for w_id in current[s_id])
+        loads = {w_id: count - released[w_id] for w_id, count in counts.items() if not wanted or w_id in wanted}
+        if not loads:
+            raise Conflict('No wardens to assign students to')
 
-        # Total students
-        cursor.execute("SELECT COUNT(*) as count FROM student")
-        stats['total_students'] = cursor.fetchone()['count']
+        # 4) who already covers each room / floor (the students being moved don't count)
+        area_wardens = {}
+        r_nos = sorted({r_no for _, r_no in candidates if r_no})
+        if strategy != 'least_loaded' and r_nos:
+            if strategy == 'room_affinity':
+                areas = set(r_nos)
+                where, params = f"srf.r_no IN ({', '.join(['%s'] * len(r_nos))})", list(r_nos)
+            else:
+                areas = {room_floor(r_no) for r_no in r_nos}
+                where = '(' + ' OR '.join(['srf.r_no LIKE %s'] * len(areas)) + ')'
+                params = [_like_prefix(floor) for floor in sorted(areas)]
+            if moving:
+                where += f" AND m.s_id NOT IN ({', '.join(['%s'] * len(moving))})"
+                params.extend(moving)
+            cursor.execute(f"""
+                SELECT srf.r_no, m.w_id, COUNT(*)
+                FROM student_room_fees srf
+                JOIN monitors m ON m.s_id = srf.s_id
+                WHERE {where}
+                GROUP BY srf.r_no, m.w_id
+            """, params)
+            for r_no, w_id, n in cursor.fetchall():
+                key = r_no if strategy == 'room_affinity' else room_floor(r_no)
+                if key in areas:
+                    area_wardens.setdefault(key, Counter())[w_id] += n
 
-        # Total rooms
-        cursor.execute("SELECT COUNT(*) as count FROM room")
-        stats['total_rooms'] = cursor.fetchone()['count']
+        # 5) plan in memory; students already with their planned warden are left alone
+        assignment, unplaced = plan_warden_assignment(loads, candidates, strategy, area_wardens, max_per_warden)
+        errors.extend({'s_id': s_id, 'error': 'No warden below max_per_warden'} for s_id in unplaced)
+        writes = [(s_id, w_id) for s_id, w_id in sorted(assignment.items()) if current.get(s_id) != [w_id]]
+        delta = Counter(w_id for _, w_id in writes)
+        for s_id, _ in writes:
+            delta.subtract(current.get(s_id, ()))
+        delta = {w_id: n for w_id, n in sorted(delta.items()) if n}
 
-        # Occupied rooms
-        cursor.execute("SELECT COUNT(*) as count FROM room WHERE no_of_people > 0")
-        stats['occupied_rooms'] = cursor.fetchone()['count']
+        # 6) apply: one DELETE, one multi-row INSERT, one count update
+        if writes and not dry_run:
+            moved = [s_id for s_id, _ in writes if s_id in current]
+            today = date.today()
+            cursor.execute("SET @hm_bulk_monitors = 1")
+            try:
+                if moved:
+                    cursor.execute(f"DELETE FROM monitors WHERE s_id IN ({', '.join(['%s'] * len(moved))})", moved)
+                cursor.executemany("""
+                    INSERT INTO monitors (w_id, s_id, assigned_date)
+                    VALUES (%s, %s, %s)
+                """, [(w_id, s_id, today) for s_id, w_id in writes])
+            finally:
+                cursor.execute("SET @hm_bulk_monitors = NULL")
+            if delta:
+                cases = ' '.join(['WHEN %s THEN %s'] * len(delta))
+                cursor.execute(f"""
+                    UPDATE warden
+                    SET student_count = student_count + CASE w_id {cases} ELSE 0 END
+                    WHERE w_id IN ({', '.join(['%s'] * len(delta))})
+                """, [value for item in delta.items() for value in item] + list(delta))
+
+        return {
+            'dry_run': dry_run,
+            'strategy': strategy,
+            'assigned': len(writes),
+            'unchanged': len(assignment) - len(writes),
+            'assignments': [{'s_id': s_id, 'w_id': w_id, 'r_no': rooms[s_id]} for s_id, w_id in writes],
+            'warden_counts': loads,
+            'count_changes': delta,
+            'errors': errors,
+        }
+
+    try:
+        result = run_transaction(connection, assign)
+        applied = bool(result['assigned']) and not dry_run
+        if applied:
+            notify_write('monitors', 'warden')
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return jsonify(result), 201 if applied else 200
+    except (Error, Conflict) as e:
+        return transaction_error_response(e)
+    finally:
+        connection.close()
+
+# Dashboard Statistics — served from the cached hostel summary
+@app.route('/api/dashboard/stats', methods=['GET'])
+def get_dashboard_stats():
+    try:
+        summary = load_hostel_summary()
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Total revenue
-        cursor.execute("SELECT SUM(amount) as total FROM fees")
-        result = cursor.fetchone()
-        stats['total_revenue'] = float(result['total']) if result['total'] else 0
+    return conditional_response(jsonify(dashboard_stats(summary)))
 
-        # Mess bookings
-        cursor.execute("SELECT COUNT(*) as count FROM books_mess")
-        stats['mess_bookings'] = cursor.fetchone()['count']
+# Dashboard cache state (hit ratio, age)
+@app.route('/api/dashboard/cache', methods=['GET'])
+def get_dashboard_cache():
+    return jsonify(dict(summary_cache_stats(), responses=response_cache_stats()))
 
-        return jsonify(stats)
+# Connection pool statistics
+@app.route('/api/pool/stats', methods=['GET'])
+def get_pool_stats():
+    stats = get_pool().stats()
+    if replicas:
+        stats['read_replicas'] = replicas.stats()
+    return jsonify(stats)
+
+# Prometheus metrics (per-route histograms + pool and cache gauges)
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    lines = metrics.render()
+    gauges = {
+        'hostel_db_pool_in_use': ('Connections checked out.', get_pool().stats()['in_use']),
+        'hostel_db_pool_open': ('Open pooled connections.', get_pool().stats()['open']),
+        'hostel_db_pool_timeouts_total': ('Checkouts that gave up waiting.', get_pool().stats()['timeouts']),
+        'hostel_dashboard_cache_hit_ratio': ('Dashboard summary cache hit ratio.', summary_cache_stats()['hit_ratio']),
+    }
+    with _txn_stats_lock:
+        for key in ('retries', 'deadlocks', 'lock_wait_timeouts', 'gave_up', 'conflicts'):
+            gauges[f'hostel_txn_{key}_total'] = (f'Occupancy transactions: {key.replace("_", " ")}.', txn_stats[key])
+    for name, (help_text, value) in gauges.items():
+        kind = 'counter' if name.endswith('_total') else 'gauge'
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+# Hostel report — same metrics as sp_generate_hostel_report, built from the cached summary
+@app.route('/api/report', methods=['GET'])
+def generate_report():
+    try:
+        summary = load_hostel_summary()
     except Error as e:
         return jsonify({'error': str(e)}), 500
+
+    return conditional_response(jsonify(hostel_report(summary)))
+
+# -----------------
+# Student ledger maintenance
+# -----------------
+# Per student, per month totals computed straight from the raw tables.
+# student_ledger must always equal this; the triggers keep it in step.
+LEDGER_SOURCE_SQL = """
+    SELECT s_id, period_year, period_month,
+           SUM(mess_fee) AS mess_fee, SUM(laundry_charges) AS laundry_charges, SUM(total_paid) AS total_paid
+    FROM (
+        SELECT bm.s_id, YEAR(bm.booking_date) AS period_year, MONTH(bm.booking_date) AS period_month,
+               m.monthly_fee AS mess_fee, 0 AS laundry_charges, 0 AS total_paid
+        FROM books_mess bm JOIN mess m ON bm.m_no = m.m_no
+        UNION ALL
+        SELECT gl.s_id, YEAR(gl.submission_date), MONTH(gl.submission_date), 0, l.rate_per_day, 0
+        FROM gives_laundry gl JOIN laundry l ON gl.l_no = l.l_no
+        UNION ALL
+        SELECT gl.s_id, YEAR(gl.submission_date), MONTH(gl.submission_date), 0, l.rate_per_day, 0
+        FROM gives_laundry_archive gl JOIN laundry l ON gl.l_no = l.l_no
+        UNION ALL
+        SELECT srf.s_id, YEAR(f.p_date), MONTH(f.p_date), 0, 0, f.amount
+        FROM student_room_fees srf JOIN fees f ON srf.p_id = f.p_id
+    ) AS entries
+    GROUP BY s_id, period_year, period_month
+"""
+
+LEDGER_MISMATCH_SQL = """
+    SELECT e.s_id, e.period_year, e.period_month,
+           e.mess_fee AS expected_mess_fee, l.mess_fee AS ledger_mess_fee,
+           e.laundry_charges AS expected_laundry_charges, l.laundry_charges AS ledger_laundry_charges,
+           e.total_paid AS expected_total_paid, l.total_paid AS ledger_total_paid
+    FROM ({source}) e
+    LEFT JOIN student_ledger l
+           ON l.s_id = e.s_id AND l.period_year = e.period_year AND l.period_month = e.period_month
+    WHERE l.s_id IS NULL
+       OR l.mess_fee <> e.mess_fee OR l.laundry_charges <> e.laundry_charges OR l.total_paid <> e.total_paid
+    UNION ALL
+    SELECT l.s_id, l.period_year, l.period_month,
+           0, l.mess_fee, 0, l.laundry_charges, 0, l.total_paid
+    FROM student_ledger l
+    LEFT JOIN ({source}) e
+           ON l.s_id = e.s_id AND l.period_year = e.period_year AND l.period_month = e.period_month
+    WHERE e.s_id IS NULL
+      AND (l.mess_fee <> 0 OR l.laundry_charges <> 0 OR l.total_paid <> 0)
+"""
+
+def rebuild_ledger(connection):
+    """Recompute student_ledger from the raw tables in one transaction; returns row count"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("START TRANSACTION")
+        cursor.execute("DELETE FROM student_ledger")
+        cursor.execute(f"""
+            INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee, laundry_charges, total_paid)
+            {LEDGER_SOURCE_SQL}
+        """)
+        rows = cursor.rowcount
+        connection.commit()
+        return rows
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def verify_ledger(connection):
+    """Return the (s_id, month) rows where student_ledger disagrees with the raw tables"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(LEDGER_MISMATCH_SQL.format(source=LEDGER_SOURCE_SQL))
+        return cursor.fetchall()
     finally:
         cursor.close()
+
+@app.cli.command('rebuild-ledger')
+@click.option('--verify-only', is_flag=True, help='Only compare the ledger with the raw tables.')
+def rebuild_ledger_command(verify_only):
+    """Backfill student_ledger from fees/gives_laundry/books_mess and verify it."""
+    connection = get_db_connection()
+    if not connection:
+        raise click.ClickException('Database connection failed')
+    try:
+        if not verify_only:
+            started = time.perf_counter()
+            rows = rebuild_ledger(connection)
+            click.echo(f"Rebuilt student_ledger: {rows} rows in {time.perf_counter() - started:.2f}s")
+
+        mismatches = verify_ledger(connection)
+        if mismatches:
+            for row in mismatches[:20]:
+                click.echo(f"  mismatch: {row}")
+            raise click.ClickException(f"{len(mismatches)} ledger rows disagree with the raw tables")
+        click.echo("Ledger verified: matches the raw tables")
+    finally:
         connection.close()
 
-# Generate hostel report using stored procedure sp_generate_hostel_report
-@app.route('/api/report', methods=['GET'])
-def generate_report():
+@app.cli.command('billing-run')
+@click.option('--month', type=click.IntRange(1, 12), required=True)
+@click.option('--year', type=int, required=True)
+@click.option('--format', 'output', type=click.Choice(['csv', 'json']), default='csv')
+@click.option('--batch-size', type=int, default=BILLING_BATCH_SIZE, show_default=True)
+@click.option('--out', type=click.File('w'), default='-', help='Output file (default: stdout).')
+def billing_run_command(month, year, output, batch_size, out):
+    """Compute monthly charges for every student and write CSV or JSON (one object per line)."""
     connection = get_db_connection()
     if not connection:
-        return jsonify({'error': 'Database connection failed'}), 500
+        raise click.ClickException('Database connection failed')
+
+    started = time.perf_counter()
+    count = 0
     try:
-        cursor = connection.cursor(dictionary=True)
-        # CALLS: sp_generate_hostel_report()
-        cursor.execute("CALL sp_generate_hostel_report()")
-        rows = cursor.fetchall()
+        if output == 'csv':
+            out.write(billing_csv_header())
+        for batch in iter_monthly_billing(connection, year, month, batch_size):
+            if output == 'csv':
+                out.write(billing_csv_rows(batch))
+            else:
+                out.writelines(app.json.dumps(row) + '\n' for row in batch)
+            count += len(batch)
+            elapsed = time.perf_counter() - started
+            click.echo(f"  {count} students ({count / elapsed if elapsed else 0:.0f}/s)", err=True)
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    click.echo(f"Billed {count} students for {year}-{month:02d} in {elapsed:.2f}s "
+               f"({count / elapsed if elapsed else 0:.0f} students/s)", err=True)
+
+@app.cli.command('import-students')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, show_default=True)
+def import_students_command(path, chunk_size):
+    """Bulk-load students from a .csv, .ndjson or .json file."""
+    content_type = 'csv' if path.endswith('.csv') else 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+    with open(path, encoding='utf-8', newline='') as f:
         try:
-            while cursor.nextset():
-                pass
-        except:
-            pass
-        return jsonify(rows)
+            rows = parse_student_rows(f.read(), content_type)
+        except (ValueError, csv.Error) as e:
+            raise click.ClickException(f'Could not parse {path}: {e}')
+
+    connection = get_db_connection()
+    if not connection:
+        raise click.ClickException('Database connection failed')
+    try:
+        report = import_students(connection, rows, chunk_size)
+    finally:
+        connection.close()
+
+    for error in report['errors']:
+        click.echo(f"  row {error['row']} ({error['s_id']}): {error['error']}", err=True)
+    click.echo(f"Imported {report['inserted']}/{report['received']} students in "
+               f"{report['elapsed_ms']:.0f}ms ({report['rows_per_sec']} rows/s)")
+
+@app.cli.command('archive-history')
+@click.option('--months', type=int, default=ARCHIVE_AFTER_MONTHS, show_default=True,
+              help='Keep this many whole months (plus the current one) hot.')
+@click.option('--before', type=click.DateTime(formats=['%Y-%m-%d']), help='Archive everything dated before this day.')
+@click.option('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, show_default=True)
+def archive_history_command(months, before, batch_size):
+    """Move closed periods of fees and laundry submissions to the archive tables (cron-friendly)."""
+    cutoff = before.date() if before else archive_cutoff(months)
+    connection = get_db_connection()
+    if not connection:
+        raise click.ClickException('Database connection failed')
+    try:
+        moved = archive_history(connection, cutoff, batch_size,
+                                progress=lambda table, count: click.echo(f"  {table}: {count}", err=True))
     except Error as e:
-        return jsonify({'error': str(e)}), 500
+        raise click.ClickException(str(e))
+    finally:
+        connection.close()
+    click.echo(f"Archived {moved['fees']} fees and {moved['gives_laundry']} laundry submissions dated before "
+               f"{cutoff} in {moved['elapsed_ms']:.0f}ms")
+
+@app.cli.command('mess-rollover')
+@click.option('--month', type=click.IntRange(1, 12), required=True)
+@click.option('--year', type=int, required=True)
+@click.option('--moves', type=click.File('r'), help='JSON object of s_id -> m_no to change or book.')
+@click.option('--dry-run', is_flag=True, help='Only count what would be renewed, moved and booked.')
+def mess_rollover_command(month, year, moves, dry_run):
+    """Renew every mess booking for the month in one set-based transaction (cron-friendly)."""
+    connection = get_db_connection()
+    if not connection:
+        raise click.ClickException('Database connection failed')
+    try:
+        result = rollover_mess(connection, year, month, mess_moves(json.load(moves)) if moves else None, dry_run)
+    except Error as e:
+        raise click.ClickException(str(e))
     finally:
-        cursor.close()
         connection.close()
+    for error in result['errors'][:20]:
+        click.echo(f"  skipped: {error}", err=True)
+    click.echo(f"{'Would roll' if dry_run else 'Rolled'} over {result['month']}: {result['renewed']} renewed, "
+               f"{result['moved']} moved, {result['booked']} booked, {result['fees_created']} fees "
+               f"in {result['elapsed_ms']:.0f}ms ({result['bookings_per_second'] or 0} bookings/s)")
+
+@app.cli.command('db-migrate')
+@click.option('--fresh', is_flag=True, help='Drop and recreate everything from schema.sql (scratch databases only).')
+@click.option('--seed', type=click.Path(exists=True, dir_okay=False), help='JSON fixture to bulk-load afterwards.')
+@click.option('--dry-run', is_flag=True, help='Only list what would run.')
+@click.option('--status', is_flag=True, help='Show applied and pending migrations.')
+def db_migrate_command(fresh, seed, dry_run, status):
+    """Bootstrap the database or apply pending migrations; a no-op when up to date."""
+    if status:
+        connection = get_db_connection()
+        if not connection:
+            raise click.ClickException('Database connection failed')
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SCHEMA_MIGRATIONS_DDL)
+            applied = applied_migrations(cursor)
+        finally:
+            cursor.close()
+            connection.close()
+        for version, name, path in discover_migrations():
+            state = 'pending'
+            if version in applied:
+                state = 'applied' if applied[version][1] == file_checksum(path) else 'CHANGED'
+            click.echo(f"  {version:03d}_{name:<28} {state}")
+        return
+
+    try:
+        report = migrate(fresh=fresh, seed=seed, dry_run=dry_run)
+    except (Error, MigrationError) as e:
+        raise click.ClickException(str(e))
+    if dry_run:
+        click.echo('Would bootstrap from schema.sql' if report['bootstrapped']
+                   else f"Pending: {', '.join(report['applied']) or 'none'}")
+        return
+    for step in report['steps']:
+        detail = f"{step['statements']} statements" if 'statements' in step else f"{step['rows']} rows"
+        click.echo(f"  {step['step']:<32} {detail:>16} {step['ms']:>8}ms")
+    if not report['steps']:
+        click.echo('Database is up to date')
+    click.echo(f"Done in {report['elapsed_ms']}ms")
 
 if __name__ == '__main__':
     # Uncomment the line below to initialize database on first run
@@ -0,0 +1,347 @@
+"""
+Async (ASGI) serving mode.
+
+    pip install starlette aiomysql a2wsgi uvicorn
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+The hot read routes below are served natively on an aiomysql pool, so a slow
+query only holds its own coroutine instead of a worker thread. Every other
+route (all writes, pages, the room index, cached reference tables) is the
+Flask app from app.py, mounted unchanged and run in the threadpool - every
+/api/* route exists in both modes.
+
+With DB_REPLICAS set, native reads use per-replica aiomysql pools, picked with
+the same lag checks and read-your-writes cookie as the Flask routes.
+
+Native routes send the same conditional-GET headers as their Flask
+counterparts (strong ETag + 304 for the dashboard, report and student list)
+and read through the same caches: the summary cache for the dashboard and
+report, the version-keyed response cache for the full student list. They
+record the same per-route series in /metrics (request, connect, DB and
+serialization time, queries and rows; streamed bodies count their setup
+only, as in Flask). They do not send the X-DB-Target header.
+
+Native routes:
+    GET /api/dashboard/stats, /api/report   the summary aggregates, run concurrently
+    GET /api/fees, /api/laundry/submissions incl. ?stream=1, NDJSON and ?shape=columns;
+                                            ?from=&to= windows go to Flask
+    GET /api/students                       full list / stream; pages go to Flask
+"""
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import os
+import time
+
+import aiomysql
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+from app import (
+    app as flask_app, DB_CONFIG, DATE_WINDOW_PARAMS, FEES_LIST_SQL, LAUNDRY_SUBMISSIONS_SQL, STUDENT_LIST_SQL,
+    STUDENT_LIST_PARAMS, STREAM_CHUNK_SIZE, SUMMARY_QUERIES, READ_YOUR_WRITES_COOKIE, RowEncoder, dumps_fast,
+    STUDENT_LIST_TABLES, cached_summary, store_summary, cached_body, store_body, response_cache_key,
+    dashboard_stats, hostel_report, replicas, session_wrote_recently, metrics, note_not_modified,
+)
+
+ASYNC_POOL_CONFIG = {
+    'minsize': int(os.environ.get('ASGI_DB_POOL_MIN', 2)),
+    'maxsize': int(os.environ.get('ASGI_DB_POOL_SIZE', 20)),
+    'pool_recycle': int(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)),
+}
+
+pool = None
+replica_pools = {}
+
+
+async def create_pool(config):
+    return await aiomysql.create_pool(
+        host=config['host'], port=config.get('port', 3306), user=config['user'], password=config['password'],
+        db=config['database'], autocommit=True, **ASYNC_POOL_CONFIG)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    global pool
+    pool = await create_pool(DB_CONFIG)
+    for replica in replicas.replicas:
+        replica_pools[replica.name] = await create_pool(replica.config)
+    if replicas:
+        await asyncio.to_thread(replicas.start)
+    try:
+        yield
+    finally:
+        for p in [pool, *replica_pools.values()]:
+            p.close()
+            await p.wait_closed()
+
+
+def read_pool(request, shared_cache=False):
+    """Replica pool for this read, or the primary's (see ReplicaSet.route_read)"""
+    if not replicas or session_wrote_recently(request.cookies.get(READ_YOUR_WRITES_COOKIE)):
+        return pool
+    if shared_cache and replicas.wrote_recently():
+        return pool
+    replica = replicas.pick()
+    if replica is None:
+        return pool
+    replicas.count(replica.name)
+    return replica_pools[replica.name]
+
+
+# per-request counters, the native counterpart of app.py's g.db_metrics
+request_counters = contextvars.ContextVar('request_counters', default=None)
+
+
+def request_metric(name, value):
+    counters = request_counters.get()
+    if counters is not None:
+        counters[name] += value
+
+
+@contextlib.asynccontextmanager
+async def connection_from(db):
+    started = time.perf_counter()
+    connection = await db.acquire()
+    request_metric('connect_time', time.perf_counter() - started)
+    try:
+        yield connection
+    finally:
+        db.release(connection)
+
+
+async def timed_execute(cursor, sql):
+    started = time.perf_counter()
+    try:
+        await cursor.execute(sql)
+    finally:
+        request_metric('queries', 1)
+        request_metric('db_time', time.perf_counter() - started)
+
+
+async def timed_fetch(method, many=False):
+    """aiomysql rows are tuples too, so the caller says whether a list of rows comes back"""
+    started = time.perf_counter()
+    result = await method()
+    request_metric('db_time', time.perf_counter() - started)
+    if result is not None:
+        request_metric('rows', len(result) if many else 1)
+    return result
+
+
+def timed_dumps(dumps, obj):
+    started = time.perf_counter()
+    try:
+        return dumps(obj)
+    finally:
+        request_metric('serialize_time', time.perf_counter() - started)
+
+
+def conditional(request, response, etag=None):
+    """Strong body-hash ETag, 304 on a matching If-None-Match (as app.cached_response)"""
+    etag = etag or hashlib.sha1(response.body).hexdigest()
+    tags = {tag.strip() for tag in request.headers.get('if-none-match', '').split(',')}
+    if '*' in tags or f'"{etag}"' in tags:
+        note_not_modified()
+        response = Response(status_code=304)
+    response.headers['ETag'] = f'"{etag}"'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def error_response(e):
+    return JSONResponse({'error': str(e)}, status_code=500)
+
+
+def flask_json(obj):
+    """Body encoded exactly as jsonify() would (sorted keys, Decimal as string)"""
+    body = timed_dumps(lambda value: flask_app.json.dumps(value, separators=(',', ':')), obj)
+    return Response(body + '\n', media_type='application/json')
+
+
+async def fetch_scalar(db, sql):
+    async with connection_from(db) as connection:
+        async with connection.cursor() as cursor:
+            await timed_execute(cursor, sql)
+            return (await timed_fetch(cursor.fetchone))[0]
+
+
+async def load_summary(request):
+    """The hostel summary, sharing app.py's cache; one connection per aggregate on a miss"""
+    value, generation = cached_summary()
+    if value is not None:
+        return value
+    db = read_pool(request, shared_cache=True)
+    results = await asyncio.gather(*(fetch_scalar(db, sql) for sql in SUMMARY_QUERIES.values()))
+    value = dict(zip(SUMMARY_QUERIES, results))
+    store_summary(value, generation)
+    return value
+
+
+def json_rows(encoder, rows, columnar):
+    body = timed_dumps(dumps_fast, {'columns': encoder.columns, 'rows': encoder.rows(rows)} if columnar
+                       else encoder.records(rows))
+    return Response(body + b'\n', media_type='application/json')
+
+
+async def stream_rows(db, sql, ndjson, columnar):
+    """Async counterpart of app.stream_query on an unbuffered cursor"""
+    started = time.perf_counter()
+    connection = await db.acquire()
+    request_metric('connect_time', time.perf_counter() - started)
+    finished = False
+    try:
+        cursor = await connection.cursor(aiomysql.SSCursor)
+        await timed_execute(cursor, sql)
+        encoder = RowEncoder(cursor.description)
+    except aiomysql.Error:
+        connection.close()
+        db.release(connection)
+        raise
+
+    async def generate():
+        nonlocal finished
+        try:
+            first = True
+            if columnar:
+                yield b'{"columns":' + dumps_fast(encoder.columns) + b',"rows":['
+            elif not ndjson:
+                yield b'['
+            while True:
+                rows = await cursor.fetchmany(STREAM_CHUNK_SIZE)
+                if not rows:
+                    break
+                if ndjson:
+                    yield b''.join(dumps_fast(row) + b'\n' for row in encoder.records(rows))
+                else:
+                    values = encoder.rows(rows) if columnar else encoder.records(rows)
+                    chunk = b','.join(dumps_fast(value) for value in values)
+                    yield chunk if first else b',' + chunk
+                    first = False
+            if columnar:
+                yield b']}'
+            elif not ndjson:
+                yield b']'
+            finished = True
+        except aiomysql.Error as e:
+            print(f"Error while streaming rows: {e}")
+        finally:
+            if finished:
+                await cursor.close()
+            else:
+                # unread rows leave the connection unusable
+                connection.close()
+            db.release(connection)
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson' if ndjson else 'application/json')
+
+
+async def list_response(request, sql, endpoint=None, tables=()):
+    """
+    A list route's rows. With `tables`, the whole-list body goes through the
+    Flask route's version-keyed response cache (app.cached_response) under the
+    same key, so both modes share one cached body and one ETag.
+    """
+    ndjson = 'application/x-ndjson' in request.headers.get('accept', '')
+    columnar = not ndjson and request.query_params.get('shape') == 'columns'
+    try:
+        if ndjson or request.query_params.get('stream') == '1':
+            return await stream_rows(read_pool(request), sql, ndjson, columnar)
+        if tables:
+            key = response_cache_key(endpoint, request.scope['query_string'])
+            entry, versions = cached_body(key, tables)
+            if entry:
+                return conditional(request, Response(entry['body'], media_type=entry['mimetype']), entry['etag'])
+        async with connection_from(read_pool(request, shared_cache=bool(tables))) as connection:
+            async with connection.cursor() as cursor:
+                await timed_execute(cursor, sql)
+                rows = await timed_fetch(cursor.fetchall, many=True)
+                response = json_rows(RowEncoder(cursor.description), rows, columnar)
+        if not tables:
+            return response
+        return conditional(request, response, store_body(key, tables, versions, response.body, 'application/json'))
+    except aiomysql.Error as e:
+        return error_response(e)
+
+
+async def get_dashboard_stats(request):
+    try:
+        return conditional(request, flask_json(dashboard_stats(await load_summary(request))))
+    except aiomysql.Error as e:
+        return error_response(e)
+
+
+async def get_report(request):
+    try:
+        return conditional(request, flask_json(hostel_report(await load_summary(request))))
+    except aiomysql.Error as e:
+        return error_response(e)
+
+
+async def get_fees(request):
+    if any(request.query_params.get(key) for key in DATE_WINDOW_PARAMS):
+        return None  # date windows (incl. the archive tier) are served by Flask
+    return await list_response(request, FEES_LIST_SQL)
+
+
+async def get_laundry_submissions(request):
+    if any(request.query_params.get(key) for key in DATE_WINDOW_PARAMS):
+        return None
+    return await list_response(request, LAUNDRY_SUBMISSIONS_SQL)
+
+
+async def get_students(request):
+    if any(key in request.query_params for key in STUDENT_LIST_PARAMS):
+        return None  # keyset pages are served by Flask
+    return await list_response(request, STUDENT_LIST_SQL.format(source="student s"),
+                               endpoint='get_students', tables=STUDENT_LIST_TABLES)
+
+
+flask_wsgi = WSGIMiddleware(flask_app)
+
+
+class Native:
+    """ASGI endpoint running `handler(request)`; a None result falls back to Flask"""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def __call__(self, scope, receive, send):
+        started = time.perf_counter()
+        counters = {'connect_time': 0.0, 'db_time': 0.0, 'serialize_time': 0.0, 'queries': 0, 'rows': 0}
+        token = request_counters.set(counters)
+        try:
+            response = await self.handler(Request(scope, receive))
+        finally:
+            request_counters.reset(token)
+        if response is None:
+            await flask_wsgi(scope, receive, send)   # Flask records its own metrics
+            return
+        # as app.record_request_metrics: streamed bodies only count their setup
+        wall = time.perf_counter() - started
+        metrics.record(scope['method'], scope['path'], response.status_code, wall, counters)
+        response.headers['Server-Timing'] = ', '.join([
+            f"connect;dur={counters['connect_time'] * 1000:.2f}",
+            f"db;dur={counters['db_time'] * 1000:.2f}",
+            f"serialize;dur={counters['serialize_time'] * 1000:.2f}",
+            f"total;dur={wall * 1000:.2f}",
+        ])
+        response.headers['Access-Control-Allow-Origin'] = '*'   # as CORS(app) does for Flask routes
+        await response(scope, receive, send)
+
+
+app = Starlette(
+    routes=[
+        Route('/api/dashboard/stats', Native(get_dashboard_stats), methods=['GET']),
+        Route('/api/report', Native(get_report), methods=['GET']),
+        Route('/api/fees', Native(get_fees), methods=['GET']),
+        Route('/api/laundry/submissions', Native(get_laundry_submissions), methods=['GET']),
+        Route('/api/students', Native(get_students), methods=['GET']),
+        Mount('/', app=flask_wsgi),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,157 @@
+"""
+EXPLAIN + latency report for the hot queries touched by migrations/004_index_pack.sql.
+
+    python bench/explain_indexes.py                  # report on the current schema
+    python bench/explain_indexes.py --compare        # drop the pack, measure, re-add, measure
+    python bench/explain_indexes.py --compare --out report.json
+
+Run it against a database with realistic volume (see bench/generate_data.py);
+on the 6-student sample data every plan is a full scan and every query is instant.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+import mysql.connector
+from mysql.connector import Error
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import DB_CONFIG, FEES_LIST_SQL, LAUNDRY_SUBMISSIONS_SQL, BILLING_BATCH_SQL, month_range  # noqa: E402
+
+# (table, index, columns) - keep in step with migrations/004_index_pack.sql
+INDEX_PACK = [
+    ('fees', 'idx_fees_p_date', 'p_date, amount, p_method'),
+    ('gives_laundry', 'idx_gl_submission_date', 'submission_date'),
+    ('gives_laundry', 'idx_gl_student_date', 's_id, submission_date'),
+    ('books_mess', 'idx_bm_booking_date', 'booking_date, m_no'),
+    ('student_room_fees', 'idx_srf_p_id', 'p_id, s_id'),
+    ('monitors', 'idx_monitors_s_id', 's_id, w_id'),
+]
+
+
+def hot_queries(cursor, year, month):
+    """(name, sql, params) for the access paths the index pack targets"""
+    start, end = month_range(year, month)
+    cursor.execute("SELECT MIN(s_id), MAX(s_id) FROM (SELECT s_id FROM student ORDER BY s_id LIMIT 2000) page")
+    first, last = cursor.fetchone()
+    cursor.execute("SELECT s_id FROM monitors LIMIT 1")
+    row = cursor.fetchone()
+    some_student = row[0] if row else ''
+    return [
+        ('fees list (ORDER BY p_date DESC)', FEES_LIST_SQL, ()),
+        ('laundry submissions (ORDER BY submission_date DESC)', LAUNDRY_SUBMISSIONS_SQL, ()),
+        ('fees revenue for a month',
+         "SELECT IFNULL(SUM(amount), 0) FROM fees WHERE p_date >= %s AND p_date < %s", (start, end)),
+        ('mess bookings for a month',
+         "SELECT m_no, COUNT(*) FROM books_mess WHERE booking_date >= %s AND booking_date < %s GROUP BY m_no",
+         (start, end)),
+        ('billing batch (2000 students, one month)', BILLING_BATCH_SQL,
+         {'first': first or '', 'last': last or '', 'start': start, 'end': end}),
+        ('warden lookup by student (assign_warden DELETE)',
+         "SELECT w_id FROM monitors WHERE s_id = %s", (some_student,)),
+    ]
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN " + sql, params)
+    columns = [c[0] for c in cursor.description]
+    return [
+        {key: row[columns.index(key)] for key in ('table', 'type', 'key', 'rows', 'Extra') if key in columns}
+        for row in cursor.fetchall()
+    ]
+
+
+def time_query(cursor, sql, params, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'runs': runs,
+    }
+
+
+def measure(cursor, queries, runs):
+    return {
+        name: {'plan': explain(cursor, sql, params), 'latency': time_query(cursor, sql, params, runs)}
+        for name, sql, params in queries
+    }
+
+
+def set_index_pack(cursor, present):
+    """Add or drop the index pack; returns indexes that could not be dropped"""
+    kept = []
+    for table, index, columns in INDEX_PACK:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        """, (table, index))
+        exists = cursor.fetchone()[0] > 0
+        try:
+            if present and not exists:
+                cursor.execute(f"ALTER TABLE {table} ADD INDEX {index} ({columns})")
+            elif not present and exists:
+                cursor.execute(f"ALTER TABLE {table} DROP INDEX {index}")
+        except Error as e:
+            # 1553: the index now backs a foreign key and cannot be dropped
+            if e.errno != 1553:
+                raise
+            kept.append(index)
+    return kept
+
+
+def print_report(report):
+    for name, result in report['after'].items():
+        print(f"\n{name}")
+        for phase in ('before', 'after'):
+            if phase not in report:
+                continue
+            entry = report[phase][name]
+            plan = '; '.join(f"{p.get('table')}:{p.get('type')}/{p.get('key')} rows={p.get('rows')}"
+                             for p in entry['plan'])
+            print(f"  {phase:<6} p50={entry['latency']['p50_ms']:>9.3f}ms  "
+                  f"p95={entry['latency']['p95_ms']:>9.3f}ms  {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--compare', action='store_true', help='measure without the index pack, then with it')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--year', type=int, default=date.today().year)
+    parser.add_argument('--month', type=int, default=date.today().month)
+    parser.add_argument('--out', help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**DB_CONFIG)
+    cursor = connection.cursor()
+    report = {'year': args.year, 'month': args.month}
+    try:
+        queries = hot_queries(cursor, args.year, args.month)
+        if args.compare:
+            report['not_dropped'] = set_index_pack(cursor, present=False)
+            report['before'] = measure(cursor, queries, args.runs)
+            set_index_pack(cursor, present=True)
+        report['after'] = measure(cursor, queries, args.runs)
+    finally:
+        cursor.close()
+        connection.close()
+
+    print_report(report)
+    if report.get('not_dropped'):
+        print(f"\nkept during 'before' (backing a foreign key): {', '.join(report['not_dropped'])}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == '__main__':
+    main()
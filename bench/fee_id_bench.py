@@ -0,0 +1,115 @@
+"""
+Fee primary key schemes compared: the old random ids (F + uuid4 hex, and the
+triggers' LND-/MSS- + 8 UUID chars) versus the time-ordered ids from
+new_fee_id(). Each scheme inserts the same rows into its own copy of the fees
+table (CREATE TABLE ... LIKE fees, so the secondary indexes match), then
+throughput, rows lost to duplicate keys (the 8-char trigger ids collide at
+volume) and the InnoDB data/index size are reported.
+
+    python bench/fee_id_bench.py --rows 1000000
+    python bench/fee_id_bench.py --rows 200000 --existing 1000000   # insert into an already large table
+
+Only the scratch tables bench_fee_ids_* are written; they are dropped afterwards
+unless --keep is given. Run against a scratch database.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import mysql.connector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import DB_CONFIG, FeeIdGenerator  # noqa: E402
+
+
+def random_ids(count, rng):
+    """The previous scheme: app payments, laundry and mess trigger ids mixed"""
+    ids = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.2:
+            ids.append(f"F{uuid.uuid4().hex[:18].upper()}")
+        else:
+            ids.append(('LND-' if kind < 0.7 else 'MSS-') + str(uuid.uuid4())[:8])
+    return ids
+
+
+def ordered_ids(count, rng):
+    generator = FeeIdGenerator()
+    ids = []
+    for _ in range(count):
+        kind = rng.random()
+        ids.append(generator.next('F' if kind < 0.2 else 'LND-' if kind < 0.7 else 'MSS-'))
+    return ids
+
+
+SCHEMES = {'random': random_ids, 'ordered': ordered_ids}
+
+
+def table_size(cursor, table):
+    cursor.execute(f"ANALYZE TABLE {table}")
+    cursor.fetchall()
+    cursor.execute("""
+        SELECT data_length, index_length FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone()
+
+
+def insert(connection, cursor, table, ids, rng, chunk_size):
+    """Returns (seconds, rows rejected as duplicate keys)"""
+    start = date(2025, 1, 1)
+    started = time.perf_counter()
+    inserted = 0
+    for offset in range(0, len(ids), chunk_size):
+        rows = [(p_id, start + timedelta(days=rng.randrange(365)), 'Cash', 150.00)
+                for p_id in ids[offset:offset + chunk_size]]
+        cursor.executemany(f"INSERT IGNORE INTO {table} (p_id, p_date, p_method, amount) "
+                           f"VALUES (%s, %s, %s, %s)", rows)
+        inserted += cursor.rowcount
+        connection.commit()
+    return time.perf_counter() - started, len(ids) - inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500000, help='rows inserted and measured')
+    parser.add_argument('--existing', type=int, default=0, help='rows loaded (unmeasured) before measuring')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help='leave the bench_fee_ids_* tables in place')
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**DB_CONFIG)
+    cursor = connection.cursor()
+    results = {}
+    try:
+        for scheme, make_ids in SCHEMES.items():
+            table = f"bench_fee_ids_{scheme}"
+            rng = random.Random(args.seed)
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(f"CREATE TABLE {table} LIKE fees")
+            ids = make_ids(args.existing + args.rows, rng)
+            if args.existing:
+                insert(connection, cursor, table, ids[:args.existing], rng, args.chunk_size)
+            elapsed, duplicates = insert(connection, cursor, table, ids[args.existing:], rng, args.chunk_size)
+            data_length, index_length = table_size(cursor, table)
+            results[scheme] = (elapsed, duplicates, data_length, index_length)
+            if not args.keep:
+                cursor.execute(f"DROP TABLE {table}")
+    finally:
+        cursor.close()
+        connection.close()
+
+    print(f"{'scheme':<10} {'rows/s':>10} {'seconds':>9} {'dup keys':>9} {'data MB':>9} {'index MB':>9}")
+    for scheme, (elapsed, duplicates, data_length, index_length) in results.items():
+        print(f"{scheme:<10} {args.rows / elapsed:>10.0f} {elapsed:>9.1f} {duplicates:>9} "
+              f"{data_length / 2 ** 20:>9.1f} {index_length / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
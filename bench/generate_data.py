@@ -0,0 +1,220 @@
+"""
+Seeded synthetic data generator for benchmarking.
+
+Fills a local hostel_management database with students, rooms, fees, laundry
+submissions, mess bookings and warden assignments at a configurable scale.
+The same --seed always produces the same data.
+
+    python bench/generate_data.py --students 10000 --reset
+    python bench/generate_data.py --students 1000000 --laundry-per-student 4 --reset
+
+--reset empties every table first (the reference rows for mess and laundry are
+re-created), so only point it at a scratch database.
+
+--fixture writes the same data to a JSON fixture instead of a database, for
+provisioning a fresh benchmark database without regenerating it:
+
+    python bench/generate_data.py --students 100000 --fixture bench/fixtures/100k.json
+    flask --app app db-migrate --fresh --seed bench/fixtures/100k.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+import mysql.connector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import DB_CONFIG  # noqa: E402
+
+FIRST_NAMES = ['Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Divya', 'Harsha', 'Ishaan', 'Kavya', 'Meera',
+               'Nikhil', 'Pooja', 'Rahul', 'Riya', 'Rohan', 'Sneha', 'Tanvi', 'Varun', 'Vikram', 'Zoya']
+MIDDLE_NAMES = [None, None, None, 'Kumar', 'Devi', 'Raj', 'Kumari', 'Prasad']
+LAST_NAMES = ['Sharma', 'Reddy', 'Iyer', 'Patel', 'Nair', 'Rao', 'Gupta', 'Singh', 'Verma', 'Menon',
+              'Kulkarni', 'Joshi', 'Shetty', 'Hegde', 'Bhat']
+PAYMENT_METHODS = ['Cash', 'Card', 'UPI', 'Net Banking']
+
+MESSES = [('M01', 'North Mess', 4500.00), ('M02', 'South Mess', 4200.00), ('M03', 'Special Mess', 5000.00)]
+LAUNDRY = [('L001', 7, 50.00), ('L002', 3, 30.00), ('L003', 5, 40.00)]
+
+TABLES = ['fees_period_totals', 'gives_laundry_archive', 'fees_archive',
+          'monitors', 'gives_laundry', 'books_mess', 'student_room_fees', 'local_guardian', 'student_ledger',
+          'fees', 'room', 'warden', 'laundry', 'mess', 'student']
+
+
+def insert_chunks(cursor, connection, sql, rows, chunk_size):
+    """Multi-row INSERT via executemany, one commit per chunk"""
+    for offset in range(0, len(rows), chunk_size):
+        cursor.executemany(sql, rows[offset:offset + chunk_size])
+        connection.commit()
+
+
+class FixtureWriter:
+    """Collects the generated rows as a db-migrate --seed fixture instead of inserting them"""
+
+    def __init__(self):
+        self.tables = []
+
+    def add(self, sql, rows):
+        match = re.match(r'\s*INSERT\s+(IGNORE\s+)?INTO\s+(\w+)\s*\(([^)]*)\)', sql)
+        self.tables.append({'table': match.group(2), 'columns': [c.strip() for c in match.group(3).split(',')],
+                            'rows': rows, 'ignore_duplicates': bool(match.group(1))})
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'tables': self.tables}, f, default=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--rooms', type=int, help='default: enough for ~90%% of students')
+    parser.add_argument('--wardens', type=int, help='default: one per 200 students')
+    parser.add_argument('--laundry-per-student', type=float, default=3, help='average submissions per student')
+    parser.add_argument('--months', type=int, default=12, help='history length for dates')
+    parser.add_argument('--allocated', type=float, default=0.9, help='share of students with a room')
+    parser.add_argument('--mess-share', type=float, default=0.8, help='share of students with a mess booking')
+    parser.add_argument('--start-date', default='2025-01-01')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--reset', action='store_true', help='empty all tables first')
+    parser.add_argument('--fixture', help='write a JSON fixture to this path instead of inserting')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = date.fromisoformat(args.start_date)
+    span_days = max(1, args.months * 30)
+
+    def random_day():
+        return start + timedelta(days=rng.randrange(span_days))
+
+    fixture = FixtureWriter() if args.fixture else None
+    if fixture is None:
+        connection = mysql.connector.connect(**DB_CONFIG)
+        cursor = connection.cursor()
+    started = time.perf_counter()
+    counts = {}
+
+    def write(sql, rows):
+        if fixture is not None:
+            fixture.add(sql, rows)
+        else:
+            insert_chunks(cursor, connection, sql, rows, args.chunk_size)
+
+    if args.reset and fixture is None:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in TABLES:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        connection.commit()
+
+    write("INSERT IGNORE INTO mess (m_no, m_name, monthly_fee) VALUES (%s, %s, %s)", MESSES)
+    write("INSERT IGNORE INTO laundry (l_no, days_of_laundry, rate_per_day) VALUES (%s, %s, %s)", LAUNDRY)
+
+    # Wardens
+    n_wardens = args.wardens or max(3, args.students // 200)
+    wardens = [(f"BW{i:05d}", f"Warden {i}", f"70{i:08d}") for i in range(n_wardens)]
+    write("INSERT INTO warden (w_id, name, p_no) VALUES (%s, %s, %s)", wardens)
+    counts['warden'] = len(wardens)
+
+    # Rooms: floors of 50 rooms, capacity 2-4
+    n_rooms = args.rooms or max(1, int(args.students * args.allocated / 3) + 1)
+    rooms = []
+    for i in range(n_rooms):
+        floor, number = divmod(i, 50)
+        rooms.append([f"B{floor + 1:03d}{number:02d}", 0, rng.choice([2, 3, 3, 4])])
+
+    # Students (+ guardians); every 10th student leads the next few
+    students, guardians = [], []
+    leader = None
+    for i in range(args.students):
+        s_id = f"BENCH{i:07d}"
+        if i % 10 == 0:
+            leader = s_id
+        students.append((s_id, rng.choice(FIRST_NAMES), rng.choice(MIDDLE_NAMES), rng.choice(LAST_NAMES),
+                         f"9{i:09d}", leader if i % 10 and i % 10 < 4 else None))
+        guardians.append((s_id, f"Guardian of {s_id}", f"8{i:09d}"))
+    write("""
+        INSERT INTO student (s_id, f_name, m_name, l_name, p_no, leader_id) VALUES (%s, %s, %s, %s, %s, %s)
+    """, students)
+    write("INSERT INTO local_guardian (s_id, name, p_no) VALUES (%s, %s, %s)", guardians)
+    counts['student'] = len(students)
+    counts['local_guardian'] = len(guardians)
+
+    # Room allocations with their fee rows; occupancy is written once per room
+    fees, allocations = [], []
+    room_cursor = 0
+    for i, student in enumerate(students):
+        if rng.random() >= args.allocated:
+            continue
+        while room_cursor < len(rooms) and rooms[room_cursor][1] >= rooms[room_cursor][2]:
+            room_cursor += 1
+        if room_cursor >= len(rooms):
+            break
+        paid_on = random_day()
+        p_id = f"BF{i:09d}"
+        fees.append((p_id, paid_on, rng.choice(PAYMENT_METHODS), rng.choice([75000.00, 80000.00])))
+        allocations.append((student[0], rooms[room_cursor][0], p_id, paid_on))
+        rooms[room_cursor][1] += 1
+    write("""
+        INSERT INTO room (r_no, no_of_people, max_capacity) VALUES (%s, %s, %s)
+    """, [tuple(room) for room in rooms])
+    write("""
+        INSERT INTO fees (p_id, p_date, p_method, amount) VALUES (%s, %s, %s, %s)
+    """, fees)
+    # occupancy is already in the room rows; keep the trigger from adding it again
+    if fixture is None:
+        cursor.execute("SET @hm_bulk_allocation = 1")
+    write("""
+        INSERT INTO student_room_fees (s_id, r_no, p_id, allotment_date) VALUES (%s, %s, %s, %s)
+    """, allocations)
+    if fixture is None:
+        cursor.execute("SET @hm_bulk_allocation = NULL")
+    counts['room'] = len(rooms)
+    counts['student_room_fees'] = len(allocations)
+
+    # Mess bookings (trigger adds a fee row and ledger entry per booking)
+    bookings = [(s[0], rng.choice(MESSES)[0], random_day()) for s in students if rng.random() < args.mess_share]
+    write("""
+        INSERT INTO books_mess (s_id, m_no, booking_date) VALUES (%s, %s, %s)
+    """, bookings)
+    counts['books_mess'] = len(bookings)
+
+    # Laundry submissions (trigger adds a fee row and ledger entry per submission)
+    submissions = set()
+    target = min(int(args.students * args.laundry_per_student), args.students * len(LAUNDRY) * span_days // 2)
+    while len(submissions) < target:
+        submissions.add((rng.choice(students)[0], rng.choice(LAUNDRY)[0], random_day()))
+    write("""
+        INSERT INTO gives_laundry (s_id, l_no, submission_date) VALUES (%s, %s, %s)
+    """, sorted(submissions))
+    counts['gives_laundry'] = len(submissions)
+
+    # Warden assignments
+    assignments = [(rng.choice(wardens)[0], s[0], start) for s in students]
+    write("""
+        INSERT INTO monitors (w_id, s_id, assigned_date) VALUES (%s, %s, %s)
+    """, assignments)
+    counts['monitors'] = len(assignments)
+
+    if fixture is not None:
+        fixture.save(args.fixture)
+    else:
+        cursor.execute("SELECT COUNT(*) FROM fees")
+        counts['fees'] = cursor.fetchone()[0]
+        cursor.close()
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table:<18} {count:>10}")
+    print(f"generated in {elapsed:.1f}s (seed {args.seed})" + (f" -> {args.fixture}" if fixture else ''))
+
+
+if __name__ == '__main__':
+    main()
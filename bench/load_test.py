@@ -0,0 +1,260 @@
+"""
+Load-test driver: replays a weighted mix of the API routes at a fixed concurrency
+and reports throughput and p50/p95/p99 latency per route.
+
+    python app.py &                                   # or gunicorn / the ASGI mode
+    python bench/load_test.py --concurrency 32 --duration 60 --out results/$(git rev-parse --short HEAD).json
+
+Results are JSON (one object per run) so runs from different commits can be diffed:
+
+    python bench/load_test.py --compare results/abc123.json results/def456.json
+
+Concurrency scaling (e.g. Flask threads vs the ASGI mode in asgi.py):
+
+    python bench/load_test.py --sweep 1,8,32,128 --mix '{"GET /api/dashboard/stats": 1, "GET /api/fees": 1}'
+
+Write routes really write: point the app at a scratch database filled by
+bench/generate_data.py.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# route -> weight; reads dominate, as on the real pages
+DEFAULT_MIX = {
+    'GET /api/students': 10,
+    'GET /api/students?limit=100': 15,
+    'GET /api/fees': 5,
+    'GET /api/rooms': 20,
+    'GET /api/dashboard/stats': 20,
+    'POST /api/rooms/allocate': 5,
+    'POST /api/mess/book': 10,
+    'POST /api/laundry/submit': 15,
+}
+
+
+class Workload:
+    """Keeps the ids the write routes need so they mostly succeed"""
+
+    def __init__(self, base_url, seed):
+        self.base_url = base_url.rstrip('/')
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.students, self.unallocated, self.rooms = [], [], []
+        self.messes, self.laundry = [], []
+        self.laundry_used = set()
+
+    def get_json(self, path):
+        with urllib.request.urlopen(self.base_url + path, timeout=30) as response:
+            return json.loads(response.read())
+
+    def prepare(self, sample_size):
+        after, students = '', []
+        while len(students) < sample_size:
+            page = self.get_json(f'/api/students?limit=500&after={after}')
+            students.extend(page['students'])
+            if not page['next_cursor']:
+                break
+            after = page['next_cursor']
+        self.rng.shuffle(students)
+        self.students = [s['s_id'] for s in students]
+        self.unallocated = [s['s_id'] for s in students if not s.get('r_no')]
+        self.rooms = [r['r_no'] for r in self.get_json('/api/rooms')]
+        self.messes = [m['m_no'] for m in self.get_json('/api/mess')]
+        self.laundry = [l['l_no'] for l in self.get_json('/api/laundry')]
+
+    def body_for(self, route):
+        with self.lock:
+            if route == 'POST /api/rooms/allocate':
+                if not self.unallocated or not self.rooms:
+                    return None
+                return {'s_id': self.unallocated.pop(), 'r_no': self.rng.choice(self.rooms),
+                        'p_method': 'UPI', 'amount': 75000}
+            if route == 'POST /api/mess/book':
+                return {'s_id': self.rng.choice(self.students), 'm_no': self.rng.choice(self.messes)}
+            if route == 'POST /api/laundry/submit':
+                # (s_id, l_no, date) is a primary key: one submission per pair per day
+                for _ in range(20):
+                    pair = (self.rng.choice(self.students), self.rng.choice(self.laundry))
+                    if pair not in self.laundry_used:
+                        self.laundry_used.add(pair)
+                        return {'s_id': pair[0], 'l_no': pair[1]}
+                return None
+        return {}
+
+    def call(self, route):
+        method, path = route.split(' ', 1)
+        data, headers = None, {}
+        if method == 'POST':
+            body = self.body_for(route)
+            if body is None:
+                return None
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            status = 0
+        return status, time.perf_counter() - started
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency for _, latency in samples)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None  # noqa: E731
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for status, _ in samples if not 200 <= status < 300),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+        'mean_ms': ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50_ms': ms(percentile(latencies, 50)),
+        'p95_ms': ms(percentile(latencies, 95)),
+        'p99_ms': ms(percentile(latencies, 99)),
+        'max_ms': ms(latencies[-1]) if latencies else None,
+    }
+
+
+def run(workload, mix, concurrency, duration, warmup, seed):
+    routes, weights = list(mix), list(mix.values())
+    samples = {route: [] for route in routes}
+    lock = threading.Lock()
+    measure_from = time.perf_counter() + warmup
+    stop_at = measure_from + duration
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        local = {route: [] for route in routes}
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            route = rng.choices(routes, weights)[0]
+            result = workload.call(route)
+            if result is not None and now >= measure_from:
+                local[route].append(result)
+        with lock:
+            for route, values in local.items():
+                samples[route].extend(values)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_samples = [sample for values in samples.values() for sample in values]
+    return {
+        'routes': {route: summarize(values, duration) for route, values in samples.items() if values},
+        'total': summarize(all_samples, duration),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    print(f"{'route':<32} {'req':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(results['routes'].items()) + [('TOTAL', results['total'])]
+    for route, r in rows:
+        print(f"{route:<32} {r['requests']:>7} {r['errors']:>5} {r['throughput_rps']:>9} "
+              f"{r['p50_ms']!s:>9} {r['p95_ms']!s:>9} {r['p99_ms']!s:>9}")
+
+
+def print_sweep(sweep):
+    print(f"{'concurrency':>11} {'req':>8} {'err':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for level in sweep:
+        r = level['total']
+        print(f"{level['concurrency']:>11} {r['requests']:>8} {r['errors']:>6} {r['throughput_rps']:>9} "
+              f"{r['p50_ms']!s:>9} {r['p95_ms']!s:>9} {r['p99_ms']!s:>9}")
+
+
+def compare(paths):
+    runs = []
+    for path in paths:
+        with open(path) as f:
+            runs.append(json.load(f))
+    routes = sorted({route for run_ in runs for route in run_['routes']} | {'TOTAL'})
+    print(f"{'route':<32} " + ' '.join(f"{(r.get('commit') or os.path.basename(p))[:18]:>20}"
+                                       for r, p in zip(runs, paths)))
+    for route in routes:
+        cells = []
+        for run_ in runs:
+            r = run_['total'] if route == 'TOTAL' else run_['routes'].get(route)
+            cells.append(f"{r['throughput_rps']:>8}rps {r['p95_ms']!s:>7}ms" if r else f"{'-':>20}")
+        print(f"{route:<32} " + ' '.join(f"{cell:>20}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--sweep', help='comma-separated concurrency levels to run one after another')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='seconds before measuring starts')
+    parser.add_argument('--mix', help='JSON object of route -> weight (default: %s)' % json.dumps(DEFAULT_MIX))
+    parser.add_argument('--sample-students', type=int, default=5000, help='student ids to draw write targets from')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help='write results JSON to this file')
+    parser.add_argument('--compare', nargs='+', metavar='RESULT', help='print earlier result files side by side')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    workload = Workload(args.base_url, args.seed)
+    try:
+        workload.prepare(args.sample_students)
+    except (urllib.error.URLError, OSError, KeyError) as e:
+        sys.exit(f"Could not prepare workload from {args.base_url}: {e}")
+
+    if args.sweep:
+        levels = [int(level) for level in args.sweep.split(',')]
+        results = {'sweep': [dict(run(workload, mix, level, args.duration, args.warmup, args.seed),
+                                  concurrency=level) for level in levels]}
+    else:
+        results = run(workload, mix, args.concurrency, args.duration, args.warmup, args.seed)
+    results.update({
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'base_url': args.base_url, 'concurrency': args.sweep or args.concurrency, 'duration': args.duration,
+                   'warmup': args.warmup, 'seed': args.seed, 'mix': mix},
+    })
+    if args.sweep:
+        print_sweep(results['sweep'])
+    else:
+        print_results(results)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
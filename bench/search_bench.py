@@ -0,0 +1,75 @@
+"""
+Typeahead latency of the in-process student search index (StudentSearchIndex
+in app.py) - index lookup only, no database. Builds the index from synthetic
+students and replays random id, name and phone prefixes of 1-6 characters.
+
+    python bench/search_bench.py --students 100000 --queries 20000
+
+The /api/students/search endpoint adds one primary-key IN query for the
+room/mess details of the returned students.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import StudentSearchIndex  # noqa: E402
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_data import FIRST_NAMES, MIDDLE_NAMES, LAST_NAMES  # noqa: E402
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = [(f"BENCH{i:07d}", rng.choice(FIRST_NAMES), rng.choice(MIDDLE_NAMES), rng.choice(LAST_NAMES),
+             f"9{i:09d}") for i in range(args.students)]
+
+    index = StudentSearchIndex(reconcile_interval=0)
+    started = time.perf_counter()
+    index.build(rows)
+    print(f"built index over {args.students} students in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def random_query():
+        s_id, f_name, _, l_name, p_no = rng.choice(rows)
+        kind = rng.random()
+        if kind < 0.15:
+            source = f"{f_name} {l_name}"[:rng.randint(3, 9)]     # two words
+        elif kind < 0.5:
+            source = rng.choice([f_name, l_name])
+        elif kind < 0.8:
+            source = s_id
+        else:
+            source = p_no
+        return source[:rng.randint(1, 6)] if ' ' not in source else source
+
+    queries = [random_query() for _ in range(args.queries)]
+    timings = []
+    for q in queries:
+        started = time.perf_counter()
+        index.search(q, args.limit)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"{len(queries)} queries, limit {args.limit}: p50 {percentile(timings, 50):.3f} ms  "
+          f"p95 {percentile(timings, 95):.3f} ms  p99 {percentile(timings, 99):.3f} ms  "
+          f"max {timings[-1]:.3f} ms")
+
+    started = time.perf_counter()
+    for i in range(1000):
+        index._add(f"NEW{i:07d}", 'Typeahead', None, 'Student', f"7{i:09d}")
+    print(f"1000 incremental inserts: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+CPU cost of encoding a large list response: jsonify() on dictionary rows versus
+the tuple-row fast path (RowEncoder + dumps_fast) used by /api/fees,
+/api/laundry/submissions and /api/students. No database needed - rows are
+synthesized in the shape of FEES_LIST_SQL.
+
+    python bench/serialize_bench.py --rows 100000
+    JSON_ENCODER=json python bench/serialize_bench.py      # without orjson
+
+The fast record output is checked against jsonify() before timing.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from mysql.connector.constants import FieldType
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import app, RowEncoder, dumps_fast, JSON_ENCODER  # noqa: E402
+
+# (name, type_code) as in cursor.description for FEES_LIST_SQL
+DESCRIPTION = [
+    ('p_id', FieldType.VAR_STRING), ('p_date', FieldType.DATE), ('p_method', FieldType.VAR_STRING),
+    ('amount', FieldType.NEWDECIMAL), ('s_id', FieldType.VAR_STRING), ('student_name', FieldType.VAR_STRING),
+]
+
+
+def synthetic_rows(count, seed):
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    return [
+        (f"F{i:018d}", start + timedelta(days=rng.randrange(365)), rng.choice(['Cash', 'UPI', 'Card']),
+         Decimal(rng.choice(['75000.00', '4500.00', '150.00'])), f"S{i:07d}" if i % 7 else None,
+         f"Student {i}" if i % 7 else None)
+        for i in range(count)
+    ]
+
+
+def best_of(runs, fn):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.seed)
+    names = [name for name, _ in DESCRIPTION]
+    encoder = RowEncoder([(name, type_code) + (None,) * 5 for name, type_code in DESCRIPTION])
+
+    with app.app_context():
+        def baseline():
+            dict_rows = [dict(zip(names, row)) for row in rows]
+            return app.json.dumps(dict_rows)
+
+        def fast():
+            return dumps_fast(encoder.records(rows))
+
+        def columns():
+            return dumps_fast({'columns': encoder.columns, 'rows': encoder.rows(rows)})
+
+        if json.loads(baseline()) != json.loads(fast()):
+            sys.exit("fast path output differs from jsonify()")
+
+        results = {
+            'jsonify (dict rows)': best_of(args.runs, baseline),
+            f'fast records ({JSON_ENCODER})': best_of(args.runs, fast),
+            f'fast columns ({JSON_ENCODER})': best_of(args.runs, columns),
+        }
+    base = results['jsonify (dict rows)']
+    for name, ms in results.items():
+        print(f"{name:<28} {ms:>9.1f} ms   x{base / ms:.2f}")
+
+
+if __name__ == '__main__':
+    main()
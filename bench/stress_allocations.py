@@ -0,0 +1,156 @@
+"""
+Concurrency stress test for room occupancy: many clients allocate, transfer and
+deallocate students across a handful of small rooms at the same time, then every
+room is checked for overbooking and for drift between room.no_of_people and the
+actual allocations.
+
+    python app.py &
+    python bench/stress_allocations.py --clients 32 --rooms 4 --capacity 3 --duration 30
+
+The STRESS* rooms and students are created through DB_CONFIG before the run and
+removed afterwards (--keep leaves them in place). Expected outcome: 0 overbooked
+or drifted rooms, 0 5xx responses; 409s are the normal "room full" /
+"already allocated" answers under contention.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+import mysql.connector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app import DB_CONFIG  # noqa: E402
+
+
+def setup(connection, rooms, capacity, students):
+    cursor = connection.cursor()
+    cursor.executemany("INSERT INTO room (r_no, no_of_people, max_capacity) VALUES (%s, 0, %s)",
+                       [(r_no, capacity) for r_no in rooms])
+    cursor.executemany("INSERT INTO student (s_id, f_name, l_name, p_no) VALUES (%s, 'Stress', %s, %s)",
+                       [(s_id, s_id, f"6{i:09d}") for i, s_id in enumerate(students)])
+    connection.commit()
+    cursor.close()
+
+
+def cleanup(connection, rooms, students):
+    cursor = connection.cursor()
+    placeholders = ', '.join(['%s'] * len(students))
+    cursor.execute(f"SELECT p_id FROM student_room_fees WHERE s_id IN ({placeholders})", students)
+    fee_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f"DELETE FROM student_room_fees WHERE s_id IN ({placeholders})", students)
+    if fee_ids:
+        cursor.execute(f"DELETE FROM fees WHERE p_id IN ({', '.join(['%s'] * len(fee_ids))})", fee_ids)
+    cursor.execute(f"DELETE FROM student_ledger WHERE s_id IN ({placeholders})", students)
+    cursor.execute(f"DELETE FROM student WHERE s_id IN ({placeholders})", students)
+    cursor.execute(f"DELETE FROM room WHERE r_no IN ({', '.join(['%s'] * len(rooms))})", rooms)
+    connection.commit()
+    cursor.close()
+
+
+def check_rooms(connection, rooms):
+    """(r_no, no_of_people, max_capacity, allocated) for every room that is overbooked or drifted"""
+    cursor = connection.cursor()
+    cursor.execute(f"""
+        SELECT r.r_no, r.no_of_people, r.max_capacity, COUNT(srf.s_id)
+        FROM room r LEFT JOIN student_room_fees srf ON srf.r_no = r.r_no
+        WHERE r.r_no IN ({', '.join(['%s'] * len(rooms))})
+        GROUP BY r.r_no, r.no_of_people, r.max_capacity
+    """, rooms)
+    bad = [row for row in cursor.fetchall() if row[1] > row[2] or row[1] != row[3]]
+    cursor.close()
+    return bad
+
+
+def post(base_url, path, body):
+    request = urllib.request.Request(base_url + path, data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def run(base_url, rooms, students, clients, duration, seed):
+    results = Counter()
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        local = Counter()
+        while time.perf_counter() < stop_at:
+            s_id, r_no = rng.choice(students), rng.choice(rooms)
+            action = rng.choices(['allocate', 'transfer', 'deallocate'], [4, 4, 2])[0]
+            if action == 'allocate':
+                status = post(base_url, '/api/rooms/allocate',
+                              {'s_id': s_id, 'r_no': r_no, 'p_method': 'UPI', 'amount': 75000})
+            elif action == 'transfer':
+                status = post(base_url, '/api/rooms/transfer', {'s_id': s_id, 'new_r_no': r_no})
+            else:
+                status = post(base_url, '/api/rooms/deallocate', {'s_id': s_id, 'r_no': r_no})
+            local[(action, status // 100 * 100 if status != 409 else 409)] += 1
+        with lock:
+            results.update(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--rooms', type=int, default=4)
+    parser.add_argument('--capacity', type=int, default=3)
+    parser.add_argument('--students', type=int, help='default: twice the total capacity')
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help='leave the STRESS rows in the database')
+    args = parser.parse_args()
+
+    rooms = [f"STR{i:03d}" for i in range(args.rooms)]
+    students = [f"STRESS{i:05d}" for i in range(args.students or args.rooms * args.capacity * 2)]
+    connection = mysql.connector.connect(**DB_CONFIG)
+    setup(connection, rooms, args.capacity, students)
+    try:
+        started = time.perf_counter()
+        results = run(args.base_url.rstrip('/'), rooms, students, args.clients, args.duration, args.seed)
+        elapsed = time.perf_counter() - started
+        connection.commit()   # fresh snapshot for the check
+        bad = check_rooms(connection, rooms)
+    finally:
+        if not args.keep:
+            cleanup(connection, rooms, students)
+        connection.close()
+
+    total = sum(results.values())
+    print(f"{'action':<12} {'2xx':>7} {'409':>7} {'4xx':>7} {'5xx':>7} {'failed':>7}")
+    for action in ('allocate', 'transfer', 'deallocate'):
+        counts = [results[(action, status)] for status in (200, 409, 400, 500, 0)]
+        print(f"{action:<12} " + ' '.join(f"{count:>7}" for count in counts))
+    print(f"{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, "
+          f"{sum(v for (_, status), v in results.items() if status == 200) / elapsed:.1f} successful writes/s")
+    for r_no, occupied, capacity, allocated in bad:
+        print(f"room {r_no}: no_of_people={occupied} max_capacity={capacity} allocations={allocated}")
+    print(f"{len(bad)} overbooked or drifted rooms")
+    sys.exit(1 if bad or any(status in (500, 0) for _, status in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+-- ============================================================================
+-- 001 - student_ledger: per student, per month running totals
+-- Upgrades a database created from an older schema.sql. Idempotent.
+--   mysql -u root -p hostel_management < migrations/001_student_ledger.sql
+-- ============================================================================
+USE hostel_management;
+
+-- Student ledger (per student, per month running totals)
+-- Maintained incrementally by the allocation, laundry and mess triggers so
+-- student_total_paid() and monthly charges are key lookups instead of scans.
+-- Rebuild / verify against the raw tables with: flask --app app rebuild-ledger
+CREATE TABLE IF NOT EXISTS student_ledger (
+    s_id VARCHAR(20),
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    mess_fee DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    laundry_charges DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    total_paid DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (s_id, period_year, period_month),
+    FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE
+);
+
+DROP TRIGGER IF EXISTS trg_alloc_after_insert;
+DROP TRIGGER IF EXISTS trg_alloc_after_update;
+DROP TRIGGER IF EXISTS trg_alloc_after_delete;
+DROP TRIGGER IF EXISTS trg_laundry_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_update;
+DROP FUNCTION IF EXISTS student_total_paid;
+DROP PROCEDURE IF EXISTS sp_calculate_student_monthly_charges;
+
+DELIMITER $$
+
+-- TRIGGER: after allocation: increment occupancy & enforce capacity, book the payment in the ledger
+CREATE TRIGGER trg_alloc_after_insert
+AFTER INSERT ON student_room_fees
+FOR EACH ROW
+BEGIN
+    UPDATE room
+    SET no_of_people = no_of_people + 1
+    WHERE r_no = NEW.r_no;
+
+    IF (SELECT no_of_people FROM room WHERE r_no = NEW.r_no) >
+       (SELECT max_capacity FROM room WHERE r_no = NEW.r_no) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room capacity exceeded';
+    END IF;
+
+    INSERT INTO student_ledger (s_id, period_year, period_month, total_paid)
+    SELECT NEW.s_id, YEAR(f.p_date), MONTH(f.p_date), f.amount
+    FROM fees f WHERE f.p_id = NEW.p_id
+    ON DUPLICATE KEY UPDATE total_paid = total_paid + VALUES(total_paid);
+END$$
+
+-- TRIGGER: allocation re-pointed to another fee record: move the payment in the ledger
+CREATE TRIGGER trg_alloc_after_update
+AFTER UPDATE ON student_room_fees
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.p_id <=> NEW.p_id) OR OLD.s_id <> NEW.s_id THEN
+        UPDATE student_ledger l
+        JOIN fees f ON f.p_id = OLD.p_id
+        SET l.total_paid = l.total_paid - f.amount
+        WHERE l.s_id = OLD.s_id
+          AND l.period_year = YEAR(f.p_date)
+          AND l.period_month = MONTH(f.p_date);
+
+        INSERT INTO student_ledger (s_id, period_year, period_month, total_paid)
+        SELECT NEW.s_id, YEAR(f.p_date), MONTH(f.p_date), f.amount
+        FROM fees f WHERE f.p_id = NEW.p_id
+        ON DUPLICATE KEY UPDATE total_paid = total_paid + VALUES(total_paid);
+    END IF;
+END$$
+
+-- TRIGGER: after delete allocation: decrement occupancy safely, reverse the ledger payment
+CREATE TRIGGER trg_alloc_after_delete
+AFTER DELETE ON student_room_fees
+FOR EACH ROW
+BEGIN
+    UPDATE room
+    SET no_of_people = GREATEST(no_of_people - 1, 0)
+    WHERE r_no = OLD.r_no;
+
+    UPDATE student_ledger l
+    JOIN fees f ON f.p_id = OLD.p_id
+    SET l.total_paid = l.total_paid - f.amount
+    WHERE l.s_id = OLD.s_id
+      AND l.period_year = YEAR(f.p_date)
+      AND l.period_month = MONTH(f.p_date);
+END$$
+
+-- TRIGGER: after laundry submission → generate fees entry
+CREATE TRIGGER trg_laundry_after_insert
+AFTER INSERT ON gives_laundry
+FOR EACH ROW
+BEGIN
+    DECLARE laundry_rate DECIMAL(10,2);
+    DECLARE short_id VARCHAR(30);
+
+    -- fetch rate
+    SELECT rate_per_day INTO laundry_rate
+    FROM laundry
+    WHERE l_no = NEW.l_no;
+
+    -- short payment ID (fits VARCHAR(30))
+    SET short_id = CONCAT('LND-', SUBSTRING(UUID(), 1, 8));
+
+    -- insert revenue entry
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (short_id, NEW.submission_date, 'Cash', laundry_rate);
+
+    -- ledger: laundry charge for the submission month
+    INSERT INTO student_ledger (s_id, period_year, period_month, laundry_charges)
+    VALUES (NEW.s_id, YEAR(NEW.submission_date), MONTH(NEW.submission_date), IFNULL(laundry_rate, 0))
+    ON DUPLICATE KEY UPDATE laundry_charges = laundry_charges + VALUES(laundry_charges);
+END$$
+
+CREATE TRIGGER trg_mess_after_insert
+AFTER INSERT ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    -- get fee
+    SELECT monthly_fee INTO messfee
+    FROM mess
+    WHERE m_no = NEW.m_no;
+
+    -- generate fee id
+    SET fid = CONCAT('MSS-', SUBSTRING(UUID(), 1, 8));
+
+    -- insert fee
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (fid, CURDATE(), 'Cash', messfee);
+
+    -- ledger: mess fee for the booking month
+    INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+    VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+    ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+END$$
+
+CREATE TRIGGER trg_mess_after_update
+AFTER UPDATE ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    SELECT monthly_fee INTO messfee
+    FROM mess
+    WHERE m_no = NEW.m_no;
+
+    SET fid = CONCAT('MSS-', SUBSTRING(UUID(), 1, 8));
+
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (fid, CURDATE(), 'Cash', messfee);
+
+    -- ledger: move the mess fee from the old booking month to the new one
+    UPDATE student_ledger l
+    JOIN mess m ON m.m_no = OLD.m_no
+    SET l.mess_fee = l.mess_fee - m.monthly_fee
+    WHERE l.s_id = OLD.s_id
+      AND l.period_year = YEAR(OLD.booking_date)
+      AND l.period_month = MONTH(OLD.booking_date);
+
+    INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+    VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+    ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+END$$
+
+-- FUNCTION: student_total_paid(sid) - reads the maintained ledger
+CREATE FUNCTION student_total_paid(sid VARCHAR(30))
+RETURNS DECIMAL(20,2)
+READS SQL DATA
+BEGIN
+    DECLARE total DECIMAL(20,2) DEFAULT 0;
+    SELECT IFNULL(SUM(total_paid),0) INTO total
+    FROM student_ledger
+    WHERE s_id = sid;
+    RETURN total;
+END$$
+
+-- Calculate monthly charges for a student (mess + laundry), total paid, balance
+-- Single primary-key lookup on the maintained student_ledger
+CREATE PROCEDURE sp_calculate_student_monthly_charges(
+    IN p_student_id VARCHAR(20),
+    IN p_month INT,
+    IN p_year INT
+)
+BEGIN
+    DECLARE mess_fee DECIMAL(12,2) DEFAULT 0.00;
+    DECLARE laundry_charges DECIMAL(12,2) DEFAULT 0.00;
+    DECLARE total DECIMAL(12,2) DEFAULT 0.00;
+    DECLARE total_paid DECIMAL(12,2) DEFAULT 0.00;
+
+    SELECT IFNULL(SUM(l.mess_fee),0), IFNULL(SUM(l.laundry_charges),0), IFNULL(SUM(l.total_paid),0)
+    INTO mess_fee, laundry_charges, total_paid
+    FROM student_ledger l
+    WHERE l.s_id = p_student_id
+      AND l.period_year = p_year
+      AND l.period_month = p_month;
+
+    SET total = mess_fee + laundry_charges;
+
+    SELECT mess_fee AS mess_fee, laundry_charges AS laundry_charges, total AS total_charges,
+           total_paid AS total_paid, (total - total_paid) AS balance;
+END$$
+
+DELIMITER ;
+
+-- Backfill from the raw tables (same query as `flask --app app rebuild-ledger`)
+DELETE FROM student_ledger;
+INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee, laundry_charges, total_paid)
+SELECT s_id, period_year, period_month, SUM(mess_fee), SUM(laundry_charges), SUM(total_paid)
+FROM (
+    SELECT bm.s_id, YEAR(bm.booking_date) AS period_year, MONTH(bm.booking_date) AS period_month,
+           m.monthly_fee AS mess_fee, 0 AS laundry_charges, 0 AS total_paid
+    FROM books_mess bm JOIN mess m ON bm.m_no = m.m_no
+    UNION ALL
+    SELECT gl.s_id, YEAR(gl.submission_date), MONTH(gl.submission_date), 0, l.rate_per_day, 0
+    FROM gives_laundry gl JOIN laundry l ON gl.l_no = l.l_no
+    UNION ALL
+    SELECT srf.s_id, YEAR(f.p_date), MONTH(f.p_date), 0, 0, f.amount
+    FROM student_room_fees srf JOIN fees f ON srf.p_id = f.p_id
+) AS entries
+GROUP BY s_id, period_year, period_month;
@@ -0,0 +1,50 @@
+-- ============================================================================
+-- 002 - batch room allocation: let the allocation triggers stand aside while
+-- the app applies a pre-planned batch (session variable @hm_bulk_allocation = 1).
+-- Idempotent.
+--   mysql -u root -p hostel_management < migrations/002_bulk_allocation.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP TRIGGER IF EXISTS trg_alloc_before_insert;
+DROP TRIGGER IF EXISTS trg_alloc_after_insert;
+
+DELIMITER $$
+
+-- TRIGGER: prevent duplicate allocation for the same student
+-- (skipped for batch allocations: @hm_bulk_allocation = 1 is set by the app, which
+--  checks the batch up front; the primary key on s_id still rejects duplicates)
+CREATE TRIGGER trg_alloc_before_insert
+BEFORE INSERT ON student_room_fees
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_allocation IS NULL AND EXISTS (SELECT 1 FROM student_room_fees WHERE s_id = NEW.s_id) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Student already allocated to a room';
+    END IF;
+END$$
+
+-- TRIGGER: after allocation: increment occupancy & enforce capacity, book the payment in the ledger
+-- (batch allocations lock the rooms, check capacity in the app and apply one
+--  occupancy update per room, so the per-row room update is skipped for them)
+CREATE TRIGGER trg_alloc_after_insert
+AFTER INSERT ON student_room_fees
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_allocation IS NULL THEN
+        UPDATE room
+        SET no_of_people = no_of_people + 1
+        WHERE r_no = NEW.r_no;
+
+        IF (SELECT no_of_people FROM room WHERE r_no = NEW.r_no) >
+           (SELECT max_capacity FROM room WHERE r_no = NEW.r_no) THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room capacity exceeded';
+        END IF;
+    END IF;
+
+    INSERT INTO student_ledger (s_id, period_year, period_month, total_paid)
+    SELECT NEW.s_id, YEAR(f.p_date), MONTH(f.p_date), f.amount
+    FROM fees f WHERE f.p_id = NEW.p_id
+    ON DUPLICATE KEY UPDATE total_paid = total_paid + VALUES(total_paid);
+END$$
+
+DELIMITER ;
@@ -0,0 +1,23 @@
+-- ============================================================================
+-- 003 - room_available_slots(): read capacity and occupancy in one SELECT
+-- Idempotent.
+--   mysql -u root -p hostel_management < migrations/003_room_available_slots.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP FUNCTION IF EXISTS room_available_slots;
+
+DELIMITER $$
+
+-- FUNCTION: room_available_slots(r)
+CREATE FUNCTION room_available_slots(r VARCHAR(10))
+RETURNS INT
+DETERMINISTIC
+BEGIN
+    DECLARE cap INT DEFAULT 0;
+    DECLARE occ INT DEFAULT 0;
+    SELECT IFNULL(max_capacity,0), IFNULL(no_of_people,0) INTO cap, occ FROM room WHERE r_no = r LIMIT 1;
+    RETURN GREATEST(cap - occ, 0);
+END$$
+
+DELIMITER ;
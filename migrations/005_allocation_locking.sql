@@ -0,0 +1,78 @@
+-- ============================================================================
+-- 005 - contention-safe occupancy updates: the allocation trigger checks and
+-- increments room.no_of_people in one conditional UPDATE, and the transfer
+-- procedure locks the student's allocation and both rooms (in r_no order)
+-- before moving anyone. Idempotent.
+--   mysql -u root -p hostel_management < migrations/005_allocation_locking.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP TRIGGER IF EXISTS trg_alloc_after_insert;
+DROP PROCEDURE IF EXISTS sp_transfer_student_room;
+
+DELIMITER $$
+
+-- TRIGGER: after allocation: increment occupancy & enforce capacity, book the payment in the ledger
+-- (batch allocations lock the rooms, check capacity in the app and apply one
+--  occupancy update per room, so the per-row room update is skipped for them)
+CREATE TRIGGER trg_alloc_after_insert
+AFTER INSERT ON student_room_fees
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_allocation IS NULL THEN
+        -- check and increment in one statement: no re-read of the row another
+        -- allocation may be updating at the same time
+        UPDATE room
+        SET no_of_people = no_of_people + 1
+        WHERE r_no = NEW.r_no AND no_of_people < max_capacity;
+
+        IF ROW_COUNT() = 0 THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room capacity exceeded';
+        END IF;
+    END IF;
+
+    INSERT INTO student_ledger (s_id, period_year, period_month, total_paid)
+    SELECT NEW.s_id, YEAR(f.p_date), MONTH(f.p_date), f.amount
+    FROM fees f WHERE f.p_id = NEW.p_id
+    ON DUPLICATE KEY UPDATE total_paid = total_paid + VALUES(total_paid);
+END$$
+
+-- 1) Transfer student between rooms
+CREATE PROCEDURE sp_transfer_student_room(
+    IN p_student_id VARCHAR(20),
+    IN p_new_room_no VARCHAR(10)
+)
+BEGIN
+    DECLARE old_room VARCHAR(10);
+    DECLARE locked_rooms INT DEFAULT 0;
+
+    SELECT r_no INTO old_room FROM student_room_fees WHERE s_id = p_student_id LIMIT 1 FOR UPDATE;
+
+    IF old_room IS NULL THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Student does not have a current room allocation';
+    END IF;
+
+    IF old_room = p_new_room_no THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Student is already in this room';
+    END IF;
+
+    -- lock both rooms (a primary key scan, so in r_no order): transfers A->B and B->A cannot deadlock
+    SELECT COUNT(*) INTO locked_rooms FROM room WHERE r_no IN (old_room, p_new_room_no) FOR UPDATE;
+
+    -- capacity check and increment in one statement
+    UPDATE room SET no_of_people = no_of_people + 1
+    WHERE r_no = p_new_room_no AND no_of_people < max_capacity;
+
+    IF ROW_COUNT() = 0 THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Target room is full';
+    END IF;
+
+    -- Update allocation
+    UPDATE student_room_fees
+    SET r_no = p_new_room_no, allotment_date = CURDATE()
+    WHERE s_id = p_student_id;
+
+    UPDATE room SET no_of_people = GREATEST(no_of_people - 1, 0) WHERE r_no = old_room;
+END$$
+
+DELIMITER ;
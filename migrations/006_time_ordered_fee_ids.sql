@@ -0,0 +1,110 @@
+-- ============================================================================
+-- 006 - time-ordered fee ids: next_fee_id(prefix) replaces the random
+-- CONCAT(prefix, SUBSTRING(UUID(), 1, 8)) ids in the laundry and mess fee
+-- triggers. Existing fee ids are kept. Idempotent.
+--   mysql -u root -p hostel_management < migrations/006_time_ordered_fee_ids.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP TRIGGER IF EXISTS trg_laundry_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_update;
+DROP FUNCTION IF EXISTS next_fee_id;
+
+DELIMITER $$
+
+-- FUNCTION: next_fee_id(prefix) - time-ordered fee id (same layout as new_fee_id() in app.py):
+-- prefix + 10 chars of epoch milliseconds + 13 chars of UUID_SHORT() + 3 random chars,
+-- all base32hex (CONV(n, 10, 32)), so new fees land at the end of the primary key
+CREATE FUNCTION next_fee_id(p_prefix VARCHAR(4))
+RETURNS VARCHAR(30)
+NOT DETERMINISTIC
+NO SQL
+BEGIN
+    RETURN CONCAT(p_prefix,
+                  LPAD(CONV(CAST(UNIX_TIMESTAMP(NOW(3)) * 1000 AS UNSIGNED), 10, 32), 10, '0'),
+                  LPAD(CONV(UUID_SHORT(), 10, 32), 13, '0'),
+                  LPAD(CONV(FLOOR(RAND() * 32768), 10, 32), 3, '0'));
+END$$
+
+-- TRIGGER: after laundry submission → generate fees entry
+CREATE TRIGGER trg_laundry_after_insert
+AFTER INSERT ON gives_laundry
+FOR EACH ROW
+BEGIN
+    DECLARE laundry_rate DECIMAL(10,2);
+    DECLARE short_id VARCHAR(30);
+
+    -- fetch rate
+    SELECT rate_per_day INTO laundry_rate
+    FROM laundry
+    WHERE l_no = NEW.l_no;
+
+    -- time-ordered payment ID (fits VARCHAR(30))
+    SET short_id = next_fee_id('LND-');
+
+    -- insert revenue entry
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (short_id, NEW.submission_date, 'Cash', laundry_rate);
+
+    -- ledger: laundry charge for the submission month
+    INSERT INTO student_ledger (s_id, period_year, period_month, laundry_charges)
+    VALUES (NEW.s_id, YEAR(NEW.submission_date), MONTH(NEW.submission_date), IFNULL(laundry_rate, 0))
+    ON DUPLICATE KEY UPDATE laundry_charges = laundry_charges + VALUES(laundry_charges);
+END$$
+
+CREATE TRIGGER trg_mess_after_insert
+AFTER INSERT ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    -- get fee
+    SELECT monthly_fee INTO messfee
+    FROM mess
+    WHERE m_no = NEW.m_no;
+
+    -- generate fee id
+    SET fid = next_fee_id('MSS-');
+
+    -- insert fee
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (fid, CURDATE(), 'Cash', messfee);
+
+    -- ledger: mess fee for the booking month
+    INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+    VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+    ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+END$$
+
+CREATE TRIGGER trg_mess_after_update
+AFTER UPDATE ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    SELECT monthly_fee INTO messfee
+    FROM mess
+    WHERE m_no = NEW.m_no;
+
+    SET fid = next_fee_id('MSS-');
+
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (fid, CURDATE(), 'Cash', messfee);
+
+    -- ledger: move the mess fee from the old booking month to the new one
+    UPDATE student_ledger l
+    JOIN mess m ON m.m_no = OLD.m_no
+    SET l.mess_fee = l.mess_fee - m.monthly_fee
+    WHERE l.s_id = OLD.s_id
+      AND l.period_year = YEAR(OLD.booking_date)
+      AND l.period_month = MONTH(OLD.booking_date);
+
+    INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+    VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+    ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+END$$
+
+DELIMITER ;
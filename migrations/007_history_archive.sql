@@ -0,0 +1,58 @@
+-- ============================================================================
+-- 007 - history archive tier for fees and gives_laundry. Both tables take
+-- part in foreign keys, so they cannot be range-partitioned; closed periods
+-- are moved here by `flask --app app archive-history` instead, and the report
+-- adds the archived per-month totals. Idempotent.
+--   mysql -u root -p hostel_management < migrations/007_history_archive.sql
+-- ============================================================================
+USE hostel_management;
+
+CREATE TABLE IF NOT EXISTS fees_archive (
+    p_id VARCHAR(30) PRIMARY KEY,
+    p_date DATE NOT NULL,
+    p_method VARCHAR(20) NOT NULL,
+    amount DECIMAL(10,2) NOT NULL,
+    INDEX idx_fees_archive_p_date (p_date, amount, p_method)
+);
+
+CREATE TABLE IF NOT EXISTS gives_laundry_archive (
+    s_id VARCHAR(20),
+    l_no VARCHAR(20),
+    submission_date DATE NOT NULL,
+    PRIMARY KEY (s_id, l_no, submission_date),
+    FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE,
+    FOREIGN KEY (l_no) REFERENCES laundry(l_no) ON DELETE CASCADE,
+    INDEX idx_gla_submission_date (submission_date),
+    INDEX idx_gla_student_date (s_id, submission_date)
+);
+
+-- Per-month totals of the archived fees (revenue without re-reading history)
+CREATE TABLE IF NOT EXISTS fees_period_totals (
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    p_method VARCHAR(20) NOT NULL,
+    fee_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (period_year, period_month, p_method)
+);
+
+DROP PROCEDURE IF EXISTS sp_generate_hostel_report;
+
+DELIMITER $$
+
+-- 8) Generate a simple hostel report
+--    (revenue = hot fees + the per-month totals of archived fees)
+CREATE PROCEDURE sp_generate_hostel_report()
+BEGIN
+    -- Room statistics
+    SELECT 'total_rooms' AS metric, COUNT(*) AS value FROM room
+    UNION ALL
+    SELECT 'total_occupancy', IFNULL(SUM(no_of_people),0) FROM room
+    UNION ALL
+    SELECT 'total_students', COUNT(*) FROM student
+    UNION ALL
+    SELECT 'total_revenue', IFNULL(SUM(amount),0) + (SELECT IFNULL(SUM(total_amount),0) FROM fees_period_totals)
+    FROM fees;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,92 @@
+-- ============================================================================
+-- 008 - maintained per-warden student counts: warden.student_count is kept by
+-- triggers on monitors (and a student delete, whose cascade skips them), so
+-- /api/wardens reads the column instead of grouping the whole monitors table.
+-- Bulk assignments set @hm_bulk_monitors = 1 and update the counts once per
+-- warden. Idempotent: the column is only added when missing, and the counts
+-- are recomputed from monitors every run.
+--   mysql -u root -p hostel_management < migrations/008_warden_student_count.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP PROCEDURE IF EXISTS hm_add_column;
+
+DELIMITER $$
+
+CREATE PROCEDURE hm_add_column(IN p_table VARCHAR(64), IN p_column VARCHAR(64), IN p_definition VARCHAR(255))
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = p_table AND column_name = p_column
+    ) THEN
+        SET @hm_ddl = CONCAT('ALTER TABLE ', p_table, ' ADD COLUMN ', p_column, ' ', p_definition);
+        PREPARE stmt FROM @hm_ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+CALL hm_add_column('warden', 'student_count', 'INT NOT NULL DEFAULT 0');
+
+DROP PROCEDURE hm_add_column;
+
+DROP TRIGGER IF EXISTS trg_monitors_after_insert;
+DROP TRIGGER IF EXISTS trg_monitors_after_update;
+DROP TRIGGER IF EXISTS trg_monitors_after_delete;
+DROP TRIGGER IF EXISTS trg_student_before_delete;
+
+DELIMITER $$
+
+-- TRIGGER: warden assigned: count the student against the warden
+-- (skipped for bulk assignments: @hm_bulk_monitors = 1 is set by the app, which
+--  applies one count update per warden for the whole batch)
+CREATE TRIGGER trg_monitors_after_insert
+AFTER INSERT ON monitors
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_monitors IS NULL THEN
+        UPDATE warden SET student_count = student_count + 1 WHERE w_id = NEW.w_id;
+    END IF;
+END$$
+
+-- TRIGGER: assignment moved to another warden
+CREATE TRIGGER trg_monitors_after_update
+AFTER UPDATE ON monitors
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_monitors IS NULL AND OLD.w_id <> NEW.w_id THEN
+        UPDATE warden SET student_count = student_count - 1 WHERE w_id = OLD.w_id;
+        UPDATE warden SET student_count = student_count + 1 WHERE w_id = NEW.w_id;
+    END IF;
+END$$
+
+-- TRIGGER: warden unassigned
+CREATE TRIGGER trg_monitors_after_delete
+AFTER DELETE ON monitors
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_monitors IS NULL THEN
+        UPDATE warden SET student_count = GREATEST(student_count - 1, 0) WHERE w_id = OLD.w_id;
+    END IF;
+END$$
+
+-- TRIGGER: student removed: the ON DELETE CASCADE on monitors does not fire
+-- the monitors triggers, so the warden counts are released here
+CREATE TRIGGER trg_student_before_delete
+BEFORE DELETE ON student
+FOR EACH ROW
+BEGIN
+    UPDATE warden w
+    JOIN monitors m ON m.w_id = w.w_id
+    SET w.student_count = GREATEST(w.student_count - 1, 0)
+    WHERE m.s_id = OLD.s_id;
+END$$
+
+DELIMITER ;
+
+-- Backfill / resync from the assignments
+UPDATE warden w
+LEFT JOIN (SELECT w_id, COUNT(*) AS assigned FROM monitors GROUP BY w_id) m ON m.w_id = w.w_id
+SET w.student_count = IFNULL(m.assigned, 0);
@@ -0,0 +1,77 @@
+-- ============================================================================
+-- 009 - bulk mess rollover: let the mess booking triggers stand aside while the
+-- app renews or moves a whole month of bookings set-based (session variable
+-- @hm_bulk_mess = 1; fees and ledger rows are then written by the rollover).
+-- Idempotent.
+--   mysql -u root -p hostel_management < migrations/009_bulk_mess_rollover.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP TRIGGER IF EXISTS trg_mess_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_update;
+
+DELIMITER $$
+
+-- TRIGGER: mess booked: charge the monthly fee, book it in the ledger
+-- (skipped for the bulk rollover: @hm_bulk_mess = 1 is set by the app, which
+--  writes the fees and ledger rows for the whole month set-based)
+CREATE TRIGGER trg_mess_after_insert
+AFTER INSERT ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    IF @hm_bulk_mess IS NULL THEN
+        -- get fee
+        SELECT monthly_fee INTO messfee
+        FROM mess
+        WHERE m_no = NEW.m_no;
+
+        -- generate fee id
+        SET fid = next_fee_id('MSS-');
+
+        -- insert fee
+        INSERT INTO fees (p_id, p_date, p_method, amount)
+        VALUES (fid, CURDATE(), 'Cash', messfee);
+
+        -- ledger: mess fee for the booking month
+        INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+        VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+        ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+    END IF;
+END$$
+
+-- TRIGGER: booking changed: charge the new fee, move the ledger entry (skipped like the insert)
+CREATE TRIGGER trg_mess_after_update
+AFTER UPDATE ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    IF @hm_bulk_mess IS NULL THEN
+        SELECT monthly_fee INTO messfee
+        FROM mess
+        WHERE m_no = NEW.m_no;
+
+        SET fid = next_fee_id('MSS-');
+
+        INSERT INTO fees (p_id, p_date, p_method, amount)
+        VALUES (fid, CURDATE(), 'Cash', messfee);
+
+        -- ledger: move the mess fee from the old booking month to the new one
+        UPDATE student_ledger l
+        JOIN mess m ON m.m_no = OLD.m_no
+        SET l.mess_fee = l.mess_fee - m.monthly_fee
+        WHERE l.s_id = OLD.s_id
+          AND l.period_year = YEAR(OLD.booking_date)
+          AND l.period_month = MONTH(OLD.booking_date);
+
+        INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+        VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+        ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+    END IF;
+END$$
+
+DELIMITER ;
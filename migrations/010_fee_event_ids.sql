@@ -0,0 +1,108 @@
+-- ============================================================================
+-- 010 - the laundry and mess fee triggers leave the id of the fee row they
+-- insert in @hm_last_fee_id, so the app can publish the real row (id, date,
+-- method, amount) as its live fee event instead of a reconstruction.
+-- Idempotent.
+--   mysql -u root -p hostel_management < migrations/010_fee_event_ids.sql
+-- ============================================================================
+USE hostel_management;
+
+DROP TRIGGER IF EXISTS trg_laundry_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_insert;
+DROP TRIGGER IF EXISTS trg_mess_after_update;
+
+DELIMITER $$
+
+-- TRIGGER: after laundry submission → generate fees entry
+CREATE TRIGGER trg_laundry_after_insert
+AFTER INSERT ON gives_laundry
+FOR EACH ROW
+BEGIN
+    DECLARE laundry_rate DECIMAL(10,2);
+    DECLARE short_id VARCHAR(30);
+
+    -- fetch rate
+    SELECT rate_per_day INTO laundry_rate
+    FROM laundry
+    WHERE l_no = NEW.l_no;
+
+    -- time-ordered payment ID (fits VARCHAR(30))
+    SET short_id = next_fee_id('LND-');
+
+    -- insert revenue entry
+    INSERT INTO fees (p_id, p_date, p_method, amount)
+    VALUES (short_id, NEW.submission_date, 'Cash', laundry_rate);
+    -- the app reads the row back for its live fee event
+    SET @hm_last_fee_id = short_id;
+
+    -- ledger: laundry charge for the submission month
+    INSERT INTO student_ledger (s_id, period_year, period_month, laundry_charges)
+    VALUES (NEW.s_id, YEAR(NEW.submission_date), MONTH(NEW.submission_date), IFNULL(laundry_rate, 0))
+    ON DUPLICATE KEY UPDATE laundry_charges = laundry_charges + VALUES(laundry_charges);
+END$$
+
+-- TRIGGER: mess booked: charge the monthly fee, book it in the ledger
+-- (skipped for the bulk rollover: @hm_bulk_mess = 1 is set by the app, which
+--  writes the fees and ledger rows for the whole month set-based)
+CREATE TRIGGER trg_mess_after_insert
+AFTER INSERT ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    IF @hm_bulk_mess IS NULL THEN
+        -- get fee
+        SELECT monthly_fee INTO messfee
+        FROM mess
+        WHERE m_no = NEW.m_no;
+
+        -- generate fee id
+        SET fid = next_fee_id('MSS-');
+
+        -- insert fee
+        INSERT INTO fees (p_id, p_date, p_method, amount)
+        VALUES (fid, CURDATE(), 'Cash', messfee);
+        SET @hm_last_fee_id = fid;
+
+        -- ledger: mess fee for the booking month
+        INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+        VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+        ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+    END IF;
+END$$
+
+-- TRIGGER: booking changed: charge the new fee, move the ledger entry (skipped like the insert)
+CREATE TRIGGER trg_mess_after_update
+AFTER UPDATE ON books_mess
+FOR EACH ROW
+BEGIN
+    DECLARE messfee DECIMAL(10,2);
+    DECLARE fid VARCHAR(30);
+
+    IF @hm_bulk_mess IS NULL THEN
+        SELECT monthly_fee INTO messfee
+        FROM mess
+        WHERE m_no = NEW.m_no;
+
+        SET fid = next_fee_id('MSS-');
+
+        INSERT INTO fees (p_id, p_date, p_method, amount)
+        VALUES (fid, CURDATE(), 'Cash', messfee);
+        SET @hm_last_fee_id = fid;
+
+        -- ledger: move the mess fee from the old booking month to the new one
+        UPDATE student_ledger l
+        JOIN mess m ON m.m_no = OLD.m_no
+        SET l.mess_fee = l.mess_fee - m.monthly_fee
+        WHERE l.s_id = OLD.s_id
+          AND l.period_year = YEAR(OLD.booking_date)
+          AND l.period_month = MONTH(OLD.booking_date);
+
+        INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+        VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+        ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+    END IF;
+END$$
+
+DELIMITER ;
@@ -1,7 +1,8 @@
 -- ============================================================================
 -- HOSTEL MANAGEMENT SYSTEM - FULL SCHEMA (Hostel only, no authentication)
 -- Safe to run multiple times. Includes tables, sample data, views,
--- 4 triggers (room management), 2 functions, and 8 stored procedures.
+-- triggers (room management, fee generation, student ledger), 2 functions,
+-- and 8 stored procedures.
 -- ============================================================================
 CREATE DATABASE IF NOT EXISTS hostel_management;
 USE hostel_management;
@@ -16,10 +17,16 @@ DROP VIEW IF EXISTS warden_student_view;
 DROP TRIGGER IF EXISTS trg_fees_before_insert;
 DROP TRIGGER IF EXISTS trg_alloc_before_insert;
 DROP TRIGGER IF EXISTS trg_alloc_after_insert;
+DROP TRIGGER IF EXISTS trg_alloc_after_update;
 DROP TRIGGER IF EXISTS trg_alloc_after_delete;
+DROP TRIGGER IF EXISTS trg_monitors_after_insert;
+DROP TRIGGER IF EXISTS trg_monitors_after_update;
+DROP TRIGGER IF EXISTS trg_monitors_after_delete;
+DROP TRIGGER IF EXISTS trg_student_before_delete;
 
 DROP FUNCTION IF EXISTS room_available_slots;
 DROP FUNCTION IF EXISTS student_total_paid;
+DROP FUNCTION IF EXISTS next_fee_id;
 
 DROP PROCEDURE IF EXISTS sp_transfer_student_room;
 DROP PROCEDURE IF EXISTS sp_get_student_details;
@@ -30,6 +37,10 @@ DROP PROCEDURE IF EXISTS sp_get_room_occupants;
 DROP PROCEDURE IF EXISTS sp_submit_laundry;
 DROP PROCEDURE IF EXISTS sp_generate_hostel_report;
 
+DROP TABLE IF EXISTS fees_period_totals;
+DROP TABLE IF EXISTS gives_laundry_archive;
+DROP TABLE IF EXISTS fees_archive;
+DROP TABLE IF EXISTS student_ledger;
 DROP TABLE IF EXISTS monitors;
 DROP TABLE IF EXISTS gives_laundry;
 DROP TABLE IF EXISTS books_mess;
@@ -77,7 +88,8 @@ CREATE TABLE fees (
     p_id VARCHAR(30) PRIMARY KEY,
     p_date DATE NOT NULL,
     p_method VARCHAR(20) NOT NULL CHECK (p_method IN ('Cash', 'Card', 'UPI', 'Net Banking')),
-    amount DECIMAL(10,2) NOT NULL
+    amount DECIMAL(10,2) NOT NULL,
+    INDEX idx_fees_p_date (p_date, amount, p_method)
 );
 
 -- Laundry master (defines laundry package / rate)
@@ -95,10 +107,13 @@ CREATE TABLE mess (
 );
 
 -- Warden
+-- student_count = rows in monitors for the warden, kept by the monitors triggers
+-- (and by the bulk assignment in the app) so listing wardens needs no GROUP BY
 CREATE TABLE warden (
     w_id VARCHAR(20) PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
-    p_no VARCHAR(15) NOT NULL
+    p_no VARCHAR(15) NOT NULL,
+    student_count INT NOT NULL DEFAULT 0
 );
 
 -- Student-Room-Fees (ternary relation)
@@ -110,7 +125,8 @@ CREATE TABLE student_room_fees (
     PRIMARY KEY (s_id),
     FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE,
     FOREIGN KEY (r_no) REFERENCES room(r_no) ON DELETE CASCADE,
-    FOREIGN KEY (p_id) REFERENCES fees(p_id) ON DELETE CASCADE
+    FOREIGN KEY (p_id) REFERENCES fees(p_id) ON DELETE CASCADE,
+    INDEX idx_srf_p_id (p_id, s_id)
 );
 
 -- Student-Mess booking
@@ -120,7 +136,8 @@ CREATE TABLE books_mess (
     booking_date DATE NOT NULL,
     PRIMARY KEY (s_id),
     FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE,
-    FOREIGN KEY (m_no) REFERENCES mess(m_no) ON DELETE CASCADE
+    FOREIGN KEY (m_no) REFERENCES mess(m_no) ON DELETE CASCADE,
+    INDEX idx_bm_booking_date (booking_date, m_no)
 );
 
 -- Student gives laundry (transactions)
@@ -130,7 +147,9 @@ CREATE TABLE gives_laundry (
     submission_date DATE NOT NULL,
     PRIMARY KEY (s_id, l_no, submission_date),
     FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE,
-    FOREIGN KEY (l_no) REFERENCES laundry(l_no) ON DELETE CASCADE
+    FOREIGN KEY (l_no) REFERENCES laundry(l_no) ON DELETE CASCADE,
+    INDEX idx_gl_submission_date (submission_date),
+    INDEX idx_gl_student_date (s_id, submission_date)
 );
 
 -- Monitors (warden-student mapping)
@@ -140,6 +159,54 @@ CREATE TABLE monitors (
     assigned_date DATE NOT NULL,
     PRIMARY KEY (w_id, s_id),
     FOREIGN KEY (w_id) REFERENCES warden(w_id) ON DELETE CASCADE,
+    FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE,
+    INDEX idx_monitors_s_id (s_id, w_id)
+);
+
+-- History archive: closed periods of fees / gives_laundry, moved by
+-- `flask --app app archive-history` so the hot tables only hold the active window
+-- (fees rows still referenced by student_room_fees are never archived)
+CREATE TABLE fees_archive (
+    p_id VARCHAR(30) PRIMARY KEY,
+    p_date DATE NOT NULL,
+    p_method VARCHAR(20) NOT NULL,
+    amount DECIMAL(10,2) NOT NULL,
+    INDEX idx_fees_archive_p_date (p_date, amount, p_method)
+);
+
+CREATE TABLE gives_laundry_archive (
+    s_id VARCHAR(20),
+    l_no VARCHAR(20),
+    submission_date DATE NOT NULL,
+    PRIMARY KEY (s_id, l_no, submission_date),
+    FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE,
+    FOREIGN KEY (l_no) REFERENCES laundry(l_no) ON DELETE CASCADE,
+    INDEX idx_gla_submission_date (submission_date),
+    INDEX idx_gla_student_date (s_id, submission_date)
+);
+
+-- Per-month totals of the archived fees (revenue without re-reading history)
+CREATE TABLE fees_period_totals (
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    p_method VARCHAR(20) NOT NULL,
+    fee_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (period_year, period_month, p_method)
+);
+
+-- Student ledger (per student, per month running totals)
+-- Maintained incrementally by the allocation, laundry and mess triggers so
+-- student_total_paid() and monthly charges are key lookups instead of scans.
+-- Rebuild / verify against the raw tables with: flask --app app rebuild-ledger
+CREATE TABLE student_ledger (
+    s_id VARCHAR(20),
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    mess_fee DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    laundry_charges DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    total_paid DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (s_id, period_year, period_month),
     FOREIGN KEY (s_id) REFERENCES student(s_id) ON DELETE CASCADE
 );
 
@@ -295,24 +362,39 @@ DETERMINISTIC
 BEGIN
     DECLARE cap INT DEFAULT 0;
     DECLARE occ INT DEFAULT 0;
-    SELECT IFNULL(max_capacity,0) INTO cap FROM room WHERE r_no = r LIMIT 1;
-    SELECT IFNULL(no_of_people,0) INTO occ FROM room WHERE r_no = r LIMIT 1;
+    SELECT IFNULL(max_capacity,0), IFNULL(no_of_people,0) INTO cap, occ FROM room WHERE r_no = r LIMIT 1;
     RETURN GREATEST(cap - occ, 0);
 END$$
 
--- FUNCTION: student_total_paid(sid)
+-- FUNCTION: student_total_paid(sid) - reads the maintained ledger
 CREATE FUNCTION student_total_paid(sid VARCHAR(30))
 RETURNS DECIMAL(20,2)
-DETERMINISTIC
+READS SQL DATA
 BEGIN
     DECLARE total DECIMAL(20,2) DEFAULT 0;
-    SELECT IFNULL(SUM(f.amount),0) INTO total
-    FROM student_room_fees srf
-    JOIN fees f ON srf.p_id = f.p_id
-    WHERE srf.s_id = sid;
+    SELECT IFNULL(SUM(total_paid),0) INTO total
+    FROM student_ledger
+    WHERE s_id = sid;
     RETURN total;
 END$$
 
+-- FUNCTION: next_fee_id(prefix) - time-ordered fee id for the trigger-written fees:
+-- prefix + 10 chars of epoch milliseconds + 13 chars of UUID_SHORT() + 3 random chars,
+-- all base32hex (CONV(n, 10, 32)), so new fees land at the end of the primary key.
+-- UUID_SHORT() increases on every call, so ids are unique and increasing per server.
+-- new_fee_id() in app.py has the same length and millisecond part but a random,
+-- per-millisecond incremented tail; its 'F' prefix keeps the two sets of ids apart.
+CREATE FUNCTION next_fee_id(p_prefix VARCHAR(4))
+RETURNS VARCHAR(30)
+NOT DETERMINISTIC
+NO SQL
+BEGIN
+    RETURN CONCAT(p_prefix,
+                  LPAD(CONV(CAST(UNIX_TIMESTAMP(NOW(3)) * 1000 AS UNSIGNED), 10, 32), 10, '0'),
+                  LPAD(CONV(UUID_SHORT(), 10, 32), 13, '0'),
+                  LPAD(CONV(FLOOR(RAND() * 32768), 10, 32), 3, '0'));
+END$$
+
 -- TRIGGER: fees BEFORE INSERT (validate amount, default p_date)
 CREATE TRIGGER trg_fees_before_insert
 BEFORE INSERT ON fees
@@ -327,31 +409,63 @@ BEGIN
 END$$
 
 -- TRIGGER: prevent duplicate allocation for the same student
+-- (skipped for batch allocations: @hm_bulk_allocation = 1 is set by the app, which
+--  checks the batch up front; the primary key on s_id still rejects duplicates)
 CREATE TRIGGER trg_alloc_before_insert
 BEFORE INSERT ON student_room_fees
 FOR EACH ROW
 BEGIN
-    IF EXISTS (SELECT 1 FROM student_room_fees WHERE s_id = NEW.s_id) THEN
+    IF @hm_bulk_allocation IS NULL AND EXISTS (SELECT 1 FROM student_room_fees WHERE s_id = NEW.s_id) THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Student already allocated to a room';
     END IF;
 END$$
 
--- TRIGGER: after allocation: increment occupancy & enforce capacity
+-- TRIGGER: after allocation: increment occupancy & enforce capacity, book the payment in the ledger
+-- (batch allocations lock the rooms, check capacity in the app and apply one
+--  occupancy update per room, so the per-row room update is skipped for them)
 CREATE TRIGGER trg_alloc_after_insert
 AFTER INSERT ON student_room_fees
 FOR EACH ROW
 BEGIN
-    UPDATE room
-    SET no_of_people = no_of_people + 1
-    WHERE r_no = NEW.r_no;
+    IF @hm_bulk_allocation IS NULL THEN
+        -- check and increment in one statement: no re-read of the row another
+        -- allocation may be updating at the same time
+        UPDATE room
+        SET no_of_people = no_of_people + 1
+        WHERE r_no = NEW.r_no AND no_of_people < max_capacity;
+
+        IF ROW_COUNT() = 0 THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room capacity exceeded';
+        END IF;
+    END IF;
+
+    INSERT INTO student_ledger (s_id, period_year, period_month, total_paid)
+    SELECT NEW.s_id, YEAR(f.p_date), MONTH(f.p_date), f.amount
+    FROM fees f WHERE f.p_id = NEW.p_id
+    ON DUPLICATE KEY UPDATE total_paid = total_paid + VALUES(total_paid);
+END$$
 
-    IF (SELECT no_of_people FROM room WHERE r_no = NEW.r_no) >
-       (SELECT max_capacity FROM room WHERE r_no = NEW.r_no) THEN
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room capacity exceeded';
+-- TRIGGER: allocation re-pointed to another fee record: move the payment in the ledger
+CREATE TRIGGER trg_alloc_after_update
+AFTER UPDATE ON student_room_fees
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.p_id <=> NEW.p_id) OR OLD.s_id <> NEW.s_id THEN
+        UPDATE student_ledger l
+        JOIN fees f ON f.p_id = OLD.p_id
+        SET l.total_paid = l.total_paid - f.amount
+        WHERE l.s_id = OLD.s_id
+          AND l.period_year = YEAR(f.p_date)
+          AND l.period_month = MONTH(f.p_date);
+
+        INSERT INTO student_ledger (s_id, period_year, period_month, total_paid)
+        SELECT NEW.s_id, YEAR(f.p_date), MONTH(f.p_date), f.amount
+        FROM fees f WHERE f.p_id = NEW.p_id
+        ON DUPLICATE KEY UPDATE total_paid = total_paid + VALUES(total_paid);
     END IF;
 END$$
 
--- TRIGGER: after delete allocation: decrement occupancy safely
+-- TRIGGER: after delete allocation: decrement occupancy safely, reverse the ledger payment
 CREATE TRIGGER trg_alloc_after_delete
 AFTER DELETE ON student_room_fees
 FOR EACH ROW
@@ -359,6 +473,58 @@ BEGIN
     UPDATE room
     SET no_of_people = GREATEST(no_of_people - 1, 0)
     WHERE r_no = OLD.r_no;
+
+    UPDATE student_ledger l
+    JOIN fees f ON f.p_id = OLD.p_id
+    SET l.total_paid = l.total_paid - f.amount
+    WHERE l.s_id = OLD.s_id
+      AND l.period_year = YEAR(f.p_date)
+      AND l.period_month = MONTH(f.p_date);
+END$$
+
+-- TRIGGER: warden assigned: count the student against the warden
+-- (skipped for bulk assignments: @hm_bulk_monitors = 1 is set by the app, which
+--  applies one count update per warden for the whole batch)
+CREATE TRIGGER trg_monitors_after_insert
+AFTER INSERT ON monitors
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_monitors IS NULL THEN
+        UPDATE warden SET student_count = student_count + 1 WHERE w_id = NEW.w_id;
+    END IF;
+END$$
+
+-- TRIGGER: assignment moved to another warden
+CREATE TRIGGER trg_monitors_after_update
+AFTER UPDATE ON monitors
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_monitors IS NULL AND OLD.w_id <> NEW.w_id THEN
+        UPDATE warden SET student_count = student_count - 1 WHERE w_id = OLD.w_id;
+        UPDATE warden SET student_count = student_count + 1 WHERE w_id = NEW.w_id;
+    END IF;
+END$$
+
+-- TRIGGER: warden unassigned
+CREATE TRIGGER trg_monitors_after_delete
+AFTER DELETE ON monitors
+FOR EACH ROW
+BEGIN
+    IF @hm_bulk_monitors IS NULL THEN
+        UPDATE warden SET student_count = GREATEST(student_count - 1, 0) WHERE w_id = OLD.w_id;
+    END IF;
+END$$
+
+-- TRIGGER: student removed: the ON DELETE CASCADE on monitors does not fire
+-- the monitors triggers, so the warden counts are released here
+CREATE TRIGGER trg_student_before_delete
+BEFORE DELETE ON student
+FOR EACH ROW
+BEGIN
+    UPDATE warden w
+    JOIN monitors m ON m.w_id = w.w_id
+    SET w.student_count = GREATEST(w.student_count - 1, 0)
+    WHERE m.s_id = OLD.s_id;
 END$$
 
 DELIMITER $$
@@ -376,18 +542,28 @@ BEGIN
     FROM laundry
     WHERE l_no = NEW.l_no;
 
-    -- short payment ID (fits VARCHAR(30))
-    SET short_id = CONCAT('LND-', SUBSTRING(UUID(), 1, 8));
+    -- time-ordered payment ID (fits VARCHAR(30))
+    SET short_id = next_fee_id('LND-');
 
     -- insert revenue entry
     INSERT INTO fees (p_id, p_date, p_method, amount)
     VALUES (short_id, NEW.submission_date, 'Cash', laundry_rate);
+    -- the app reads the row back for its live fee event
+    SET @hm_last_fee_id = short_id;
+
+    -- ledger: laundry charge for the submission month
+    INSERT INTO student_ledger (s_id, period_year, period_month, laundry_charges)
+    VALUES (NEW.s_id, YEAR(NEW.submission_date), MONTH(NEW.submission_date), IFNULL(laundry_rate, 0))
+    ON DUPLICATE KEY UPDATE laundry_charges = laundry_charges + VALUES(laundry_charges);
 END$$
 
 DELIMITER ;
 
 DELIMITER $$
 
+-- TRIGGER: mess booked: charge the monthly fee, book it in the ledger
+-- (skipped for the bulk rollover: @hm_bulk_mess = 1 is set by the app, which
+--  writes the fees and ledger rows for the whole month set-based)
 CREATE TRIGGER trg_mess_after_insert
 AFTER INSERT ON books_mess
 FOR EACH ROW
@@ -395,23 +571,32 @@ BEGIN
     DECLARE messfee DECIMAL(10,2);
     DECLARE fid VARCHAR(30);
 
-    -- get fee
-    SELECT monthly_fee INTO messfee
-    FROM mess
-    WHERE m_no = NEW.m_no;
+    IF @hm_bulk_mess IS NULL THEN
+        -- get fee
+        SELECT monthly_fee INTO messfee
+        FROM mess
+        WHERE m_no = NEW.m_no;
 
-    -- generate fee id
-    SET fid = CONCAT('MSS-', SUBSTRING(UUID(), 1, 8));
+        -- generate fee id
+        SET fid = next_fee_id('MSS-');
 
-    -- insert fee
-    INSERT INTO fees (p_id, p_date, p_method, amount)
-    VALUES (fid, CURDATE(), 'Cash', messfee);
+        -- insert fee
+        INSERT INTO fees (p_id, p_date, p_method, amount)
+        VALUES (fid, CURDATE(), 'Cash', messfee);
+        SET @hm_last_fee_id = fid;
+
+        -- ledger: mess fee for the booking month
+        INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+        VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+        ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+    END IF;
 END$$
 
 DELIMITER ;
 
 DELIMITER $$
 
+-- TRIGGER: booking changed: charge the new fee, move the ledger entry (skipped like the insert)
 CREATE TRIGGER trg_mess_after_update
 AFTER UPDATE ON books_mess
 FOR EACH ROW
@@ -419,17 +604,32 @@ BEGIN
     DECLARE messfee DECIMAL(10,2);
     DECLARE fid VARCHAR(30);
 
-    SELECT monthly_fee INTO messfee
-    FROM mess
-    WHERE m_no = NEW.m_no;
+    IF @hm_bulk_mess IS NULL THEN
+        SELECT monthly_fee INTO messfee
+        FROM mess
+        WHERE m_no = NEW.m_no;
 
-    SET fid = CONCAT('MSS-', SUBSTRING(UUID(), 1, 8));
+        SET fid = next_fee_id('MSS-');
 
-    INSERT INTO fees (p_id, p_date, p_method, amount)
-    VALUES (fid, CURDATE(), 'Cash', messfee);
+        INSERT INTO fees (p_id, p_date, p_method, amount)
+        VALUES (fid, CURDATE(), 'Cash', messfee);
+        SET @hm_last_fee_id = fid;
+
+        -- ledger: move the mess fee from the old booking month to the new one
+        UPDATE student_ledger l
+        JOIN mess m ON m.m_no = OLD.m_no
+        SET l.mess_fee = l.mess_fee - m.monthly_fee
+        WHERE l.s_id = OLD.s_id
+          AND l.period_year = YEAR(OLD.booking_date)
+          AND l.period_month = MONTH(OLD.booking_date);
+
+        INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee)
+        VALUES (NEW.s_id, YEAR(NEW.booking_date), MONTH(NEW.booking_date), IFNULL(messfee, 0))
+        ON DUPLICATE KEY UPDATE mess_fee = mess_fee + VALUES(mess_fee);
+    END IF;
 END$$
 
-DELIMITER ;
+DELIMITER $$
 
 
 -- ============================================================================
@@ -442,19 +642,26 @@ CREATE PROCEDURE sp_transfer_student_room(
 )
 BEGIN
     DECLARE old_room VARCHAR(10);
-    DECLARE room_capacity INT DEFAULT 0;
-    DECLARE current_occupancy INT DEFAULT 0;
+    DECLARE locked_rooms INT DEFAULT 0;
 
-    SELECT r_no INTO old_room FROM student_room_fees WHERE s_id = p_student_id LIMIT 1;
+    SELECT r_no INTO old_room FROM student_room_fees WHERE s_id = p_student_id LIMIT 1 FOR UPDATE;
 
     IF old_room IS NULL THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Student does not have a current room allocation';
     END IF;
 
-    SELECT IFNULL(max_capacity,0), IFNULL(no_of_people,0) INTO room_capacity, current_occupancy
-    FROM room WHERE r_no = p_new_room_no LIMIT 1;
+    IF old_room = p_new_room_no THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Student is already in this room';
+    END IF;
+
+    -- lock both rooms (a primary key scan, so in r_no order): transfers A->B and B->A cannot deadlock
+    SELECT COUNT(*) INTO locked_rooms FROM room WHERE r_no IN (old_room, p_new_room_no) FOR UPDATE;
 
-    IF current_occupancy >= room_capacity THEN
+    -- capacity check and increment in one statement
+    UPDATE room SET no_of_people = no_of_people + 1
+    WHERE r_no = p_new_room_no AND no_of_people < max_capacity;
+
+    IF ROW_COUNT() = 0 THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Target room is full';
     END IF;
 
@@ -463,9 +670,7 @@ BEGIN
     SET r_no = p_new_room_no, allotment_date = CURDATE()
     WHERE s_id = p_student_id;
 
-    -- adjust counts: decrement old room, increment new room
     UPDATE room SET no_of_people = GREATEST(no_of_people - 1, 0) WHERE r_no = old_room;
-    UPDATE room SET no_of_people = no_of_people + 1 WHERE r_no = p_new_room_no;
 END$$
 
 -- 2) Get comprehensive student info
@@ -517,6 +722,7 @@ BEGIN
 END$$
 
 -- 5) Calculate monthly charges for a student (mess + laundry), total paid, balance
+--    Single primary-key lookup on the maintained student_ledger
 CREATE PROCEDURE sp_calculate_student_monthly_charges(
     IN p_student_id VARCHAR(20),
     IN p_month INT,
@@ -528,32 +734,15 @@ BEGIN
     DECLARE total DECIMAL(12,2) DEFAULT 0.00;
     DECLARE total_paid DECIMAL(12,2) DEFAULT 0.00;
 
-    -- Sum mess fee if student booked a mess in the specified month/year
-    SELECT IFNULL(SUM(m.monthly_fee),0) INTO mess_fee
-    FROM books_mess bm
-    JOIN mess m ON bm.m_no = m.m_no
-    WHERE bm.s_id = p_student_id
-      AND MONTH(bm.booking_date) = p_month
-      AND YEAR(bm.booking_date) = p_year;
-
-    -- Approximate laundry charges: sum rate_per_day for submissions in month/year
-    SELECT IFNULL(SUM(l.rate_per_day),0) INTO laundry_charges
-    FROM gives_laundry gl
-    JOIN laundry l ON gl.l_no = l.l_no
-    WHERE gl.s_id = p_student_id
-      AND MONTH(gl.submission_date) = p_month
-      AND YEAR(gl.submission_date) = p_year;
+    SELECT IFNULL(SUM(l.mess_fee),0), IFNULL(SUM(l.laundry_charges),0), IFNULL(SUM(l.total_paid),0)
+    INTO mess_fee, laundry_charges, total_paid
+    FROM student_ledger l
+    WHERE l.s_id = p_student_id
+      AND l.period_year = p_year
+      AND l.period_month = p_month;
 
     SET total = mess_fee + laundry_charges;
 
-    -- total paid in that month (fees.p_date in month/year joined via student_room_fees)
-    SELECT IFNULL(SUM(f.amount),0) INTO total_paid
-    FROM student_room_fees srf
-    JOIN fees f ON srf.p_id = f.p_id
-    WHERE srf.s_id = p_student_id
-      AND MONTH(f.p_date) = p_month
-      AND YEAR(f.p_date) = p_year;
-
     SELECT mess_fee AS mess_fee, laundry_charges AS laundry_charges, total AS total_charges,
            total_paid AS total_paid, (total - total_paid) AS balance;
 END$$
@@ -580,6 +769,7 @@ BEGIN
 END$$
 
 -- 8) Generate a simple hostel report
+--    (revenue = hot fees + the per-month totals of archived fees)
 CREATE PROCEDURE sp_generate_hostel_report()
 BEGIN
     -- Room statistics
@@ -589,10 +779,36 @@ BEGIN
     UNION ALL
     SELECT 'total_students', COUNT(*) FROM student
     UNION ALL
-    SELECT 'total_revenue', IFNULL(SUM(amount),0) FROM fees;
+    SELECT 'total_revenue', IFNULL(SUM(amount),0) + (SELECT IFNULL(SUM(total_amount),0) FROM fees_period_totals)
+    FROM fees;
 END$$
 
 DELIMITER ;
 
+-- ============================================================================
+-- LEDGER BACKFILL (sample data above was inserted before the triggers existed)
+-- ============================================================================
+INSERT INTO student_ledger (s_id, period_year, period_month, mess_fee, laundry_charges, total_paid)
+SELECT s_id, period_year, period_month, SUM(mess_fee), SUM(laundry_charges), SUM(total_paid)
+FROM (
+    SELECT bm.s_id, YEAR(bm.booking_date) AS period_year, MONTH(bm.booking_date) AS period_month,
+           m.monthly_fee AS mess_fee, 0 AS laundry_charges, 0 AS total_paid
+    FROM books_mess bm JOIN mess m ON bm.m_no = m.m_no
+    UNION ALL
+    SELECT gl.s_id, YEAR(gl.submission_date), MONTH(gl.submission_date), 0, l.rate_per_day, 0
+    FROM gives_laundry gl JOIN laundry l ON gl.l_no = l.l_no
+    UNION ALL
+    SELECT srf.s_id, YEAR(f.p_date), MONTH(f.p_date), 0, 0, f.amount
+    FROM student_room_fees srf JOIN fees f ON srf.p_id = f.p_id
+) AS entries
+GROUP BY s_id, period_year, period_month;
+
+-- ============================================================================
+-- WARDEN COUNT BACKFILL (sample monitors rows predate the triggers)
+-- ============================================================================
+UPDATE warden w
+LEFT JOIN (SELECT w_id, COUNT(*) AS assigned FROM monitors GROUP BY w_id) m ON m.w_id = w.w_id
+SET w.student_count = IFNULL(m.assigned, 0);
+
 -- Ensure current DB selected
 USE hostel_management;
@@ -0,0 +1,56 @@
+from app import plan_room_allocation
+
+
+def test_leader_group_goes_to_tightest_room_that_fits():
+    rooms = {'R1': 2, 'R2': 3, 'R3': 4}
+    students = [('S1', None), ('S2', 'S1'), ('S3', 'S1')]
+    assignment, unplaced = plan_room_allocation(rooms, students)
+    assert assignment == {'S1': 'R2', 'S2': 'R2', 'S3': 'R2'}
+    assert unplaced == []
+    assert rooms == {'R1': 2, 'R2': 0, 'R3': 4}
+
+
+def test_group_joins_leader_room_then_spills_over():
+    rooms = {'R1': 1, 'R2': 4}
+    students = [('S1', 'L1'), ('S2', 'L1')]
+    assignment, unplaced = plan_room_allocation(rooms, students, leader_rooms={'L1': 'R1'})
+    assert assignment == {'S1': 'R1', 'S2': 'R2'}
+    assert unplaced == []
+
+
+def test_group_split_across_emptiest_rooms_when_none_fits():
+    rooms = {'R1': 2, 'R2': 2}
+    students = [('S1', None), ('S2', 'S1'), ('S3', 'S1')]
+    assignment, unplaced = plan_room_allocation(rooms, students)
+    assert sorted(assignment) == ['S1', 'S2', 'S3']
+    assert set(assignment.values()) == {'R1', 'R2'}
+    assert unplaced == []
+    assert sum(rooms.values()) == 1
+
+
+def test_students_left_over_when_rooms_are_full():
+    assignment, unplaced = plan_room_allocation({'R1': 1}, [('S1', None), ('S2', None)])
+    assert assignment == {'S1': 'R1'}
+    assert unplaced == ['S2']
+
+
+def test_no_rooms_leaves_everyone_unplaced():
+    assignment, unplaced = plan_room_allocation({}, [('S1', None), ('S2', 'S1')])
+    assert assignment == {}
+    assert sorted(unplaced) == ['S1', 'S2']
+
+
+def test_unknown_leader_is_not_a_group():
+    # L9 is neither in the batch nor allocated, so S1 and S2 are placed on their own
+    rooms = {'R1': 1, 'R2': 1}
+    assignment, unplaced = plan_room_allocation(rooms, [('S1', 'L9'), ('S2', 'L9')])
+    assert sorted(assignment.values()) == ['R1', 'R2']
+    assert unplaced == []
+
+
+def test_grouping_can_be_turned_off():
+    students = [('S1', None), ('S2', 'S1')]
+    assignment, _ = plan_room_allocation({'R1': 1, 'R2': 2}, students, group_by_leader=False)
+    assert assignment == {'S1': 'R1', 'S2': 'R2'}
+    grouped, _ = plan_room_allocation({'R1': 1, 'R2': 2}, students)
+    assert grouped == {'S1': 'R2', 'S2': 'R2'}
@@ -0,0 +1,87 @@
+import glob
+import os
+import re
+
+import pytest
+
+from app import MIGRATIONS_DIR, SCHEMA_PATH, split_sql_statements
+
+ROUTINE = re.compile(r'^CREATE\s+(TRIGGER|PROCEDURE|FUNCTION)\b', re.IGNORECASE)
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_plain_statements():
+    assert split_sql_statements("SELECT 1;\nSELECT 2;\n\n") == ['SELECT 1', 'SELECT 2']
+    assert split_sql_statements("SELECT 1") == ['SELECT 1']
+
+
+@pytest.mark.parametrize('sql', [
+    "SELECT 'a;b'",
+    'SELECT "a;b"',
+    "SELECT `a;b`",
+    r"SELECT 'it\'s;'",
+    "SELECT 'it''s;'",
+    "SELECT 'a\n;b'",
+])
+def test_quoted_semicolons_stay_in_the_statement(sql):
+    assert split_sql_statements(f"{sql};\nSELECT 2;") == [sql, 'SELECT 2']
+
+
+def test_comments_are_dropped_with_their_semicolons():
+    sql = "SELECT 1; -- note; here\nSELECT 2 # x;y\n; /* a;b */ SELECT 3;"
+    assert split_sql_statements(sql) == ['SELECT 1', 'SELECT 2', 'SELECT 3']
+
+
+def test_double_dash_without_space_is_not_a_comment():
+    assert split_sql_statements("SELECT 5--1;") == ['SELECT 5--1']
+
+
+def test_executable_comments_are_kept():
+    assert split_sql_statements("/*!40101 SET NAMES utf8 */;") == ['/*!40101 SET NAMES utf8 */']
+
+
+def test_delimiter_blocks_keep_inner_semicolons():
+    sql = (
+        "DELIMITER $$\r\n"
+        "CREATE TRIGGER t BEFORE INSERT ON x FOR EACH ROW\r\n"
+        "BEGIN\r\n  SET @a = 1;\r\n  SET @b = ';';\r\nEND$$\r\n"
+        "DELIMITER ;\r\n"
+        "SELECT 1;\r\n"
+    )
+    statements = split_sql_statements(sql)
+    assert len(statements) == 2
+    assert statements[0].startswith('CREATE TRIGGER t') and statements[0].endswith('END')
+    assert "SET @b = ';';" in statements[0]
+    assert statements[1] == 'SELECT 1'
+
+
+def test_delimiter_inside_a_string_is_data():
+    sql = "SELECT 'x\nDELIMITER $$\n';"
+    assert split_sql_statements(sql) == ["SELECT 'x\nDELIMITER $$\n'"]
+
+
+@pytest.mark.parametrize('path', [SCHEMA_PATH] + sorted(glob.glob(os.path.join(MIGRATIONS_DIR, '*.sql'))),
+                         ids=os.path.basename)
+def test_shipped_scripts_split_into_whole_routines(path):
+    text = read(path)
+    statements = split_sql_statements(text)
+    assert statements
+    for statement in statements:
+        assert not statement.upper().startswith('DELIMITER')
+        assert not statement.endswith('$$')
+        if ROUTINE.match(statement):
+            assert statement.upper().endswith('END'), statement[:80]
+    # every routine in the file comes out as exactly one statement
+    declared = len(re.findall(r'^\s*CREATE\s+(?:TRIGGER|PROCEDURE|FUNCTION)\b', text, re.IGNORECASE | re.MULTILINE))
+    assert sum(1 for statement in statements if ROUTINE.match(statement)) == declared
+
+
+def test_crlf_schema_splits_like_lf():
+    text = read(SCHEMA_PATH).replace('\r\n', '\n')
+    crlf = split_sql_statements(text.replace('\n', '\r\n'))
+    lf = split_sql_statements(text)
+    assert [' '.join(statement.split()) for statement in crlf] == [' '.join(statement.split()) for statement in lf]
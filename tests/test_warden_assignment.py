@@ -0,0 +1,73 @@
+from app import plan_warden_assignment, room_floor
+
+
+def test_least_loaded_balances_up_to_the_fair_share():
+    loads = {'W1': 0, 'W2': 2}
+    students = [(f'S{i}', None) for i in range(1, 5)]
+    assignment, unplaced = plan_warden_assignment(loads, students)
+    # fair share is ceil((2 + 4) / 2) = 3
+    assert assignment == {'S1': 'W1', 'S2': 'W1', 'S3': 'W1', 'S4': 'W2'}
+    assert unplaced == []
+    assert loads == {'W1': 3, 'W2': 3}
+
+
+def test_stale_heap_entries_are_skipped():
+    # after W1 takes S1 its old (0, 'W1') entry is still on the heap
+    loads = {'W1': 0, 'W2': 1}
+    students = [('S1', None), ('S2', None), ('S3', None)]
+    assignment, _ = plan_warden_assignment(loads, students, max_per_warden=5)
+    assert assignment == {'S1': 'W1', 'S2': 'W1', 'S3': 'W2'}
+    assert loads == {'W1': 2, 'W2': 2}
+
+
+def test_students_left_over_when_every_warden_is_at_the_cap():
+    loads = {'W1': 0, 'W2': 1}
+    students = [('S1', None), ('S2', None), ('S3', None)]
+    assignment, unplaced = plan_warden_assignment(loads, students, max_per_warden=1)
+    assert assignment == {'S1': 'W1'}
+    assert unplaced == ['S2', 'S3']
+
+
+def test_no_wardens_leaves_everyone_unplaced():
+    assert plan_warden_assignment({}, [('S1', 'A101')], 'room_affinity') == ({}, ['S1'])
+
+
+def test_room_affinity_prefers_the_warden_already_covering_the_room():
+    loads = {'W1': 0, 'W2': 5}
+    students = [('S1', 'A101'), ('S2', 'A101')]
+    assignment, _ = plan_warden_assignment(loads, students, 'room_affinity', {'A101': {'W2': 3}},
+                                           max_per_warden=10)
+    assert assignment == {'S1': 'W2', 'S2': 'W2'}
+
+
+def test_room_affinity_spills_over_at_the_cap():
+    loads = {'W1': 0, 'W2': 5}
+    students = [('S1', 'A101'), ('S2', 'A101'), ('S3', 'A101')]
+    assignment, unplaced = plan_warden_assignment(loads, students, 'room_affinity', {'A101': {'W2': 3}},
+                                                  max_per_warden=6)
+    assert assignment == {'S1': 'W2', 'S2': 'W1', 'S3': 'W1'}
+    assert unplaced == []
+
+
+def test_room_affinity_keeps_a_new_room_together():
+    loads = {'W1': 1, 'W2': 0}
+    students = [('S1', 'A101'), ('S2', 'B201'), ('S3', 'A101')]
+    assignment, _ = plan_warden_assignment(loads, students, 'room_affinity', max_per_warden=10)
+    assert assignment['S1'] == assignment['S3'] == 'W2'
+    assert assignment['S2'] == 'W1'
+
+
+def test_floor_affinity_groups_rooms_on_a_floor():
+    assert room_floor('A101') == room_floor('A102') == 'A1'
+    loads = {'W1': 0, 'W2': 0}
+    students = [('S1', 'A101'), ('S2', 'A102'), ('S3', 'B201')]
+    assignment, _ = plan_warden_assignment(loads, students, 'floor_affinity', max_per_warden=10)
+    assert assignment['S1'] == assignment['S2']
+    assert assignment['S3'] != assignment['S1']
+
+
+def test_area_wardens_outside_the_candidates_are_ignored():
+    loads = {'W1': 0}
+    students = [('S1', 'A101')]
+    assignment, _ = plan_warden_assignment(loads, students, 'room_affinity', {'A101': {'W9': 4}})
+    assert assignment == {'S1': 'W1'}